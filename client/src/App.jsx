@@ -9,26 +9,28 @@ import WorkoutEl from './pages/workoutEl';
 import ExercisesEl from './pages/exercisesEl';
 import SessionEl from './pages/sessionEl';
 import SessionsEl from './pages/SessionsEl';
+import { clearTokens, installRefreshInterceptor } from './auth';
 
 function App() {
   useEffect(() => {
+    const interceptor = installRefreshInterceptor();
     const token = localStorage.getItem("accessToken");
     if (token) {
       try {
         const data = jwtDecode(token);
         const currentTime = Date.now() / 1000;
-        if (data.exp && data.exp < currentTime) {
-          localStorage.removeItem("accessToken");
-          axios.defaults.headers.common['Authorization'] = undefined;
+        // An expired access token is still sent; the interceptor refreshes it
+        if (data.exp && data.exp < currentTime && !localStorage.getItem("refreshToken")) {
+          clearTokens();
         } else {
           axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
         }
       } catch (e) {
         console.error("Failed to decode token:", e);
-        localStorage.removeItem("accessToken");
-        axios.defaults.headers.common['Authorization'] = undefined;
+        clearTokens();
       }
     }
+    return () => axios.interceptors.response.eject(interceptor);
   }, []);
 
   return (
@@ -0,0 +1,49 @@
+import axios from "axios"
+import API_BASE_URL from "./api"
+
+export function storeTokens({ access_token, refresh_token }) {
+  localStorage.setItem("accessToken", access_token)
+  if (refresh_token) localStorage.setItem("refreshToken", refresh_token)
+  axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`
+}
+
+export function clearTokens() {
+  localStorage.removeItem("accessToken")
+  localStorage.removeItem("refreshToken")
+  axios.defaults.headers.common['Authorization'] = undefined
+}
+
+// Access tokens are short-lived: on a 401, trade the refresh token for a new
+// pair once and replay the request. Concurrent 401s share one refresh call.
+let pendingRefresh = null
+
+export function installRefreshInterceptor() {
+  return axios.interceptors.response.use(response => response, async error => {
+    const original = error.config
+    const refreshToken = localStorage.getItem("refreshToken")
+    if (
+      error.response?.status !== 401 ||
+      !original ||
+      original._retried ||
+      !refreshToken ||
+      original.url?.endsWith("/users/refresh")
+    ) {
+      throw error
+    }
+
+    original._retried = true
+    pendingRefresh = pendingRefresh || axios
+      .post(`${API_BASE_URL}/users/refresh`, { refresh_token: refreshToken })
+      .finally(() => { pendingRefresh = null })
+
+    try {
+      const response = await pendingRefresh
+      storeTokens(response.data)
+    } catch {
+      clearTokens()
+      throw error
+    }
+    original.headers['Authorization'] = `Bearer ${localStorage.getItem("accessToken")}`
+    return axios(original)
+  })
+}
@@ -4,6 +4,7 @@ import API_BASE_URL from "../api"
 import { useNavigate } from "react-router-dom"
 import Container from "../utils/container"
 import TextInput from "../utils/TextInput"
+import { storeTokens } from "../auth"
 
 export default function LoginEl() {
   const [email, setEmail] = useState("")
@@ -16,9 +17,7 @@ export default function LoginEl() {
     params.append("username", email);
     params.append("password", password);
     const response = await axios.post(`${API_BASE_URL}/users/login`, params)
-    const token = response.data.access_token
-    localStorage.setItem("accessToken", token)
-    axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+    storeTokens(response.data)
     navigate("/workouts")
   }
 
@@ -0,0 +1,67 @@
+"""Add exercise usage
+
+Revision ID: 49038cb76eaa
+Revises: 8e598616ec9d
+Create Date: 2026-10-19 01:31:23.329536
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "49038cb76eaa"
+down_revision: Union[str, Sequence[str], None] = "8e598616ec9d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add exercise_usage table and backfill it from history."""
+    op.create_table(
+        "exercise_usage",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.Column("use_count", sa.Integer(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercise.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "exercise_id"),
+    )
+    op.create_index(
+        "ix_exercise_usage_user_frequent",
+        "exercise_usage",
+        ["user_id", sa.text("use_count DESC"), sa.text("last_used_at DESC")],
+    )
+    op.create_index(
+        "ix_exercise_usage_user_recent",
+        "exercise_usage",
+        ["user_id", sa.text("last_used_at DESC")],
+    )
+
+    # Seed the statistics once from template and completed session history
+    op.execute("""
+        INSERT INTO exercise_usage (user_id, exercise_id, use_count, last_used_at)
+        SELECT user_id, exercise_id, count(*), coalesce(max(used_at), now())
+        FROM (
+            SELECT w.user_id, we.exercise_id, w.created_at AS used_at
+            FROM workout_exercise we
+            JOIN workout w ON w.id = we.workout_id
+            UNION ALL
+            SELECT ws.user_id, we.exercise_id, ws.completed_at
+            FROM session_exercise se
+            JOIN workout_session ws ON ws.id = se.session_id
+            JOIN workout_exercise we ON we.id = se.workout_exercise_id
+            WHERE ws.status = 'COMPLETED'
+        ) AS uses
+        GROUP BY user_id, exercise_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop exercise_usage table."""
+    op.drop_index("ix_exercise_usage_user_recent", table_name="exercise_usage")
+    op.drop_index("ix_exercise_usage_user_frequent", table_name="exercise_usage")
+    op.drop_table("exercise_usage")
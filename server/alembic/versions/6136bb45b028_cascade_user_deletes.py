@@ -0,0 +1,55 @@
+"""Cascade user deletes
+
+Revision ID: 6136bb45b028
+Revises: c13e5de56165
+Create Date: 2026-10-19 01:46:04.094717
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6136bb45b028"
+down_revision: Union[str, Sequence[str], None] = "c13e5de56165"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) for each foreign key that now cascades
+CASCADING_FOREIGN_KEYS = [
+    ("workout", "user_id", "users"),
+    ("workout_session", "user_id", "users"),
+    ("workout_exercise", "workout_id", "workout"),
+    ("workout_set", "workout_exercise_id", "workout_exercise"),
+    ("session_exercise", "session_id", "workout_session"),
+    ("session_set", "session_exercise_id", "session_exercise"),
+]
+
+
+def _replace_foreign_keys(ondelete: str | None) -> None:
+    for table, column, referent in CASCADING_FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referent, [column], ["id"], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema - cascade user deletes in the database, add users.deleted_at."""
+    _replace_foreign_keys("CASCADE")
+
+    op.add_column(
+        "users", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index(op.f("ix_users_deleted_at"), "users", ["deleted_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore non-cascading foreign keys, drop users.deleted_at."""
+    op.drop_index(op.f("ix_users_deleted_at"), table_name="users")
+    op.drop_column("users", "deleted_at")
+
+    _replace_foreign_keys(None)
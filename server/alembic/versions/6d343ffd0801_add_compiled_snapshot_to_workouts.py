@@ -0,0 +1,34 @@
+"""Add compiled snapshot to workouts
+
+Revision ID: 6d343ffd0801
+Revises: 905edd35d09a
+Create Date: 2026-10-19 01:23:36.656644
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6d343ffd0801"
+down_revision: Union[str, Sequence[str], None] = "905edd35d09a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "workout",
+        sa.Column("snapshot", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.add_column("workout", sa.Column("snapshot_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("workout", "snapshot_version")
+    op.drop_column("workout", "snapshot")
@@ -0,0 +1,47 @@
+"""Add exercise search indexes
+
+Revision ID: 8e598616ec9d
+Revises: 6d343ffd0801
+Create Date: 2026-10-19 01:27:38.560698
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e598616ec9d"
+down_revision: Union[str, Sequence[str], None] = "6d343ffd0801"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add filter indexes and trigram indexes for search."""
+    op.create_index("ix_exercise_muscle_group", "exercise", ["muscle_group"])
+    op.create_index("ix_exercise_equipment", "exercise", ["equipment"])
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_exercise_name_trgm",
+        "exercise",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_exercise_description_trgm",
+        "exercise",
+        ["description"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop search indexes."""
+    op.drop_index("ix_exercise_description_trgm", table_name="exercise")
+    op.drop_index("ix_exercise_name_trgm", table_name="exercise")
+    op.drop_index("ix_exercise_equipment", table_name="exercise")
+    op.drop_index("ix_exercise_muscle_group", table_name="exercise")
@@ -0,0 +1,31 @@
+"""Add version to workouts
+
+Revision ID: 905edd35d09a
+Revises: 8157d6fa1693
+Create Date: 2026-10-19 01:21:31.260330
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "905edd35d09a"
+down_revision: Union[str, Sequence[str], None] = "8157d6fa1693"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "workout",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("workout", "version")
@@ -0,0 +1,44 @@
+"""Add revoked tokens
+
+Revision ID: c13e5de56165
+Revises: 49038cb76eaa
+Create Date: 2026-10-19 01:42:06.323167
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c13e5de56165"
+down_revision: Union[str, Sequence[str], None] = "49038cb76eaa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add revoked_token table."""
+    op.create_table(
+        "revoked_token",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("jti", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_revoked_token_expires_at"), "revoked_token", ["expires_at"]
+    )
+    op.create_index(
+        op.f("ix_revoked_token_revoked_at"), "revoked_token", ["revoked_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop revoked_token table."""
+    op.drop_index(op.f("ix_revoked_token_revoked_at"), table_name="revoked_token")
+    op.drop_index(op.f("ix_revoked_token_expires_at"), table_name="revoked_token")
+    op.drop_table("revoked_token")
@@ -0,0 +1,32 @@
+"""Add user listing indexes
+
+Revision ID: f19d75865613
+Revises: 6136bb45b028
+Create Date: 2026-10-19 01:49:35.579604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f19d75865613"
+down_revision: Union[str, Sequence[str], None] = "6136bb45b028"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index user creation time and lowercased email prefixes."""
+    op.create_index("ix_users_created_at", "users", ["created_at"])
+    op.create_index(
+        "ix_users_email_lower", "users", [sa.text("lower(email) text_pattern_ops")]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop user listing indexes."""
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.drop_index("ix_users_created_at", table_name="users")
@@ -0,0 +1,77 @@
+"""
+Administrative commands for RepTrack.
+
+Usage:
+    python -m app.cli import-exercises catalog.csv
+    python -m app.cli import-exercises catalog.ndjson --format ndjson
+    python -m app.cli purge-users
+"""
+
+import argparse
+import sys
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database import SessionLocal, engine
+from app.models import User
+from app.services.exercise_import_service import ExerciseImportService
+from app.services.user_service import UserService
+
+
+def import_exercises(args: argparse.Namespace) -> int:
+    fmt = args.format or ExerciseImportService.detect_format(args.path, None)
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = ExerciseImportService.import_catalog(stream, fmt, db)
+    finally:
+        db.close()
+
+    print(
+        f"inserted: {result['inserted']}, updated: {result['updated']}, "
+        f"rejected: {result['rejected']}"
+    )
+    for error in result["errors"]:
+        print(f"  line {error['line']}: {error['error']}", file=sys.stderr)
+    return 0
+
+
+def purge_users(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        user_ids = db.scalars(
+            select(User.id).where(User.deleted_at.is_not(None)).order_by(User.id)
+        ).all()
+
+    for user_id in user_ids:
+        UserService.purge_user(user_id, engine)
+    print(f"purged: {len(user_ids)} users")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-exercises", help="Bulk import the exercise catalog from CSV or NDJSON"
+    )
+    import_parser.add_argument("path", help="Path to a .csv or .ndjson file")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"])
+    import_parser.set_defaults(handler=import_exercises)
+
+    purge_parser = commands.add_parser(
+        "purge-users", help="Finish purging the data of deleted users"
+    )
+    purge_parser.set_defaults(handler=purge_users)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except HTTPException as e:
+        print(f"error: {e.detail}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
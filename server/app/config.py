@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +10,90 @@ class Settings(BaseSettings):
     database_url: str
     secret_key: str
     cors_origins: list[str] = []
+    shared_state_dir: str | None = None
+
+    # Connection pools, per worker. The sync pool serves endpoints running on the
+    # threadpool and, unset, holds one connection per thread: db_pool_size
+    # defaults to threadpool_size and db_max_overflow makes up any shortfall.
+    # The async pool serves the event loop routers and, unset, is sized from
+    # their bulkheads (see app.utils.db_pool). A worker opens at most 12 + 20
+    # connections by default; keep workers times that below PostgreSQL's
+    # max_connections.
+    threadpool_size: int = 12
+    db_pool_size: int | None = None
+    db_max_overflow: int | None = None
+    async_db_pool_size: int | None = None
+    async_db_max_overflow: int | None = None
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Per-router concurrency limits as (limit, max_queue); see app.utils.bulkhead.
+    # The limits of the threadpool routers (users, exercises, workouts) add up
+    # to no more than threadpool_size, so each keeps its share of the sync pool
+    bulkheads: dict[str, tuple[int, int]] = {
+        "users": (3, 32),
+        "exercises": (3, 32),
+        "workouts": (6, 32),
+        "sessions": (12, 64),
+        "reports": (4, 8),
+    }
+    bulkhead_queue_timeout_seconds: float = 5
+    bulkhead_retry_after_seconds: int = 1
+
+    # Response compression; levels are per coding, optionally per route template
+    compression_minimum_size: int = 1024
+    compression_levels: dict[str, int] = {"gzip": 6, "br": 4, "zstd": 3}
+    compression_route_levels: dict[str, dict[str, int]] = {
+        # Streamed exports favour throughput; the catalog is large and static
+        "/users/export": {"gzip": 1, "br": 1, "zstd": 1},
+        "/exercises": {"gzip": 9, "br": 5, "zstd": 9},
+    }
+
+    # Per-request SQL and Server-Timing accounting; see app.utils.query_stats.
+    # The X-DB-* headers are for debugging
+    slow_query_ms: float = 200
+    slow_request_ms: float = 1000
+    slow_request_statements: int = 50
+    db_stats_headers: bool = False
+    server_timing: bool = True
+
+    # Prometheus metrics are served at this path when set, e.g. "/metrics".
+    # They reveal routes, pool occupancy and error counts, so only expose the
+    # path to the scraper, not through the public proxy
+    metrics_path: str | None = None
+
+    # Opt-in request tracing; see app.utils.tracing. Sampled traces are written
+    # as OTLP/JSON lines to `tracing_file` and/or posted to an OTLP/HTTP endpoint;
+    # the file is never rotated, so point it at a path that is. Only enable
+    # trusting the traceparent sampled flag behind a proxy that sets it.
+    tracing_enabled: bool = False
+    tracing_sample_ratio: float = 0.01
+    tracing_trust_parent_sampling: bool = False
+    tracing_file: str | None = None
+    tracing_otlp_endpoint: str | None = None
+
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 30
+    # Revocations reach the other workers of a host at once; this bounds how
+    # long workers on other hosts keep accepting a revoked access token
+    revocation_sync_seconds: float = 30
+
+    # Password hashing runs on its own bounded pool ("thread" or "process")
+    bcrypt_rounds: int = 12
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 8
+    password_hash_retry_after_seconds: int = 2
+
+    # The serialized exercise catalog and search index are rebuilt at least
+    # this often, so catalog writes made on other hosts show up
+    catalog_cache_ttl_seconds: float = 60
+
+    # Authenticated users are served from an in-process cache for this long
+    user_cache_ttl_seconds: float = 60
+    user_cache_size: int = 10000
+    token_cache_size: int = 10000
 
     model_config = SettingsConfigDict(env_file=".env")
 
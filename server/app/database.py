@@ -1,16 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import get_settings
+from app.utils.db_pool import async_pool_options, sync_pool_options
+from app.utils import tracing
+from app.utils.query_stats import after_cursor_execute, before_cursor_execute
 
 settings = get_settings()
 
 if not settings.database_url:
     raise ValueError("DATABASE_URL environment variable is not set!")
 
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    pool_logging_name="sync",
+    **sync_pool_options(settings),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# The event loop path talks to the same database through an asyncio driver
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(database_url: str):
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    pool_logging_name="async",
+    **async_pool_options(settings),
+)
+# Nothing is expired on commit: attributes cannot lazy load outside the greenlet
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys, including ON DELETE CASCADE, unless asked
+    module = type(dbapi_connection).__module__
+    if module.startswith(("sqlite3", "sqlalchemy.dialects.sqlite")):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# Count and time every statement, on both engines, against the current request
+event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+
+if settings.tracing_enabled:
+    # Each statement of a traced request becomes a span under its caller
+    event.listen(Engine, "before_cursor_execute", tracing.before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", tracing.after_cursor_execute)
+    event.listen(Engine, "handle_error", tracing.handle_error)
+
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +67,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,5 +1,18 @@
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
+
 from app.config import get_settings
+from app.database import async_engine
+from app.utils.compression import CompressionMiddleware
+from app.utils.db_pool import SYNC_BULKHEADS, max_connections, sync_request_capacity
+from app.utils.logger import logger
+from app.utils.metrics import mark_worker_stopped
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.request_metrics import RequestMetricsMiddleware
+from app.utils.tracing import TracingMiddleware, tracer
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import (
     user,
@@ -9,16 +22,47 @@ from app.routers import (
     workout,
     workout_session,
     personal_record,
+    metrics,
 )
 
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync endpoints share AnyIO's thread limiter
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    logger.info(
+        f"Worker opens at most {max_connections(settings)} database connections"
+    )
+    admitted = sum(settings.bulkheads[name][0] for name in SYNC_BULKHEADS)
+    if admitted > sync_request_capacity(settings):
+        logger.warning(
+            f"Sync bulkheads admit {admitted} requests but only "
+            f"{sync_request_capacity(settings)} can run at once; a busy router "
+            "will hold up the others"
+        )
+    yield
+    # Close pooled asyncio connections; aiosqlite's threads would outlive the loop
+    await async_engine.dispose()
+    mark_worker_stopped()
+    tracer.shutdown()
+
+
 app = FastAPI(
     title=settings.app_name,
     description=settings.app_description,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    levels=settings.compression_levels,
+    route_levels=settings.compression_route_levels,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -26,6 +70,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    QueryStatsMiddleware,
+    slow_request_ms=settings.slow_request_ms,
+    slow_request_statements=settings.slow_request_statements,
+    expose_headers=settings.db_stats_headers,
+    server_timing=settings.server_timing,
+    timing_allow_origins=settings.cors_origins,
+)
+app.add_middleware(RequestMetricsMiddleware)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
 
 app.include_router(user.router)
 app.include_router(exercise.router)
@@ -34,3 +89,5 @@ app.include_router(workout_exercise.router)
 app.include_router(workout.router)
 app.include_router(workout_session.router)
 app.include_router(personal_record.router)
+if settings.metrics_path:
+    app.include_router(metrics.router, prefix=settings.metrics_path)
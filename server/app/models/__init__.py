@@ -7,6 +7,8 @@ from app.models.session_exercise import SessionExercise
 from app.models.session_set import SessionSet
 from app.models.workout_session import WorkoutSession
 from app.models.personal_record import PersonalRecord
+from app.models.exercise_usage import ExerciseUsage
+from app.models.revoked_token import RevokedToken
 
 __all__ = [
     "User",
@@ -18,4 +20,6 @@ __all__ = [
     "SessionSet",
     "WorkoutSession",
     "PersonalRecord",
+    "ExerciseUsage",
+    "RevokedToken",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
 from app.database import Base
@@ -34,7 +34,25 @@ class Exercise(Base):
     name = Column(String(255), nullable=False, unique=True)
     description = Column(String(1000))
     muscle_group = Column(
-        Enum(MuscleGroup, name="musclegroup", create_type=False), nullable=True
+        Enum(MuscleGroup, name="musclegroup", create_type=False),
+        nullable=True,
+        index=True,
     )
-    equipment = Column(Enum(Equipment), nullable=True)
+    equipment = Column(Enum(Equipment), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Trigram indexes back the fuzzy search on PostgreSQL (requires pg_trgm)
+    __table_args__ = (
+        Index(
+            "ix_exercise_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_exercise_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from app.database import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import relationship
+
+
+class ExerciseUsage(Base):
+    """Per-user running usage totals for catalog exercises, kept for pickers."""
+
+    __tablename__ = "exercise_usage"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    exercise_id = Column(
+        Integer, ForeignKey("exercise.id", ondelete="CASCADE"), primary_key=True
+    )
+    use_count = Column(Integer, nullable=False, default=0)
+    last_used_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    exercise = relationship("Exercise")
+
+    # One index per picker ordering, so each top-K read is a single index scan
+    __table_args__ = (
+        Index(
+            "ix_exercise_usage_user_frequent",
+            "user_id",
+            use_count.desc(),
+            last_used_at.desc(),
+        ),
+        Index("ix_exercise_usage_user_recent", "user_id", last_used_at.desc()),
+    )
+
+    def __repr__(self):
+        return f"<ExerciseUsage user_id={self.user_id} exercise_id={self.exercise_id} count={self.use_count}>"
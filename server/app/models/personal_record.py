@@ -17,16 +17,24 @@ class PersonalRecord(Base):
     __tablename__ = "personal_record"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    exercise_id = Column(Integer, ForeignKey("exercise.id"), nullable=False)
-    session_id = Column(Integer, ForeignKey("workout_session.id"), nullable=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    exercise_id = Column(
+        Integer, ForeignKey("exercise.id", ondelete="CASCADE"), nullable=False
+    )
+    session_id = Column(
+        Integer, ForeignKey("workout_session.id", ondelete="SET NULL"), nullable=True
+    )
 
     pr_type = Column(
         Enum(PRType, name="prtype", create_type=False),
         nullable=False,
     )
     value = Column(Integer, nullable=False)
-    session_set_id = Column(Integer, ForeignKey("session_set.id"), nullable=True)
+    session_set_id = Column(
+        Integer, ForeignKey("session_set.id", ondelete="SET NULL"), nullable=True
+    )
     notes = Column(String(500), nullable=True)
 
     achieved_at = Column(
@@ -41,5 +49,9 @@ class PersonalRecord(Base):
     session = relationship("WorkoutSession")
     session_set = relationship("SessionSet")
 
+    @property
+    def exercise_name(self) -> str | None:
+        return self.exercise.name if self.exercise else None
+
     def __repr__(self):
         return f"<PersonalRecord {self.pr_type.value}={self.value} for exercise_id={self.exercise_id} user_id={self.user_id}>"
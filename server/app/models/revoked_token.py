@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from app.database import Base
+from sqlalchemy import Column, DateTime, Integer, String
+
+
+class RevokedToken(Base):
+    """A revoked token, kept until the token would have expired anyway."""
+
+    __tablename__ = "revoked_token"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Workers load revocations newer than their last sync by this column
+    revoked_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
+
+    def __repr__(self):
+        return f"<RevokedToken jti={self.jti}>"
@@ -7,7 +7,9 @@ class SessionExercise(Base):
     __tablename__ = "session_exercise"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    session_id = Column(Integer, ForeignKey("workout_session.id"), nullable=False)
+    session_id = Column(
+        Integer, ForeignKey("workout_session.id", ondelete="CASCADE"), nullable=False
+    )
     workout_exercise_id = Column(
         Integer, ForeignKey("workout_exercise.id"), nullable=False
     )
@@ -22,5 +24,6 @@ class SessionExercise(Base):
         "SessionSet",
         back_populates="session_exercise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="SessionSet.order_index",
     )
@@ -15,7 +15,7 @@ class SessionSet(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_exercise_id = Column(
-        Integer, ForeignKey("session_exercise.id"), nullable=False
+        Integer, ForeignKey("session_exercise.id", ondelete="CASCADE"), nullable=False
     )
     workout_set_id = Column(Integer, ForeignKey("workout_set.id"), nullable=True)
 
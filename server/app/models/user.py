@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from enum import Enum as PyEnum
-from sqlalchemy import Column, DateTime, Enum, Integer, String, func
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, func
 from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 
@@ -23,16 +23,36 @@ class User(Base):
         nullable=False,
         default=UserRole.USER,
     )
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+    # Set when an account is deleted; its data is purged in the background
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # Serves case-insensitive email prefix filters; text_pattern_ops lets
+    # PostgreSQL use it for LIKE 'prefix%' under any collation
+    __table_args__ = (
+        Index(
+            "ix_users_email_lower",
+            func.lower(email).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+    )
+
+    # Children are removed by ON DELETE CASCADE, never loaded to be deleted
     workouts = relationship(
-        "Workout", back_populates="user", cascade="all, delete-orphan"
+        "Workout",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     workout_sessions = relationship(
-        "WorkoutSession", back_populates="user", cascade="all, delete-orphan"
+        "WorkoutSession",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
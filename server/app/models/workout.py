@@ -1,6 +1,7 @@
 from app.database import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 
@@ -10,14 +11,25 @@ class Workout(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
     notes = Column(String(1000))
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Denormalized copy of the exercises and planned sets, compiled at
+    # `snapshot_version` and used to materialize sessions from a single row.
+    snapshot = deferred(Column(JSON().with_variant(JSONB(), "postgresql")))
+    snapshot_version = Column(Integer, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="workouts")
     workout_exercises = relationship(
-        "WorkoutExercise", back_populates="workout", cascade="all, delete-orphan"
+        "WorkoutExercise",
+        back_populates="workout",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
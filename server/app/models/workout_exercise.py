@@ -10,7 +10,9 @@ class WorkoutExercise(Base):
     exercise_id = Column(Integer, ForeignKey("exercise.id"), nullable=False)
     order_index = Column(Integer, nullable=False)
     notes = Column(String(500))
-    workout_id = Column(Integer, ForeignKey("workout.id"), nullable=False)
+    workout_id = Column(
+        Integer, ForeignKey("workout.id", ondelete="CASCADE"), nullable=False
+    )
 
     # Relationships
     workout = relationship("Workout", back_populates="workout_exercises")
@@ -19,5 +21,6 @@ class WorkoutExercise(Base):
         "WorkoutSet",
         back_populates="workout_exercise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="WorkoutSet.order_index",
     )
@@ -16,7 +16,9 @@ class WorkoutSession(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     workout_id = Column(Integer, ForeignKey("workout.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     status = Column(
         Enum(SessionStatus, name="sessionstatus", create_type=False),
         nullable=False,
@@ -32,5 +34,8 @@ class WorkoutSession(Base):
     workout = relationship("Workout")
     user = relationship("User", back_populates="workout_sessions")
     session_exercises = relationship(
-        "SessionExercise", back_populates="session", cascade="all, delete-orphan"
+        "SessionExercise",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -26,7 +26,7 @@ class WorkoutSet(Base):
     order_index = Column(Integer, nullable=False)
     notes = Column(String(500))
     workout_exercise_id = Column(
-        Integer, ForeignKey("workout_exercise.id"), nullable=False
+        Integer, ForeignKey("workout_exercise.id", ondelete="CASCADE"), nullable=False
     )
 
     # Relationships
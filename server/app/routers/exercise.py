@@ -1,68 +1,139 @@
 from app.database import get_db
-from app.models.user import User
+from app.models.exercise import Equipment, MuscleGroup
 from app.schemas.exercise import (
     AllExercisesResponse,
     CreateExercisePayload,
+    ExerciseImportResponse,
     ExerciseResponse,
     ExerciseResponseWithMsg,
+    ExerciseSearchResponse,
+    TopExercisesResponse,
     UpdateExercisePayload,
 )
+from app.services.exercise_import_service import ExerciseImportService
 from app.services.exercise_service import ExerciseService
-from app.utils.auth import get_current_user
-from app.utils.formatter import format_response
-from fastapi import APIRouter, Depends
+from app.services.exercise_usage_service import ExerciseUsageService
+from app.utils.auth import AuthenticatedUser, get_current_user
+from app.utils.etag import etag_matches
+from app.utils.bulkhead import bulkhead
+from app.utils.formatter import format_response, model_response
+from app.utils.negotiation import NegotiatedRoute
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
+from typing import Literal
 from fastapi_throttle import RateLimiter
 import os
 
-router = APIRouter(prefix="/exercises", tags=["exercises"])
+router = APIRouter(prefix="/exercises", tags=["exercises"], route_class=NegotiatedRoute)
 if os.getenv("TESTING"):
     router.dependencies = []
 else:
     exercise_limiter = RateLimiter(times=60, seconds=60)
     router.dependencies = [Depends(exercise_limiter)]
+router.dependencies.append(bulkhead("exercises"))
 
 
 @router.post("", response_model=ExerciseResponse, status_code=201)
 def create_exercise(
     exercise_data: CreateExercisePayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = ExerciseService.create_exercise(exercise_data, current_user, db)
-    return format_response(exercise)
+    return model_response(ExerciseResponse, format_response(exercise), status_code=201)
+
+
+@router.post("/import", response_model=ExerciseImportResponse, status_code=200)
+def import_exercises(
+    file: UploadFile,
+    format: Literal["csv", "ndjson"] | None = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    result = ExerciseImportService.import_exercises(file, format, current_user, db)
+    return model_response(
+        ExerciseImportResponse,
+        format_response(
+            result,
+            f"Imported {result['inserted'] + result['updated']} exercises, "
+            f"rejected {result['rejected']}",
+        ),
+    )
 
 
 @router.get("", response_model=AllExercisesResponse, status_code=200)
 def get_all_exercises(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    etag, body = ExerciseService.get_catalog_json(db)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/search", response_model=ExerciseSearchResponse, status_code=200)
+def search_exercises(
+    q: str | None = Query(None, max_length=100),
+    muscle_group: MuscleGroup | None = None,
+    equipment: Equipment | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    exercises, total = ExerciseService.search_exercises(
+        q, muscle_group, equipment, limit, offset, db
+    )
+    return model_response(
+        ExerciseSearchResponse,
+        {
+            "success": True,
+            "data": exercises,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        },
+    )
+
+
+@router.get("/top", response_model=TopExercisesResponse, status_code=200)
+def get_top_exercises(
+    order: Literal["frequent", "recent"] = "frequent",
+    limit: int = Query(10, ge=1, le=50),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    exercises = ExerciseService.get_all_exercises(db)
-    return format_response(exercises)
+    usage = ExerciseUsageService.get_top_exercises(current_user, order, limit, db)
+    return model_response(TopExercisesResponse, format_response(usage))
 
 
 @router.get("/{exercise_id}", response_model=ExerciseResponse, status_code=200)
 def get_exercise_by_id(
     exercise_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = ExerciseService.get_exercise_by_id(exercise_id, db)
-    return format_response(exercise)
+    return model_response(ExerciseResponse, format_response(exercise))
 
 
 @router.put("/{exercise_id}", response_model=ExerciseResponseWithMsg, status_code=200)
 def update_exercise(
     exercise_id: int,
     update_data: UpdateExercisePayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = ExerciseService.update_exercise(
         exercise_id, current_user, update_data, db
     )
-    return format_response(
-        exercise, f"Successfully updated exercise with id {exercise_id}"
+    return model_response(
+        ExerciseResponseWithMsg,
+        format_response(
+            exercise, f"Successfully updated exercise with id {exercise_id}"
+        ),
     )
 
 
@@ -71,10 +142,13 @@ def update_exercise(
 )
 def delete_exercise(
     exercise_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = ExerciseService.delete_exercise(exercise_id, current_user, db)
-    return format_response(
-        exercise, f"Successfully deleted exercise with id {exercise_id}"
+    return model_response(
+        ExerciseResponseWithMsg,
+        format_response(
+            exercise, f"Successfully deleted exercise with id {exercise_id}"
+        ),
     )
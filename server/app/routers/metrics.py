@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from app.utils.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("", include_in_schema=False)
+def get_metrics():
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
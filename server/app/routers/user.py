@@ -1,79 +1,132 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.services.user_service import UserService
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.schemas.user import (
     AllUsersResponse,
     CreateUserPayload,
+    LogoutPayload,
+    RefreshTokenPayload,
+    TokenResponse,
     UpdateUserPayload,
+    UserListFilters,
+    UserPageQuery,
     UserResponse,
     UserResponseWithMsg,
 )
-from app.models import User
-from app.utils.auth import get_current_user
-from app.utils.formatter import format_response
+from app.utils.auth import AuthenticatedUser, get_current_user, oauth2_scheme
+from app.utils.bulkhead import bulkhead
+from app.utils.formatter import format_response, model_response
+from app.utils.negotiation import NegotiatedRoute
 from fastapi_throttle import RateLimiter
 import os
 
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=NegotiatedRoute)
 if os.getenv("TESTING"):
     router.dependencies = []
 else:
     limiter = RateLimiter(times=30, seconds=60)
     router.dependencies = [Depends(limiter)]
+router.dependencies.append(bulkhead("users"))
 
 
 @router.post("", response_model=UserResponseWithMsg, status_code=201)
 def create_new_user(user_data: CreateUserPayload, db: Session = Depends(get_db)):
     new_user = UserService.create_new_user(user_data, db)
-    return format_response(new_user, "Successfully created new user.")
+    return model_response(
+        UserResponseWithMsg,
+        format_response(new_user, "Successfully created new user."),
+        status_code=201,
+    )
 
 
 @router.get("", response_model=AllUsersResponse, status_code=200)
 def get_all_users(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    query: Annotated[UserPageQuery, Query()],
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    users, next_cursor = UserService.get_all_users(current_user, query, db)
+    return model_response(
+        AllUsersResponse, {"success": True, "data": users, "next_cursor": next_cursor}
+    )
+
+
+@router.get("/export", status_code=200)
+def export_users(
+    filters: Annotated[UserListFilters, Query()],
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    users = UserService.get_all_users(current_user, db)
-    return format_response(users)
+    lines = UserService.export_users(current_user, filters, db.get_bind())
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 
 @router.get("/{user_id}", response_model=UserResponse, status_code=200)
 def get_user_by_id(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user = UserService.get_user_by_id(user_id, db)
-    return format_response(user)
+    return model_response(UserResponse, format_response(user))
 
 
 @router.put("/{user_id}", response_model=UserResponseWithMsg, status_code=200)
 def update_user_details(
     user_id: int,
     update_data: UpdateUserPayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user = UserService.update_user_details(user_id, update_data, current_user, db)
-    return format_response(user, f"Successfully updated user {user_id}")
+    return model_response(
+        UserResponseWithMsg,
+        format_response(user, f"Successfully updated user {user_id}"),
+    )
 
 
 @router.delete("/{user_id}", response_model=UserResponseWithMsg, status_code=200)
 def delete_user(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user = UserService.delete_user(user_id, current_user, db)
-    return format_response(user, f"Successfully deleted user {user_id}")
+    background_tasks.add_task(UserService.purge_user, user_id, db.get_bind())
+    return model_response(
+        UserResponseWithMsg,
+        format_response(user, f"Successfully deleted user {user_id}"),
+    )
 
 
 @router.post("/login", status_code=200)
-def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login_user(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await UserService.login_user_async(form_data, db)
+
+
+@router.post("/refresh", response_model=TokenResponse, status_code=200)
+def refresh_tokens(data: RefreshTokenPayload, db: Session = Depends(get_db)):
+    return UserService.refresh_tokens(data.refresh_token, db)
+
+
+@router.post("/logout", status_code=204)
+def logout(
+    data: LogoutPayload | None = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    token = UserService.login_user(form_data, db)
-    return token
+    refresh_token = data.refresh_token if data else None
+    UserService.logout(token, refresh_token, current_user, db)
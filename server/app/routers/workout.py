@@ -1,80 +1,167 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import User
-from app.utils.auth import get_current_user
+from app.utils.auth import AuthenticatedUser, get_current_user
 from app.schemas.workout import (
     AllWorkoutResponse,
+    CloneWorkoutPayload,
     CreateWorkoutPayload,
+    CreateWorkoutTemplatePayload,
+    ReorderWorkoutPayload,
     UpdateWorkoutPayload,
     WorkoutResponse,
     WorkoutResponseWithMsg,
 )
 from app.services.workout_service import WorkoutService
-from app.utils.formatter import format_response
+from app.utils.etag import etag_matches, make_etag
+from app.utils.bulkhead import bulkhead
+from app.utils.formatter import format_response, model_response
+from app.utils.negotiation import NegotiatedRoute, response_media_type
 from fastapi_throttle import RateLimiter
 import os
 
 
-router = APIRouter(prefix="/workout", tags=["workout"])
+router = APIRouter(prefix="/workout", tags=["workout"], route_class=NegotiatedRoute)
 if os.getenv("TESTING"):
     router.dependencies = []
 else:
     limiter = RateLimiter(times=120, seconds=60)
     router.dependencies = [Depends(limiter)]
+router.dependencies.append(bulkhead("workouts"))
 
 
 @router.post("", response_model=WorkoutResponseWithMsg, status_code=201)
 def create_workout(
     data: CreateWorkoutPayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     new_workout = WorkoutService.create_workout(data, current_user, db)
     print(new_workout)
-    return format_response(new_workout, "Successfully created new workout")
+    return model_response(
+        WorkoutResponseWithMsg,
+        format_response(new_workout, "Successfully created new workout"),
+        status_code=201,
+    )
+
+
+@router.post("/template", response_model=WorkoutResponseWithMsg, status_code=201)
+def create_workout_template(
+    data: CreateWorkoutTemplatePayload,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    new_workout = WorkoutService.create_workout_template(data, current_user, db)
+    return model_response(
+        WorkoutResponseWithMsg,
+        format_response(new_workout, "Successfully created new workout"),
+        status_code=201,
+    )
 
 
 @router.get("", response_model=AllWorkoutResponse, status_code=200)
 def get_all_workouts_for_user(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    versions = WorkoutService.get_workout_versions_for_user(current_user, db)
+    etag = make_etag("workouts", current_user.id, versions, response_media_type.get())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     workouts = WorkoutService.get_all_workouts_for_user(current_user, db)
-    return format_response(workouts)
+    etag = make_etag(
+        "workouts",
+        current_user.id,
+        sorted((workout.id, workout.version) for workout in workouts),
+        response_media_type.get(),
+    )
+    return model_response(
+        AllWorkoutResponse, format_response(workouts), headers={"ETag": etag}
+    )
 
 
 @router.get("/{workout_id}", response_model=WorkoutResponse, status_code=200)
 def get_workout_by_id(
     workout_id: int,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    version = WorkoutService.get_workout_version(workout_id, db)
+    etag = make_etag("workout", workout_id, version, response_media_type.get())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     workout = WorkoutService.get_workout_by_id(workout_id, db)
-    return format_response(workout)
+    etag = make_etag(
+        "workout", workout_id, workout.version, response_media_type.get()
+    )
+    return model_response(
+        WorkoutResponse, format_response(workout), headers={"ETag": etag}
+    )
 
 
 @router.put("/{workout_id}", response_model=WorkoutResponseWithMsg, status_code=200)
 def update_workout(
     workout_id: int,
     data: UpdateWorkoutPayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     workout = WorkoutService.update_workout(workout_id, data, current_user, db)
-    return format_response(
-        workout, f"successfully updated workout with id {workout_id}"
+    return model_response(
+        WorkoutResponseWithMsg,
+        format_response(workout, f"successfully updated workout with id {workout_id}"),
+    )
+
+
+@router.put(
+    "/{workout_id}/order", response_model=WorkoutResponseWithMsg, status_code=200
+)
+def reorder_workout(
+    workout_id: int,
+    data: ReorderWorkoutPayload,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    workout = WorkoutService.reorder_workout(workout_id, data, current_user, db)
+    return model_response(
+        WorkoutResponseWithMsg,
+        format_response(
+            workout, f"successfully reordered workout with id {workout_id}"
+        ),
     )
 
 
 @router.delete("/{workout_id}", status_code=200)
 def delete_workout(
     workout_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     workout = WorkoutService.delete_workout(workout_id, current_user, db)
     return format_response(
         workout, f"successfully deleted workout with id {workout_id}"
     )
+
+
+@router.post(
+    "/{workout_id}/clone", response_model=WorkoutResponseWithMsg, status_code=201
+)
+def clone_workout(
+    workout_id: int,
+    data: CloneWorkoutPayload | None = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    workout = WorkoutService.clone_workout(
+        workout_id, data or CloneWorkoutPayload(), current_user, db
+    )
+    return model_response(
+        WorkoutResponseWithMsg,
+        format_response(workout, f"Successfully cloned workout with id {workout_id}"),
+        status_code=201,
+    )
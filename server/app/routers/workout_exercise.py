@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import User
 from app.schemas.workout_exercise import (
     AllWorkoutExercisesResponse,
     CreateWorkoutExercisePayload,
@@ -10,51 +9,60 @@ from app.schemas.workout_exercise import (
     WorkoutExerciseResponse,
     WorkoutExerciseResponseWithMsg,
 )
-from app.utils.auth import get_current_user
+from app.utils.auth import AuthenticatedUser, get_current_user
 from app.services.workout_exercise_service import WorkoutExerciseService
-from app.utils.formatter import format_response
+from app.utils.bulkhead import bulkhead
+from app.utils.formatter import format_response, model_response
+from app.utils.negotiation import NegotiatedRoute
 from fastapi_throttle import RateLimiter
 import os
 
 
-router = APIRouter(prefix="/workout/{workout_id}/exercise", tags=["workout_exercise"])
+router = APIRouter(
+    prefix="/workout/{workout_id}/exercise",
+    tags=["workout_exercise"],
+    route_class=NegotiatedRoute,
+)
 if os.getenv("TESTING"):
     router.dependencies = []
 else:
     limiter = RateLimiter(times=120, seconds=60)
     router.dependencies = [Depends(limiter)]
+router.dependencies.append(bulkhead("workouts"))
 
 
 @router.post("", response_model=WorkoutExerciseResponse, status_code=201)
 def create_workout_exercise(
     data: CreateWorkoutExercisePayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     new_workout_exercise = WorkoutExerciseService.create_workout_exercise(data, db)
-    return format_response(new_workout_exercise)
+    return model_response(
+        WorkoutExerciseResponse, format_response(new_workout_exercise), status_code=201
+    )
 
 
 @router.get("", response_model=AllWorkoutExercisesResponse, status_code=200)
 def get_all_workout_exercises(
     workout_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercises = WorkoutExerciseService.get_all_workout_exercises(
         workout_id, current_user, db
     )
-    return format_response(exercises)
+    return model_response(AllWorkoutExercisesResponse, format_response(exercises))
 
 
 @router.get("/{exercise_id}", response_model=WorkoutExerciseResponse, status_code=200)
 def get_workout_exercise_by_id(
     exercise_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = WorkoutExerciseService.get_workout_exercise(exercise_id, db)
-    return format_response(exercise)
+    return model_response(WorkoutExerciseResponse, format_response(exercise))
 
 
 @router.put(
@@ -63,19 +71,22 @@ def get_workout_exercise_by_id(
 def update_workout_exercise(
     exercise_id: int,
     data: UpdateWorkoutExercisePayload,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = WorkoutExerciseService.update_workout_exercise(exercise_id, data, db)
-    return format_response(
-        exercise, f"Successfully updated workout exercise with id {exercise_id}"
+    return model_response(
+        WorkoutExerciseResponseWithMsg,
+        format_response(
+            exercise, f"Successfully updated workout exercise with id {exercise_id}"
+        ),
     )
 
 
 @router.delete("/{exercise_id}")
 def delete_workout_exercise(
     exercise_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     exercise = WorkoutExerciseService.delete_workout_exercise(exercise_id, db)
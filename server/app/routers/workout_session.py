@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import User
+from app.database import get_async_db
 from app.models.workout_session import SessionStatus
-from app.utils.auth import get_current_user
+from app.utils.auth import AuthenticatedUser, get_current_user_async
 from app.schemas.workout_session import (
     CreateWorkoutSessionPayload,
     CompleteSessionSetPayload,
@@ -14,85 +13,126 @@ from app.schemas.workout_session import (
     SessionSetResponseWithMsg,
 )
 from app.services.workout_session_service import WorkoutSessionService
-from app.utils.formatter import format_response
+from app.utils.bulkhead import bulkhead
+from app.utils.formatter import format_response, model_response
+from app.utils.negotiation import NegotiatedRoute
 from fastapi_throttle import RateLimiter
 import os
 
 
-router = APIRouter(prefix="/sessions", tags=["workout_sessions"])
+router = APIRouter(
+    prefix="/sessions", tags=["workout_sessions"], route_class=NegotiatedRoute
+)
 if os.getenv("TESTING"):
     router.dependencies = []
 else:
     limiter = RateLimiter(times=120, seconds=60)
     router.dependencies = [Depends(limiter)]
 
+# Session history is a heavy read; it must not hold up set logging
+sessions_bulkhead = bulkhead("sessions")
+reports_bulkhead = bulkhead("reports")
+
 
-@router.post("", response_model=WorkoutSessionResponseWithMsg, status_code=201)
-def start_workout_session(
+@router.post(
+    "",
+    response_model=WorkoutSessionResponseWithMsg,
+    status_code=201,
+    dependencies=[sessions_bulkhead],
+)
+async def start_workout_session(
     data: CreateWorkoutSessionPayload,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Start a new workout session based on a workout template."""
-    session = WorkoutSessionService.start_session(data, current_user, db)
-    return format_response(session, "Successfully started workout session")
+    session = await WorkoutSessionService.start_session_async(data, current_user, db)
+    return model_response(
+        WorkoutSessionResponseWithMsg,
+        format_response(session, "Successfully started workout session"),
+        status_code=201,
+    )
 
 
-@router.get("", response_model=AllWorkoutSessionsResponse, status_code=200)
-def get_user_sessions(
+@router.get(
+    "",
+    response_model=AllWorkoutSessionsResponse,
+    status_code=200,
+    dependencies=[reports_bulkhead],
+)
+async def get_user_sessions(
     status: SessionStatus = Query(None, description="Filter by session status"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all workout sessions for the current user."""
-    sessions = WorkoutSessionService.get_user_sessions(current_user, db, status)
-    return format_response(sessions)
+    sessions = await WorkoutSessionService.get_user_sessions_async(
+        current_user, db, status
+    )
+    return model_response(AllWorkoutSessionsResponse, format_response(sessions))
 
 
-@router.get("/{session_id}", response_model=WorkoutSessionResponse, status_code=200)
-def get_session_by_id(
+@router.get(
+    "/{session_id}",
+    response_model=WorkoutSessionResponse,
+    status_code=200,
+    dependencies=[sessions_bulkhead],
+)
+async def get_session_by_id(
     session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific workout session with all exercises and sets."""
-    session = WorkoutSessionService.get_session_by_id(session_id, current_user, db)
-    return format_response(session)
+    session = await WorkoutSessionService.get_session_by_id_async(
+        session_id, current_user, db
+    )
+    return model_response(WorkoutSessionResponse, format_response(session))
 
 
 @router.put(
     "/{session_id}/set/{set_id}",
     response_model=SessionSetResponseWithMsg,
     status_code=200,
+    dependencies=[sessions_bulkhead],
 )
-def complete_set(
+async def complete_set(
     session_id: int,
     set_id: int,
     data: CompleteSessionSetPayload,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Record completion of a set with actual reps and weight performed."""
-    completed_set = WorkoutSessionService.complete_set(
+    completed_set = await WorkoutSessionService.complete_set_async(
         session_id, set_id, data, current_user, db
     )
-    return format_response(completed_set, f"Successfully completed set {set_id}")
+    return model_response(
+        SessionSetResponseWithMsg,
+        format_response(completed_set, f"Successfully completed set {set_id}"),
+    )
 
 
 @router.post(
     "/{session_id}/complete",
     response_model=WorkoutSessionResponseWithMsg,
     status_code=200,
+    dependencies=[sessions_bulkhead],
 )
-def complete_session(
+async def complete_session(
     session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Mark a workout session as completed."""
-    session = WorkoutSessionService.complete_session(session_id, current_user, db)
-    return format_response(
-        session, f"Successfully completed workout session {session_id}"
+    session = await WorkoutSessionService.complete_session_async(
+        session_id, current_user, db
+    )
+    return model_response(
+        WorkoutSessionResponseWithMsg,
+        format_response(
+            session, f"Successfully completed workout session {session_id}"
+        ),
     )
 
 
@@ -100,14 +140,20 @@ def complete_session(
     "/{session_id}/cancel",
     response_model=WorkoutSessionResponseWithMsg,
     status_code=200,
+    dependencies=[sessions_bulkhead],
 )
-def cancel_session(
+async def cancel_session(
     session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Cancel a workout session."""
-    session = WorkoutSessionService.cancel_session(session_id, current_user, db)
-    return format_response(
-        session, f"Successfully cancelled workout session {session_id}"
+    session = await WorkoutSessionService.cancel_session_async(
+        session_id, current_user, db
+    )
+    return model_response(
+        WorkoutSessionResponseWithMsg,
+        format_response(
+            session, f"Successfully cancelled workout session {session_id}"
+        ),
     )
@@ -41,3 +41,40 @@ class ExerciseResponseWithMsg(BaseModel):
     success: bool
     message: str
     data: ExerciseSchema
+
+
+class ExerciseSearchResponse(BaseModel):
+    success: bool
+    data: list[ExerciseSchema]
+    total: int
+    limit: int
+    offset: int
+
+
+class ExerciseUsageSchema(BaseModel):
+    exercise: ExerciseSchema
+    use_count: int
+    last_used_at: datetime
+
+
+class TopExercisesResponse(BaseModel):
+    success: bool
+    data: list[ExerciseUsageSchema]
+
+
+class ExerciseImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ExerciseImportResult(BaseModel):
+    inserted: int
+    updated: int
+    rejected: int
+    errors: list[ExerciseImportError]
+
+
+class ExerciseImportResponse(BaseModel):
+    success: bool
+    message: str
+    data: ExerciseImportResult
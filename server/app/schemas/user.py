@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from app.models.user import UserRole
 
@@ -26,6 +26,16 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
+    expires_in: int | None = None
+
+
+class RefreshTokenPayload(BaseModel):
+    refresh_token: str
+
+
+class LogoutPayload(BaseModel):
+    refresh_token: str | None = None
 
 
 class UserSchema(BaseModel):
@@ -42,9 +52,22 @@ class UserResponse(BaseModel):
     data: UserSchema
 
 
+class UserListFilters(BaseModel):
+    role: UserRole | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    email_prefix: str | None = Field(None, min_length=1, max_length=255)
+
+
+class UserPageQuery(UserListFilters):
+    limit: int = Field(50, ge=1, le=200)
+    after: int | None = Field(None, ge=0)
+
+
 class AllUsersResponse(BaseModel):
     success: bool
     data: list[UserSchema]
+    next_cursor: int | None = None
 
 
 class UserResponseWithMsg(BaseModel):
@@ -1,7 +1,10 @@
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.schemas.workout_exercise import WorkoutExerciseSchema
+from app.schemas.workout_exercise import (
+    CreateNestedWorkoutExercisePayload,
+    WorkoutExerciseSchema,
+)
 
 
 class CreateWorkoutPayload(BaseModel):
@@ -9,11 +12,30 @@ class CreateWorkoutPayload(BaseModel):
     notes: str | None = None
 
 
+class CreateWorkoutTemplatePayload(CreateWorkoutPayload):
+    workout_exercises: list[CreateNestedWorkoutExercisePayload] = []
+
+
 class UpdateWorkoutPayload(BaseModel):
     name: str | None = None
     notes: str | None = None
 
 
+class CloneWorkoutPayload(BaseModel):
+    name: str | None = None
+    user_id: int | None = None
+
+
+class OrderIndexItem(BaseModel):
+    id: int
+    order_index: int
+
+
+class ReorderWorkoutPayload(BaseModel):
+    workout_exercises: list[OrderIndexItem] = []
+    sets: list[OrderIndexItem] = []
+
+
 class WorkoutSchema(BaseModel):
     id: int
     name: str
@@ -21,6 +43,7 @@ class WorkoutSchema(BaseModel):
     user_id: int
     created_at: datetime
     updated_at: datetime
+    version: int
     workout_exercises: list[WorkoutExerciseSchema] | None
 
 
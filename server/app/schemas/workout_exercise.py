@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 
-from app.schemas.workout_set import WorkoutSetSchema
+from app.schemas.workout_set import CreateWorkoutSetPayload, WorkoutSetSchema
 from app.schemas.exercise import ExerciseSchema
 
 
@@ -11,6 +11,13 @@ class CreateWorkoutExercisePayload(BaseModel):
     workout_id: int
 
 
+class CreateNestedWorkoutExercisePayload(BaseModel):
+    exercise_id: int
+    order_index: int
+    notes: str | None = None
+    sets: list[CreateWorkoutSetPayload] = []
+
+
 class UpdateWorkoutExercisePayload(BaseModel):
     order_index: int | None = None
     notes: str | None = None
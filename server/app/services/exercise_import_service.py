@@ -0,0 +1,313 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.exercise import Exercise
+from app.models.user import User, UserRole
+from app.schemas.exercise import CreateExercisePayload
+from app.services.exercise_service import ExerciseService
+from app.services.workout_service import WorkoutService
+from app.utils.logger import logger
+from app.utils.tracing import traced_service
+
+BATCH_SIZE = 5000
+# Rejected rows beyond this are counted but not described in the report
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+COLUMNS = ("name", "description", "muscle_group", "equipment")
+
+
+@traced_service
+class ExerciseImportService:
+    """Service for bulk importing the exercise catalog."""
+
+    @staticmethod
+    def detect_format(filename: str | None, content_type: str | None) -> str:
+        """
+        Work out whether an upload is CSV or NDJSON from its name or content type.
+
+        Raises:
+            HTTPException:
+                - 400: If the format cannot be determined.
+        """
+        extension = "." + (filename or "").rsplit(".", 1)[-1].lower()
+        fmt = IMPORT_FORMATS.get(extension) or IMPORT_FORMATS.get(
+            (content_type or "").split(";")[0].strip()
+        )
+        if not fmt:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported import format, expected CSV or NDJSON",
+            )
+        return fmt
+
+    @staticmethod
+    def import_exercises(
+        file: UploadFile, fmt: str | None, current_user: User, db: Session
+    ) -> dict:
+        """
+        Bulk import exercises from a CSV or NDJSON upload. Only accessible by admin users.
+
+        See `import_catalog` for the import semantics.
+
+        Args:
+            file (UploadFile): The uploaded catalog file.
+            fmt (str | None): "csv" or "ndjson"; detected from the upload when omitted.
+            current_user (User): The currently authenticated user.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            dict: The import report produced by `import_catalog`.
+
+        Raises:
+            HTTPException:
+                - 403: If the user is not an admin.
+                - 400: If the format is unsupported or the upload cannot be decoded.
+                - 500: On database or unexpected internal errors.
+        """
+        if current_user.role is not UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Admin only method"
+            )
+        fmt = fmt or ExerciseImportService.detect_format(
+            file.filename, file.content_type
+        )
+        return ExerciseImportService.import_catalog(file.file, fmt, db)
+
+    @staticmethod
+    def import_catalog(stream: BinaryIO, fmt: str, db: Session) -> dict:
+        """
+        Stream exercises into the catalog with upsert-on-name semantics.
+
+        Rows are read and validated one at a time and written in batches of
+        `BATCH_SIZE`, so memory stays flat regardless of the upload size. New
+        names are inserted and existing names have their description, muscle
+        group and equipment replaced. On PostgreSQL each batch is loaded with
+        `COPY` into a temporary table and merged with one
+        `INSERT ... ON CONFLICT`; other backends use batched `executemany`
+        inserts and primary-key updates. Invalid rows, and repeats of a name
+        already seen earlier in the same upload, are rejected without aborting
+        the import. The whole import commits as one transaction.
+
+        This performs no permission check; it is meant for trusted callers
+        such as `import_exercises` and the command line.
+
+        Args:
+            stream (BinaryIO): The UTF-8 encoded upload. CSV needs a header row
+                naming the columns; NDJSON holds one JSON object per line.
+            fmt (str): Either "csv" or "ndjson".
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            dict: The `inserted`, `updated` and `rejected` counts, and `errors`
+            describing up to `MAX_REPORTED_ERRORS` rejected rows by line number.
+
+        Raises:
+            HTTPException:
+                - 400: If the upload cannot be decoded.
+                - 500: On database or unexpected internal errors.
+
+        Logging:
+            - Info: The final counts once the import commits.
+            - Error: On decoding, database or internal failures.
+        """
+        result = {"inserted": 0, "updated": 0, "rejected": 0, "errors": []}
+        seen_names = set()
+        batch = []
+
+        def reject(line: int, error: str):
+            result["rejected"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append({"line": line, "error": error})
+
+        try:
+            postgres = db.get_bind().dialect.name == "postgresql"
+            if postgres:
+                ExerciseImportService._create_staging_table(db)
+            write_batch = (
+                ExerciseImportService._copy_batch
+                if postgres
+                else ExerciseImportService._executemany_batch
+            )
+
+            for line, row in ExerciseImportService._read_rows(stream, fmt):
+                if isinstance(row, str):
+                    reject(line, row)
+                    continue
+                try:
+                    exercise = CreateExercisePayload.model_validate(row)
+                except ValidationError as e:
+                    error = e.errors()[0]
+                    field = ".".join(str(part) for part in error["loc"])
+                    reject(line, f"{field}: {error['msg']}" if field else error["msg"])
+                    continue
+                if exercise.name in seen_names:
+                    reject(line, f"Duplicate name '{exercise.name}' in upload")
+                    continue
+
+                seen_names.add(exercise.name)
+                batch.append(exercise.model_dump())
+                if len(batch) >= BATCH_SIZE:
+                    ExerciseImportService._write(write_batch, batch, result, db)
+                    batch = []
+
+            if batch:
+                ExerciseImportService._write(write_batch, batch, result, db)
+            db.commit()
+
+        except UnicodeDecodeError as e:
+            db.rollback()
+            logger.error(f"Exercise import is not valid UTF-8: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Import file must be UTF-8 encoded",
+            )
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error importing exercises: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error during exercise import",
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Unexpected error importing exercises: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error",
+            )
+
+        if result["inserted"] or result["updated"]:
+            ExerciseService.publish_catalog_change()
+        logger.info(
+            f"Imported exercises - inserted: {result['inserted']}, "
+            f"updated: {result['updated']}, rejected: {result['rejected']}"
+        )
+        return result
+
+    @staticmethod
+    def _read_rows(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, dict | str]]:
+        """Yield `(line, row)` pairs, where `row` is an error message if unparseable."""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            if fmt == "csv":
+                reader = csv.DictReader(text)
+                for row in reader:
+                    # Blank cells mean "not provided" rather than an empty string
+                    yield reader.line_num, {
+                        key: value
+                        for key, value in row.items()
+                        if key is not None and value not in (None, "")
+                    }
+            else:
+                for line, raw in enumerate(text, start=1):
+                    if not raw.strip():
+                        continue
+                    try:
+                        row = json.loads(raw)
+                    except json.JSONDecodeError as e:
+                        yield line, f"Invalid JSON: {e.msg}"
+                        continue
+                    if not isinstance(row, dict):
+                        yield line, "Expected a JSON object"
+                        continue
+                    yield line, row
+        finally:
+            # Leave the underlying upload open for its owner to close
+            text.detach()
+
+    @staticmethod
+    def _write(write_batch, rows: list[dict], result: dict, db: Session):
+        inserted, updated = write_batch(rows, db)
+        result["inserted"] += inserted
+        result["updated"] += updated
+        if updated:
+            # Workouts embed the exercises they use; new names are in none yet
+            names = [row["name"] for row in rows]
+            WorkoutService.bump_versions_for_catalog(
+                select(Exercise.id).where(Exercise.name.in_(names)), db
+            )
+
+    @staticmethod
+    def _create_staging_table(db: Session):
+        db.connection().exec_driver_sql(
+            "CREATE TEMP TABLE exercise_import "
+            "(name text, description text, muscle_group text, equipment text) "
+            "ON COMMIT DROP"
+        )
+
+    @staticmethod
+    def _copy_batch(rows: list[dict], db: Session) -> tuple[int, int]:
+        # Enum columns store member names, so stage those rather than values
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                (
+                    row["name"],
+                    row["description"],
+                    row["muscle_group"].name,
+                    row["equipment"].name,
+                )
+            )
+        buffer.seek(0)
+
+        connection = db.connection()
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY exercise_import ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+        # xmax is 0 only for rows this statement inserted rather than updated
+        flags = connection.exec_driver_sql(
+            "INSERT INTO exercise (name, description, muscle_group, equipment) "
+            "SELECT name, description, muscle_group::musclegroup, equipment::equipment "
+            "FROM exercise_import "
+            "ON CONFLICT (name) DO UPDATE SET "
+            "description = EXCLUDED.description, "
+            "muscle_group = EXCLUDED.muscle_group, "
+            "equipment = EXCLUDED.equipment "
+            "RETURNING (xmax = 0)"
+        ).scalars()
+        inserted = sum(1 for was_inserted in flags if was_inserted)
+        connection.exec_driver_sql("TRUNCATE exercise_import")
+        return inserted, len(rows) - inserted
+
+    @staticmethod
+    def _executemany_batch(rows: list[dict], db: Session) -> tuple[int, int]:
+        existing = dict(
+            db.execute(
+                select(Exercise.name, Exercise.id).where(
+                    Exercise.name.in_([row["name"] for row in rows])
+                )
+            ).all()
+        )
+        new_rows = [row for row in rows if row["name"] not in existing]
+        changed_rows = [
+            {**row, "id": existing[row["name"]]}
+            for row in rows
+            if row["name"] in existing
+        ]
+
+        if new_rows:
+            db.execute(insert(Exercise), new_rows)
+        if changed_rows:
+            db.execute(update(Exercise), changed_rows)
+        return len(new_rows), len(changed_rows)
@@ -1,14 +1,46 @@
 from sqlite3 import IntegrityError
+import hashlib
 from fastapi import HTTPException, status
+from sqlalchemy import func, literal, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.schemas.exercise import CreateExercisePayload, UpdateExercisePayload
+from app.services.workout_service import WorkoutService
+from app.schemas.exercise import (
+    AllExercisesResponse,
+    CreateExercisePayload,
+    ExerciseSchema,
+    UpdateExercisePayload,
+)
+from app.config import get_settings
+from app.utils.cache import LRUCache
+from app.utils.etag import make_etag
 from app.utils.logger import logger
-from app.models.exercise import Exercise
+from app.utils.shared_counter import SharedCounter
+from app.utils.tracing import traced_service
+from app.utils.trigram_index import TrigramIndex
+from app.models.exercise import Equipment, Exercise, MuscleGroup
 from app.models.user import User, UserRole
 
+settings = get_settings()
 
+# The catalog generation is shared by all workers on the host and bumped on
+# every catalog write; each worker caches the serialized catalog per generation.
+# Writes made on another host do not move this host's counter, so entries also
+# expire after `catalog_cache_ttl_seconds`.
+catalog_generation = SharedCounter("exercise-catalog")
+catalog_cache = LRUCache(
+    maxsize=2, ttl=settings.catalog_cache_ttl_seconds, name="exercise_catalog"
+)
+search_index_cache = LRUCache(
+    maxsize=2, ttl=settings.catalog_cache_ttl_seconds, name="exercise_search_index"
+)
+
+# Description matches count for half as much as name matches when ranking
+DESCRIPTION_WEIGHT = 0.5
+
+
+@traced_service
 class ExerciseService:
     @staticmethod
     def create_exercise(
@@ -48,6 +80,7 @@ class ExerciseService:
             db.add(new_exercise)
             db.commit()
             db.refresh(new_exercise)
+            ExerciseService.publish_catalog_change()
 
             logger.info(
                 f"Successfully created new exercise - Name: {new_exercise.name}"
@@ -110,6 +143,190 @@ class ExerciseService:
                 detail="Failed to fetch exercises",
             )
 
+    @staticmethod
+    def get_catalog_json(db: Session) -> tuple[str, bytes]:
+        """
+        Retrieve the serialized exercise catalog and its ETag.
+
+        The response body is serialized once per catalog generation, and at
+        least every `catalog_cache_ttl_seconds`, and served from memory in
+        between, so a cache hit costs no database query.
+
+        Args:
+            db (Session): The active SQLAlchemy session, used only on a cache miss.
+
+        Returns:
+            tuple[str, bytes]: The ETag and the JSON body of `AllExercisesResponse`.
+
+        Raises:
+            HTTPException:
+                - 500: If a database or internal error occurs.
+        """
+        generation = catalog_generation.value()
+        cached = catalog_cache.get(generation)
+        if cached:
+            return cached
+
+        exercises = ExerciseService.get_all_exercises(db)
+        body = (
+            AllExercisesResponse.model_validate(
+                {"success": True, "data": exercises}, from_attributes=True
+            )
+            .model_dump_json()
+            .encode("utf-8")
+        )
+        etag = make_etag("exercises", hashlib.blake2b(body, digest_size=16).hexdigest())
+        logger.debug(
+            f"Serialized {len(exercises)} exercises for catalog generation {generation}"
+        )
+
+        catalog_cache.set(generation, (etag, body))
+        return etag, body
+
+    @staticmethod
+    def publish_catalog_change():
+        """Invalidate the cached catalog in every worker process."""
+        generation = catalog_generation.increment()
+        logger.info(f"Exercise catalog changed, now at generation {generation}")
+
+    @staticmethod
+    def search_exercises(
+        q: str | None,
+        muscle_group: MuscleGroup | None,
+        equipment: Equipment | None,
+        limit: int,
+        offset: int,
+        db: Session,
+    ):
+        """
+        Search the exercise catalog with typo-tolerant, ranked text matching.
+
+        Names and descriptions are matched by trigram similarity, so queries
+        like "benchpres" still find "Bench Press". Results are ordered by
+        score (name matches outrank description matches), then by name. On
+        PostgreSQL the search runs in the database against the pg_trgm GIN
+        indexes; other backends use an in-process trigram index built once
+        per catalog generation.
+
+        Args:
+            q (str | None): The search text. When empty, all exercises matching
+                the filters are returned in name order.
+            muscle_group (MuscleGroup | None): Only return exercises for this muscle group.
+            equipment (Equipment | None): Only return exercises using this equipment.
+            limit (int): Maximum number of results to return.
+            offset (int): Number of results to skip.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            tuple[list, int]: The requested page of exercises and the total
+            number of matches.
+
+        Raises:
+            HTTPException:
+                - 500: If a database or internal error occurs.
+
+        Logging:
+            - Debug: Search parameters and number of matches.
+            - Error: On database-level issues.
+        """
+        q = (q or "").strip()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                exercises, total = ExerciseService._search_in_database(
+                    q, muscle_group, equipment, limit, offset, db
+                )
+            else:
+                exercises, total = ExerciseService._search_in_memory(
+                    q, muscle_group, equipment, limit, offset, db
+                )
+        except SQLAlchemyError as e:
+            logger.error(f"Database error searching exercises: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to search exercises",
+            )
+
+        logger.debug(
+            f"Exercise search q={q!r} muscle_group={muscle_group} "
+            f"equipment={equipment} matched {total}"
+        )
+        return exercises, total
+
+    @staticmethod
+    def _search_in_database(q, muscle_group, equipment, limit, offset, db: Session):
+        query = select(Exercise, func.count().over().label("total"))
+        if muscle_group:
+            query = query.where(Exercise.muscle_group == muscle_group)
+        if equipment:
+            query = query.where(Exercise.equipment == equipment)
+
+        if q:
+            # `<%` is pg_trgm's word-similarity operator and can use the GIN indexes
+            text = literal(q)
+            score = func.greatest(
+                func.word_similarity(text, Exercise.name),
+                func.word_similarity(text, func.coalesce(Exercise.description, ""))
+                * DESCRIPTION_WEIGHT,
+            )
+            query = query.where(
+                or_(
+                    text.op("<%")(Exercise.name),
+                    text.op("<%")(Exercise.description),
+                    Exercise.name.icontains(q, autoescape=True),
+                )
+            ).order_by(score.desc(), Exercise.name)
+        else:
+            query = query.order_by(Exercise.name)
+
+        rows = db.execute(query.limit(limit).offset(offset)).all()
+        if rows:
+            return [row.Exercise for row in rows], rows[0].total
+        if offset:
+            # Past the last page: the window count is unavailable, count directly
+            total = db.scalar(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            )
+            return [], total
+        return [], 0
+
+    @staticmethod
+    def _search_in_memory(q, muscle_group, equipment, limit, offset, db: Session):
+        index = ExerciseService._get_search_index(db)
+        if q:
+            keys = [key for _, key in index.search(q)]
+        else:
+            keys = list(index.documents)
+
+        results = [index.documents[key] for key in keys]
+        if muscle_group:
+            results = [e for e in results if e.muscle_group == muscle_group]
+        if equipment:
+            results = [e for e in results if e.equipment == equipment]
+        return results[offset : offset + limit], len(results)
+
+    @staticmethod
+    def _get_search_index(db: Session) -> TrigramIndex:
+        generation = catalog_generation.value()
+        index = search_index_cache.get(generation)
+        if index:
+            return index
+
+        index = TrigramIndex({"name": 1.0, "description": DESCRIPTION_WEIGHT})
+        for exercise in db.scalars(select(Exercise).order_by(Exercise.name)):
+            index.add(
+                exercise.id,
+                ExerciseSchema.model_validate(exercise, from_attributes=True),
+                name=exercise.name,
+                description=exercise.description,
+            )
+        logger.debug(
+            f"Built search index of {len(index.documents)} exercises "
+            f"for catalog generation {generation}"
+        )
+
+        search_index_cache.set(generation, index)
+        return index
+
     @staticmethod
     def get_exercise_by_id(exercise_id: int, db: Session):
         """
@@ -192,9 +409,11 @@ class ExerciseService:
 
             for field, value in update_dict.items():
                 setattr(exercise, field, value)
+            WorkoutService.bump_versions_for_catalog([exercise_id], db)
 
             db.commit()
             db.refresh(exercise)
+            ExerciseService.publish_catalog_change()
             return exercise
 
         except IntegrityError as e:
@@ -253,6 +472,7 @@ class ExerciseService:
             exercise = ExerciseService.get_exercise_by_id(exercise_id, db)
             db.delete(exercise)
             db.commit()
+            ExerciseService.publish_catalog_change()
             return exercise
 
         except HTTPException:
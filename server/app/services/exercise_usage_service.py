@@ -0,0 +1,157 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
+
+from app.models import ExerciseUsage, User, Workout
+from app.utils.logger import logger
+from app.utils.tracing import traced_service
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+@traced_service
+class ExerciseUsageService:
+    """Service maintaining per-user exercise usage statistics."""
+
+    @staticmethod
+    def record_usage(
+        user_id: int,
+        exercise_ids: Iterable[int],
+        db: Session,
+        used_at: datetime | None = None,
+    ):
+        """
+        Add uses of catalog exercises to a user's usage statistics.
+
+        All exercises are written with a single upsert that increments the
+        running count and moves `last_used_at` forward, so no history has to be
+        rescanned. The write joins the caller's transaction; committing is left
+        to the caller so the statistics change atomically with the edit or
+        session that produced them.
+
+        Args:
+            user_id (int): The user the exercises were used by.
+            exercise_ids (Iterable[int]): Catalog exercise IDs, one entry per use.
+            db (Session): The active SQLAlchemy session.
+            used_at (datetime | None): When the exercises were used. Defaults to now.
+
+        Returns:
+            None
+
+        Raises:
+            SQLAlchemyError: Propagated to the caller, which owns the transaction.
+
+        Logging:
+            - Debug: Number of exercises recorded for the user.
+        """
+        counts = Counter(exercise_ids)
+        if not counts:
+            return
+
+        used_at = used_at or datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": user_id,
+                "exercise_id": exercise_id,
+                "use_count": count,
+                "last_used_at": used_at,
+            }
+            for exercise_id, count in counts.items()
+        ]
+
+        upsert = _UPSERTS.get(db.get_bind().dialect.name)
+        if upsert is None:
+            ExerciseUsageService._merge_usage(rows, db)
+        else:
+            statement = upsert(ExerciseUsage).values(rows)
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ExerciseUsage.user_id, ExerciseUsage.exercise_id],
+                    set_={
+                        "use_count": ExerciseUsage.use_count
+                        + statement.excluded.use_count,
+                        "last_used_at": statement.excluded.last_used_at,
+                    },
+                )
+            )
+        logger.debug(f"Recorded usage of {len(rows)} exercises for user {user_id}")
+
+    @staticmethod
+    def record_workout_usage(workout_id: int, exercise_ids: Iterable[int], db: Session):
+        """Record uses of exercises added to a workout template for its owner."""
+        user_id = db.scalar(select(Workout.user_id).where(Workout.id == workout_id))
+        if user_id is not None:
+            ExerciseUsageService.record_usage(user_id, exercise_ids, db)
+
+    @staticmethod
+    def _merge_usage(rows: list[dict], db: Session):
+        # Portable fallback for backends without INSERT ... ON CONFLICT
+        existing = {
+            usage.exercise_id: usage
+            for usage in db.scalars(
+                select(ExerciseUsage).where(
+                    ExerciseUsage.user_id == rows[0]["user_id"],
+                    ExerciseUsage.exercise_id.in_([row["exercise_id"] for row in rows]),
+                )
+            )
+        }
+        for row in rows:
+            usage = existing.get(row["exercise_id"])
+            if usage is None:
+                db.add(ExerciseUsage(**row))
+            else:
+                usage.use_count += row["use_count"]
+                usage.last_used_at = row["last_used_at"]
+
+    @staticmethod
+    def get_top_exercises(current_user: User, order: str, limit: int, db: Session):
+        """
+        Retrieve the user's top exercises for the exercise picker.
+
+        Args:
+            current_user (User): The currently authenticated user.
+            order (str): "frequent" to rank by use count, "recent" to rank by last use.
+            limit (int): Maximum number of exercises to return.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            list[ExerciseUsage]: Usage rows with their catalog exercise loaded.
+
+        Raises:
+            HTTPException:
+                - 500: If a database error occurs.
+
+        Logging:
+            - Error: On database-level issues.
+        """
+        if order == "recent":
+            ordering = (ExerciseUsage.last_used_at.desc(),)
+        else:
+            ordering = (
+                ExerciseUsage.use_count.desc(),
+                ExerciseUsage.last_used_at.desc(),
+            )
+
+        try:
+            return db.scalars(
+                select(ExerciseUsage)
+                .options(joinedload(ExerciseUsage.exercise))
+                .where(ExerciseUsage.user_id == current_user.id)
+                .order_by(*ordering, ExerciseUsage.exercise_id)
+                .limit(limit)
+            ).all()
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error fetching top exercises for user {current_user.id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch exercise usage",
+            )
@@ -3,18 +3,25 @@ from typing import Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, session
 from sqlalchemy import desc, func
 
 from app.models import WorkoutSession
 from app.models.personal_record import PersonalRecord, PRType
+from app.schemas.personal_record import PersonalRecordSchema, PRSummary
+from app.utils.async_service import run_service
 from app.utils.logger import logger
+from app.utils.metrics import PR_DETECTION_SECONDS
+from app.utils.tracing import traced_service
 
 
+@traced_service
 class PersonalRecordService:
     """Service for managing personal records."""
 
     @staticmethod
+    @PR_DETECTION_SECONDS.time()
     def check_and_update_prs_for_session(
         session: WorkoutSession, db: Session
     ) -> list[PersonalRecord]:
@@ -190,7 +197,11 @@ class PersonalRecordService:
             List of personal records
         """
         try:
-            query = db.query(PersonalRecord).filter(PersonalRecord.user_id == user_id)
+            query = (
+                db.query(PersonalRecord)
+                .options(joinedload(PersonalRecord.exercise))
+                .filter(PersonalRecord.user_id == user_id)
+            )
 
             if exercise_id:
                 query = query.filter(PersonalRecord.exercise_id == exercise_id)
@@ -227,6 +238,7 @@ class PersonalRecordService:
         try:
             prs = (
                 db.query(PersonalRecord)
+                .options(joinedload(PersonalRecord.exercise))
                 .filter(PersonalRecord.user_id == user_id)
                 .order_by(
                     PersonalRecord.exercise_id,
@@ -277,6 +289,7 @@ class PersonalRecordService:
 
             recent_prs = (
                 db.query(PersonalRecord)
+                .options(joinedload(PersonalRecord.exercise))
                 .filter(PersonalRecord.user_id == user_id)
                 .order_by(desc(PersonalRecord.achieved_at))
                 .limit(10)
@@ -321,6 +334,7 @@ class PersonalRecordService:
         try:
             pr = (
                 db.query(PersonalRecord)
+                .options(joinedload(PersonalRecord.exercise))
                 .filter(PersonalRecord.id == pr_id, PersonalRecord.user_id == user_id)
                 .first()
             )
@@ -346,3 +360,48 @@ class PersonalRecordService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete personal record",
             )
+
+    # Async variants for the event loop; see `run_service`
+
+    @staticmethod
+    async def get_user_prs_async(
+        user_id: int,
+        exercise_id: Optional[int],
+        pr_type: Optional[PRType],
+        session_id: Optional[int],
+        db: AsyncSession,
+    ) -> list[PersonalRecordSchema]:
+        return await run_service(
+            db,
+            list[PersonalRecordSchema],
+            PersonalRecordService.get_user_prs,
+            user_id,
+            exercise_id,
+            pr_type,
+            session_id,
+        )
+
+    @staticmethod
+    async def get_current_prs_by_exercise_async(
+        user_id: int, db: AsyncSession
+    ) -> dict[int, dict[PRType, PersonalRecordSchema]]:
+        return await run_service(
+            db,
+            dict[int, dict[PRType, PersonalRecordSchema]],
+            PersonalRecordService.get_current_prs_by_exercise,
+            user_id,
+        )
+
+    @staticmethod
+    async def get_pr_summary_async(user_id: int, db: AsyncSession) -> PRSummary:
+        return await run_service(
+            db, PRSummary, PersonalRecordService.get_pr_summary, user_id
+        )
+
+    @staticmethod
+    async def delete_pr_async(
+        pr_id: int, user_id: int, db: AsyncSession
+    ) -> PersonalRecordSchema:
+        return await run_service(
+            db, PersonalRecordSchema, PersonalRecordService.delete_pr, pr_id, user_id
+        )
@@ -1,14 +1,48 @@
+import re
+from collections.abc import Iterator
+from datetime import datetime, timezone
+
 from fastapi import HTTPException, status
+from jose import JWTError
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.schemas.user import CreateUserPayload, TokenResponse, UpdateUserPayload
-from app.utils.password import hash_password, verify_password
+from app.schemas.user import (
+    CreateUserPayload,
+    TokenResponse,
+    UpdateUserPayload,
+    UserListFilters,
+    UserPageQuery,
+    UserSchema,
+)
+from app.utils.password import (
+    hash_password,
+    verify_password_async,
+)
 from app.utils.logger import logger
+from app.models import PersonalRecord, Workout, WorkoutSession
 from app.models.user import User, UserRole
+from app.models.revoked_token import RevokedToken
 from fastapi.security import OAuth2PasswordRequestForm
-from app.utils.auth import create_access_token
-
-
+from app.utils.auth import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    invalidate_user,
+    revocations,
+)
+from app.utils.tracing import traced_service
+
+# Parent rows deleted per transaction when purging a user
+PURGE_CHUNK_SIZE = 500
+# Rows fetched per round trip when streaming the user export
+EXPORT_BATCH_SIZE = 1000
+
+
+@traced_service
 class UserService:
     @staticmethod
     def create_new_user(user_data: CreateUserPayload, db: Session):
@@ -91,18 +125,27 @@ class UserService:
             )
 
     @staticmethod
-    def get_all_users(current_user: User, db: Session):
+    def get_all_users(current_user: User, query: UserPageQuery, db: Session):
         """
-        Retrieve all registered users.
+        Retrieve one page of registered users. Only accessible by admin users.
+
+        Pages are keyset paginated on the user ID: each page resumes after the
+        last ID of the previous one, so every page costs the same index range
+        scan however deep into the listing it is.
 
         Args:
+            current_user (User): The currently authenticated user.
+            query (UserPageQuery): The filters, the page size `limit`, and the
+                `after` cursor; only users with a greater ID than it are returned.
             db (Session): The active SQLAlchemy session.
 
         Returns:
-            list[User]: A list of all user records.
+            tuple[list[User], int | None]: The page of users, and the cursor for
+            the next page or None if this is the last page.
 
         Raises:
             HTTPException:
+                - 403: If the user is not an admin.
                 - 500: If a database or internal error occurs.
 
         Logging:
@@ -110,11 +153,19 @@ class UserService:
             - Info: On successful fetch.
             - Error: On database-related issues.
         """
+        UserService._require_admin(current_user)
         try:
-            logger.debug("Fetching all users")
-            users = db.query(User).all()
+            logger.debug(f"Fetching users with {query}")
+            limit = query.limit
+            statement = UserService._filter_users(select(User), query)
+            if query.after is not None:
+                statement = statement.where(User.id > query.after)
+            # One extra row tells whether another page follows
+            users = db.scalars(statement.order_by(User.id).limit(limit + 1)).all()
+            next_cursor = users[limit - 1].id if len(users) > limit else None
+            users = users[:limit]
             logger.info(f"Fetched {len(users)} users")
-            return users
+            return users, next_cursor
         except SQLAlchemyError as e:
             logger.error(f"Database error fetching users: {str(e)}")
             raise HTTPException(
@@ -122,6 +173,92 @@ class UserService:
                 detail="Failed to fetch users",
             )
 
+    @staticmethod
+    def export_users(
+        current_user: User, filters: UserListFilters, bind: Engine | Connection
+    ) -> Iterator[str]:
+        """
+        Export every matching user as newline-delimited JSON. Only accessible by admin users.
+
+        The permission check happens immediately; the returned iterator then
+        streams the users from a server-side cursor in batches of
+        `EXPORT_BATCH_SIZE`, reading plain rows rather than ORM objects, so
+        memory use stays flat regardless of how many users exist.
+
+        Args:
+            current_user (User): The currently authenticated user.
+            filters (UserListFilters): Role, creation range and email prefix filters.
+            bind (Engine | Connection): The database to read from; the export
+                uses its own session because it outlives the request handler.
+
+        Returns:
+            Iterator[str]: One JSON encoded user per line, in ID order.
+
+        Raises:
+            HTTPException:
+                - 403: If the user is not an admin.
+
+        Logging:
+            - Info: Number of users exported once the stream finishes.
+            - Error: On database failures, which end the stream early.
+        """
+        UserService._require_admin(current_user)
+        statement = UserService._filter_users(
+            select(
+                User.id,
+                User.name,
+                User.email,
+                User.role,
+                User.created_at,
+                User.updated_at,
+            ),
+            filters,
+        ).order_by(User.id)
+        return UserService._stream_users(statement, bind)
+
+    @staticmethod
+    def _stream_users(statement, bind: Engine | Connection) -> Iterator[str]:
+        exported = 0
+        with Session(bind) as db:
+            try:
+                result = db.execute(
+                    statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+                )
+                # One chunk per batch keeps writes to the client few and large
+                for rows in result.partitions():
+                    yield "".join(
+                        UserSchema.model_validate(row._mapping).model_dump_json() + "\n"
+                        for row in rows
+                    )
+                    exported += len(rows)
+            except SQLAlchemyError as e:
+                logger.error(f"Database error exporting users: {str(e)}")
+                raise
+        logger.info(f"Exported {exported} users")
+
+    @staticmethod
+    def _filter_users(statement, filters: UserListFilters):
+        statement = statement.where(User.deleted_at.is_(None))
+        if filters.role is not None:
+            statement = statement.where(User.role == filters.role)
+        if filters.created_after is not None:
+            statement = statement.where(User.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            statement = statement.where(User.created_at < filters.created_before)
+        if filters.email_prefix:
+            prefix = re.sub(r"([\\%_])", r"\\\1", filters.email_prefix.lower())
+            statement = statement.where(
+                func.lower(User.email).like(f"{prefix}%", escape="\\")
+            )
+        return statement
+
+    @staticmethod
+    def _require_admin(current_user: User):
+        if current_user.role is not UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Admin only method"
+            )
+
     @staticmethod
     def get_user_by_id(user_id: int, db: Session):
         """
@@ -146,7 +283,11 @@ class UserService:
         """
         try:
             logger.debug(f"Fetching user ID: {user_id}")
-            user = db.query(User).filter(User.id == user_id).first()
+            user = (
+                db.query(User)
+                .filter(User.id == user_id, User.deleted_at.is_(None))
+                .first()
+            )
             if not user:
                 logger.warning(f"User ID {user_id} not found")
                 raise HTTPException(
@@ -234,6 +375,7 @@ class UserService:
 
             db.commit()
             db.refresh(user)
+            invalidate_user(user_id)
             logger.info(f"Updated user {user_id}: {user.name}")
             return user
 
@@ -266,6 +408,12 @@ class UserService:
         """
         Delete a user account from the system.
 
+        The account is only marked as deleted here, which takes effect
+        immediately: the user can no longer log in or authenticate and is
+        hidden from lookups. Their workouts, sessions and records are removed
+        afterwards by `purge_user`, which callers should schedule in the
+        background.
+
         Args:
             user_id (int): The ID of the user to delete.
             db (Session): The active SQLAlchemy session.
@@ -289,8 +437,10 @@ class UserService:
                     detail="Only admin or account owner can access this method",
                 )
             user = UserService.get_user_by_id(user_id, db)
-            db.delete(user)
+            user.deleted_at = datetime.now(timezone.utc)
             db.commit()
+            db.refresh(user)
+            invalidate_user(user_id)
             logger.info(f"Deleted user {user_id}: {user.name}")
             return user
 
@@ -313,61 +463,301 @@ class UserService:
             )
 
     @staticmethod
-    def login_user(form_data: OAuth2PasswordRequestForm, db: Session):
+    def purge_user(user_id: int, bind: Engine | Connection):
+        """
+        Permanently remove a deleted user and everything they own.
+
+        Rows are deleted in chunks of `PURGE_CHUNK_SIZE` parents, each in its
+        own short transaction, and the database's ON DELETE CASCADE removes
+        the children of each chunk. No objects are loaded into memory and no
+        lock is held for longer than one chunk. Purging is idempotent, so an
+        interrupted purge can be resumed with `python -m app.cli purge-users`.
+
+        Args:
+            user_id (int): The ID of a user previously passed to `delete_user`.
+            bind (Engine | Connection): The database to purge from; the purge
+                uses its own session because it runs after the request ends.
+
+        Returns:
+            None
+
+        Logging:
+            - Info: When the purge completes.
+            - Warning: If the user is not marked as deleted.
+            - Error: On database failures, leaving the purge to be resumed.
+        """
+        with Session(bind) as db:
+            try:
+                deleted_at = db.scalar(
+                    select(User.deleted_at).where(User.id == user_id)
+                )
+                if deleted_at is None:
+                    logger.warning(f"Not purging user {user_id}: not deleted")
+                    return
+
+                purged = 0
+                # Sessions must go before the workouts they reference, and
+                # records before sessions to skip nulling their session links
+                for model in (PersonalRecord, WorkoutSession, Workout):
+                    while True:
+                        chunk = (
+                            select(model.id)
+                            .where(model.user_id == user_id)
+                            .limit(PURGE_CHUNK_SIZE)
+                        )
+                        result = db.execute(
+                            delete(model)
+                            .where(model.id.in_(chunk))
+                            .execution_options(synchronize_session=False)
+                        )
+                        db.commit()
+                        purged += result.rowcount
+                        if result.rowcount < PURGE_CHUNK_SIZE:
+                            break
+
+                db.execute(delete(User).where(User.id == user_id))
+                db.commit()
+                logger.info(f"Purged user {user_id} and {purged} owned rows")
+
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.error(f"Database error purging user {user_id}: {str(e)}")
+
+    @staticmethod
+    async def login_user_async(form_data: OAuth2PasswordRequestForm, db: AsyncSession):
         """
         Authenticate a user and issue a JWT access token.
 
+        Runs on the event loop: it reads only the columns a token needs and
+        awaits the password check on the hashing pool, so a login never holds
+        a thread while it waits.
+
         Args:
             form_data (OAuth2PasswordRequestForm): The OAuth2 login form containing username and password.
-            db (Session): The active SQLAlchemy session.
+            db (AsyncSession): The active asyncio SQLAlchemy session.
 
         Returns:
-            TokenResponse: A response containing the JWT token and token type.
+            TokenResponse: A short-lived access token and a refresh token.
 
         Raises:
             HTTPException:
                 - 401: For invalid credentials.
-                - 500: For database or internal server errors.
+                - 503: If the password hashing pool is saturated.
+                - 500: For database errors.
 
         Logging:
             - Debug: On login attempt.
             - Info: On successful authentication.
             - Warning: On failed login attempts.
-            - Error: On unexpected or database issues.
+            - Error: On database issues.
         """
+        username = form_data.username.lower()
+        logger.debug(f"Login attempt for: {username}")
         try:
-            username = form_data.username.lower()
-            logger.debug(f"Login attempt for: {username}")
+            user = (
+                await db.execute(
+                    select(User.id, User.email, User.role, User.password).where(
+                        User.email == username, User.deleted_at.is_(None)
+                    )
+                )
+            ).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error during login for {username}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Login service unavailable",
+            )
+
+        if not user or not await verify_password_async(
+            form_data.password, user.password
+        ):
+            logger.warning(f"Failed login attempt for: {username}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials",
+            )
 
-            user = db.query(User).filter(User.email == username).first()
+        logger.info(f"User {user.id} ({user.email}) logged in successfully")
+        return UserService._issue_tokens(user)
 
-            if not user or not verify_password(form_data.password, user.password):
-                logger.warning(f"Failed login attempt for: {username}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid credentials",
-                )
+    @staticmethod
+    def refresh_tokens(refresh_token: str, db: Session):
+        """
+        Exchange a refresh token for a new access token and refresh token.
+
+        Refresh tokens rotate: the presented token is revoked as part of the
+        exchange, so each one can be used once. Presenting a revoked refresh
+        token is logged as possible token theft. Rotations are not published
+        to the other workers, whose lists only guard access tokens; the
+        unique jti of the revocation row rejects a token used twice.
 
-            token = create_access_token(
-                {"user": {"email": user.email, "id": user.id, "role": str(user.role)}}
+        Args:
+            refresh_token (str): The refresh token issued at login or by a previous refresh.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            TokenResponse: The new access token and refresh token.
+
+        Raises:
+            HTTPException:
+                - 401: If the refresh token is invalid, expired, already used or
+                  its user no longer exists.
+                - 500: For database or internal server errors.
+
+        Logging:
+            - Info: On successful refresh.
+            - Warning: When a revoked refresh token is presented.
+            - Error: On unexpected or database issues.
+        """
+        invalid_token = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            payload = decode_token(refresh_token)
+            if payload.get("type") != "refresh" or not payload.get("jti"):
+                raise invalid_token
+            user_id = int(payload["sub"])
+        except (JWTError, KeyError, TypeError, ValueError):
+            raise invalid_token
+
+        try:
+            if revocations.is_revoked(payload["jti"], db):
+                logger.warning(f"Revoked refresh token presented for user {user_id}")
+                raise invalid_token
+
+            user = (
+                db.query(User)
+                .filter(User.id == user_id, User.deleted_at.is_(None))
+                .first()
             )
+            if not user:
+                raise invalid_token
+
+            UserService._revoke(db, payload)
+            db.commit()
 
-            logger.info(f"User {user.id} ({user.email}) logged in successfully")
-            return TokenResponse(access_token=token, token_type="bearer")
+            logger.info(f"Refreshed tokens for user {user_id}")
+            return UserService._issue_tokens(user)
 
+        except IntegrityError:
+            # This or another worker already rotated this token
+            db.rollback()
+            logger.warning(f"Revoked refresh token presented for user {user_id}")
+            raise invalid_token
         except HTTPException:
+            db.rollback()
             raise
         except SQLAlchemyError as e:
-            logger.error(
-                f"Database error during login for {form_data.username}: {str(e)}"
+            db.rollback()
+            logger.error(f"Database error refreshing tokens for {user_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Token refresh unavailable",
             )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Unexpected error refreshing tokens for {user_id}: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Login service unavailable",
+                detail="Internal server error",
+            )
+
+    @staticmethod
+    def logout(
+        access_token: str, refresh_token: str | None, current_user: User, db: Session
+    ):
+        """
+        Revoke the caller's access token and, when given, their refresh token.
+
+        Args:
+            access_token (str): The bearer token the request was authenticated with.
+            refresh_token (str | None): The refresh token to revoke alongside it.
+            current_user (User): The currently authenticated user.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            None
+
+        Raises:
+            HTTPException:
+                - 400: If the refresh token is invalid or belongs to another user.
+                - 500: For database or internal server errors.
+
+        Logging:
+            - Info: On successful logout.
+            - Error: On unexpected or database issues.
+        """
+        payloads = [decode_token(access_token)]
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token)
+            except JWTError:
+                refresh_payload = None
+            if (
+                not refresh_payload
+                or refresh_payload.get("type") != "refresh"
+                or refresh_payload.get("sub") != str(current_user.id)
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid refresh token",
+                )
+            # Rotated refresh tokens are only known to the database
+            rotated = db.scalar(
+                select(RevokedToken.id).where(
+                    RevokedToken.jti == refresh_payload["jti"]
+                )
+            )
+            if rotated is None:
+                payloads.append(refresh_payload)
+
+        try:
+            UserService._revoke(db, *payloads)
+            db.commit()
+            revocations.publish()
+            logger.info(f"User {current_user.id} logged out")
+
+        except IntegrityError:
+            # Already revoked by a concurrent logout
+            db.rollback()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error logging out {current_user.id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Logout unavailable",
             )
         except Exception as e:
-            logger.error(f"Unexpected login error for {form_data.username}: {str(e)}")
+            db.rollback()
+            logger.error(f"Unexpected error logging out {current_user.id}: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error",
             )
+
+    @staticmethod
+    def _issue_tokens(user: User) -> TokenResponse:
+        access_token = create_access_token(
+            {"user": {"email": user.email, "id": user.id, "role": user.role.value}}
+        )
+        return TokenResponse(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=create_refresh_token(user.id),
+            expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    @staticmethod
+    def _revoke(db: Session, *payloads: dict):
+        now = datetime.now(timezone.utc)
+        # Revocations only matter until the token would expire by itself
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        for payload in payloads:
+            if payload.get("jti"):
+                revocations.add(
+                    payload["jti"],
+                    datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                    db,
+                )
@@ -8,9 +8,12 @@ from app.schemas.workout_exercise import (
 )
 from app.models import Exercise, User, WorkoutExercise
 from app.utils.logger import logger
+from app.utils.tracing import traced_service
+from app.services.exercise_usage_service import ExerciseUsageService
 from app.services.workout_service import WorkoutService
 
 
+@traced_service
 class WorkoutExerciseService:
     @staticmethod
     # TODO: Use the workout_id from the url
@@ -53,6 +56,10 @@ class WorkoutExerciseService:
 
             new_workout_exercise = WorkoutExercise(**data_dict)
             db.add(new_workout_exercise)
+            WorkoutService.bump_version(new_workout_exercise.workout_id, db)
+            ExerciseUsageService.record_workout_usage(
+                new_workout_exercise.workout_id, [new_workout_exercise.exercise_id], db
+            )
             db.commit()
             db.refresh(new_workout_exercise)
 
@@ -187,6 +194,7 @@ class WorkoutExerciseService:
         try:
             exercise = WorkoutExerciseService.get_workout_exercise(exercise_id, db)
             db.delete(exercise)
+            WorkoutService.bump_version(exercise.workout_id, db)
             db.commit()
             logger.info(f"Deleted workout exercise ID: {exercise_id}")
             return exercise
@@ -257,6 +265,7 @@ class WorkoutExerciseService:
 
             for field, value in update_dict.items():
                 setattr(exercise, field, value)
+            WorkoutService.bump_version(exercise.workout_id, db)
 
             db.commit()
             db.refresh(exercise)
@@ -1,13 +1,40 @@
 from fastapi import HTTPException, status
+from sqlalchemy import (
+    Integer,
+    case,
+    column,
+    insert,
+    literal,
+    select,
+    union_all,
+    update,
+    values,
+)
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session, joinedload
 
-from app.models import User, Workout
-from app.schemas.workout import CreateWorkoutPayload, UpdateWorkoutPayload
+from app.models import Exercise, User, Workout
+from app.models.user import UserRole
+from app.models.workout_set import WorkoutSet
+from app.schemas.workout import (
+    CloneWorkoutPayload,
+    CreateWorkoutPayload,
+    CreateWorkoutTemplatePayload,
+    OrderIndexItem,
+    ReorderWorkoutPayload,
+    UpdateWorkoutPayload,
+)
+from app.services.exercise_usage_service import ExerciseUsageService
+from app.utils.cache import LRUCache
 from app.utils.logger import logger
+from app.utils.tracing import traced_service
 from app.models.workout_exercise import WorkoutExercise
 
+# Compiled template snapshots keyed by workout ID, stored as (version, snapshot).
+workout_snapshot_cache = LRUCache(maxsize=2048, name="workout_snapshots")
 
+
+@traced_service
 class WorkoutService:
     @staticmethod
     def create_workout(data: CreateWorkoutPayload, current_user: User, db: Session):
@@ -73,6 +100,128 @@ class WorkoutService:
                 detail="Internal server error",
             )
 
+    @staticmethod
+    def create_workout_template(
+        data: CreateWorkoutTemplatePayload, current_user: User, db: Session
+    ):
+        """
+        Create a workout together with its exercises and sets in one transaction.
+
+        Catalog exercises are validated with a single query, and exercises and
+        sets are written with bulk inserts instead of one commit and refresh
+        per row.
+
+        Args:
+            data (CreateWorkoutTemplatePayload): The nested workout, exercises and sets payload.
+            current_user (User): The user creating the workout.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            Workout: The newly created workout with exercises and sets loaded.
+
+        Raises:
+            HTTPException:
+                - 400: If invalid workout data is provided.
+                - 404: If a referenced catalog exercise does not exist.
+                - 500: For database or internal errors.
+
+        Logging:
+            - Debug: Before inserting the workout tree.
+            - Info: When the workout is successfully created.
+            - Error: On integrity or database-related issues.
+        """
+        try:
+            exercise_ids = {e.exercise_id for e in data.workout_exercises}
+            if exercise_ids:
+                found_ids = {
+                    row.id
+                    for row in db.query(Exercise.id).filter(
+                        Exercise.id.in_(exercise_ids)
+                    )
+                }
+                missing_ids = exercise_ids - found_ids
+                if missing_ids:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Catalog exercises not found: {sorted(missing_ids)}",
+                    )
+
+            logger.debug(
+                f"Creating workout template for user {current_user.id} with "
+                f"{len(data.workout_exercises)} exercises"
+            )
+
+            new_workout = Workout(
+                name=data.name, notes=data.notes or "", user_id=current_user.id
+            )
+            db.add(new_workout)
+            db.flush()
+
+            if data.workout_exercises:
+                exercise_rows = [
+                    {
+                        "exercise_id": exercise.exercise_id,
+                        "order_index": exercise.order_index,
+                        "notes": exercise.notes or "",
+                        "workout_id": new_workout.id,
+                    }
+                    for exercise in data.workout_exercises
+                ]
+                new_exercise_ids = db.scalars(
+                    insert(WorkoutExercise).returning(
+                        WorkoutExercise.id, sort_by_parameter_order=True
+                    ),
+                    exercise_rows,
+                ).all()
+
+                set_rows = [
+                    {**workout_set.model_dump(), "workout_exercise_id": exercise_id}
+                    for exercise, exercise_id in zip(
+                        data.workout_exercises, new_exercise_ids
+                    )
+                    for workout_set in exercise.sets
+                ]
+                if set_rows:
+                    db.execute(insert(WorkoutSet), set_rows)
+
+                ExerciseUsageService.record_usage(
+                    current_user.id,
+                    [exercise.exercise_id for exercise in data.workout_exercises],
+                    db,
+                )
+
+            db.commit()
+
+            logger.info(f"Successfully created workout template ID: {new_workout.id}")
+            return WorkoutService.get_workout_by_id(new_workout.id, db)
+
+        except HTTPException:
+            db.rollback()
+            raise
+        except IntegrityError as e:
+            db.rollback()
+            logger.error(
+                f"Integrity error creating workout template for user {current_user.id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid data for workout",
+            )
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error creating workout template: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while creating workout",
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Unexpected error creating workout template: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error",
+            )
+
     @staticmethod
     def get_all_workouts_for_user(current_user: User, db: Session):
         """
@@ -191,6 +340,287 @@ class WorkoutService:
                 detail="Internal server error",
             )
 
+    @staticmethod
+    def get_workout_version(workout_id: int, db: Session) -> int:
+        """
+        Retrieve only the version of a workout, without loading its children.
+
+        Args:
+            workout_id (int): The ID of the workout.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            int: The current version of the workout.
+
+        Raises:
+            HTTPException:
+                - 400: If the provided workout ID is invalid.
+                - 404: If no workout is found with the given ID.
+                - 500: For database or unexpected server errors.
+        """
+        try:
+            if workout_id <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid workout ID",
+                )
+
+            version = db.scalar(select(Workout.version).where(Workout.id == workout_id))
+            if version is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Workout with id {workout_id} not found",
+                )
+            return version
+
+        except HTTPException:
+            raise
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error fetching version of workout {workout_id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while fetching workout",
+            )
+
+    @staticmethod
+    def get_workout_versions_for_user(current_user: User, db: Session):
+        """
+        Retrieve ``(id, version)`` pairs of the user's workouts, ordered by ID.
+
+        Args:
+            current_user (User): The user whose workouts should be listed.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            list[tuple[int, int]]: The workout IDs and versions.
+
+        Raises:
+            HTTPException: If a database error occurs.
+        """
+        try:
+            rows = db.execute(
+                select(Workout.id, Workout.version)
+                .where(Workout.user_id == current_user.id)
+                .order_by(Workout.id)
+            ).all()
+            return [(row.id, row.version) for row in rows]
+
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error fetching workout versions for user {current_user.id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while fetching workouts",
+            )
+
+    @staticmethod
+    def bump_version(workout_id: int, db: Session):
+        """
+        Increment a workout's version and recompile its snapshot.
+
+        Must be called, after the change has been applied to the session, by
+        every operation that modifies the workout or any of its exercises and
+        sets. Pending changes are flushed first so the snapshot includes them.
+
+        The version is bumped before the snapshot is compiled: the UPDATE takes
+        the workout's row lock, so a concurrent edit of the same workout waits
+        until this transaction ends and then compiles a snapshot that includes
+        its changes, stamped with its own, later version.
+        """
+        db.flush()
+        version = db.scalar(
+            update(Workout.__table__)
+            .where(Workout.id == workout_id)
+            .values(version=Workout.version + 1)
+            .returning(Workout.version)
+        )
+        if version is None:
+            return
+        snapshot = WorkoutService.compile_snapshot(workout_id, db)
+        db.execute(
+            update(Workout.__table__)
+            .where(Workout.id == workout_id)
+            .values(
+                snapshot=snapshot,
+                snapshot_version=version,
+                updated_at=Workout.updated_at,
+            )
+        )
+
+    @staticmethod
+    def bump_version_for_exercise(workout_exercise_id: int, db: Session):
+        """Increment the version of the workout owning a workout exercise."""
+        workout_id = db.scalar(
+            select(WorkoutExercise.workout_id).where(
+                WorkoutExercise.id == workout_exercise_id
+            )
+        )
+        if workout_id is not None:
+            WorkoutService.bump_version(workout_id, db)
+
+    @staticmethod
+    def bump_versions_for_catalog(exercise_ids, db: Session):
+        """
+        Increment the version of every workout using one of `exercise_ids`.
+
+        Workout responses embed their catalog exercises, so an edit to one
+        must change the ETag of every workout that shows it. `exercise_ids`
+        may be a list or a select of IDs. Snapshots hold no catalog fields
+        and are recompiled lazily by `get_workout_snapshot`.
+        """
+        db.execute(
+            update(Workout)
+            .where(
+                Workout.id.in_(
+                    select(WorkoutExercise.workout_id).where(
+                        WorkoutExercise.exercise_id.in_(exercise_ids)
+                    )
+                )
+            )
+            .values(version=Workout.version + 1, updated_at=Workout.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def compile_snapshot(workout_id: int, db: Session) -> list[dict]:
+        """
+        Compile a denormalized snapshot of a workout's exercises and planned sets.
+
+        Args:
+            workout_id (int): The ID of the workout to compile.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            list[dict]: The exercises in order, each with its planned sets.
+        """
+        rows = db.execute(
+            select(
+                WorkoutExercise.id.label("workout_exercise_id"),
+                WorkoutExercise.exercise_id,
+                WorkoutExercise.order_index,
+                WorkoutExercise.notes,
+                WorkoutSet.id.label("workout_set_id"),
+                WorkoutSet.reps,
+                WorkoutSet.weight,
+                WorkoutSet.order_index.label("set_order_index"),
+            )
+            .outerjoin(WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id)
+            .where(WorkoutExercise.workout_id == workout_id)
+            .order_by(
+                WorkoutExercise.order_index,
+                WorkoutExercise.id,
+                WorkoutSet.order_index,
+                WorkoutSet.id,
+            )
+        ).all()
+
+        exercises = {}
+        for row in rows:
+            exercise = exercises.setdefault(
+                row.workout_exercise_id,
+                {
+                    "workout_exercise_id": row.workout_exercise_id,
+                    "exercise_id": row.exercise_id,
+                    "order_index": row.order_index,
+                    "notes": row.notes,
+                    "sets": [],
+                },
+            )
+            if row.workout_set_id is not None:
+                exercise["sets"].append(
+                    {
+                        "workout_set_id": row.workout_set_id,
+                        "reps": row.reps,
+                        "weight": row.weight,
+                        "order_index": row.set_order_index,
+                    }
+                )
+        return list(exercises.values())
+
+    @staticmethod
+    def get_workout_snapshot(workout_id: int, db: Session):
+        """
+        Retrieve the owner and compiled snapshot of a workout.
+
+        The version is read first and compared with the in-process cache, so a
+        cache hit costs one single-row query. On a miss the stored snapshot is
+        used, and it is recompiled and written back if it is older than the
+        workout's version.
+
+        Args:
+            workout_id (int): The ID of the workout.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            tuple[int, list[dict]]: The owner's user ID and the snapshot.
+
+        Raises:
+            HTTPException:
+                - 400: If the provided workout ID is invalid.
+                - 404: If no workout is found with the given ID.
+                - 500: For database or unexpected server errors.
+        """
+        try:
+            if workout_id <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid workout ID",
+                )
+
+            workout = db.execute(
+                select(Workout.user_id, Workout.version).where(Workout.id == workout_id)
+            ).first()
+            if not workout:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Workout with id {workout_id} not found",
+                )
+
+            cached = workout_snapshot_cache.get(workout_id)
+            if cached and cached[0] == workout.version:
+                return workout.user_id, cached[1]
+
+            stored = db.execute(
+                select(Workout.snapshot, Workout.snapshot_version).where(
+                    Workout.id == workout_id
+                )
+            ).first()
+            snapshot = stored.snapshot
+            if snapshot is None or stored.snapshot_version != workout.version:
+                logger.debug(
+                    f"Recompiling snapshot for workout {workout_id} at version {workout.version}"
+                )
+                snapshot = WorkoutService.compile_snapshot(workout_id, db)
+                db.execute(
+                    update(Workout.__table__)
+                    .where(
+                        Workout.id == workout_id,
+                        Workout.version == workout.version,
+                    )
+                    .values(
+                        snapshot=snapshot,
+                        snapshot_version=workout.version,
+                        updated_at=Workout.updated_at,
+                    )
+                )
+
+            workout_snapshot_cache.set(workout_id, (workout.version, snapshot))
+            return workout.user_id, snapshot
+
+        except HTTPException:
+            raise
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error fetching snapshot of workout {workout_id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while fetching workout",
+            )
+
     @staticmethod
     def update_workout(
         workout_id: int, data: UpdateWorkoutPayload, current_user: User, db: Session
@@ -241,6 +671,7 @@ class WorkoutService:
 
             for field, value in update_dict.items():
                 setattr(workout, field, value)
+            WorkoutService.bump_version(workout_id, db)
 
             db.commit()
             db.refresh(workout)
@@ -272,6 +703,154 @@ class WorkoutService:
                 detail="Internal server error",
             )
 
+    @staticmethod
+    def reorder_workout(
+        workout_id: int, data: ReorderWorkoutPayload, current_user: User, db: Session
+    ):
+        """
+        Apply a new ordering to a workout's exercises and sets in one go.
+
+        Each table is updated with a single ``UPDATE ... FROM (VALUES ...)``
+        statement that is also restricted to the workout, so the affected row
+        count tells whether every submitted ID belongs to it.
+
+        Args:
+            workout_id (int): The ID of the workout being reordered.
+            data (ReorderWorkoutPayload): The new order indexes for exercises and sets.
+            current_user (User): The user requesting the reorder.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            Workout: The reordered workout with exercises and sets loaded.
+
+        Raises:
+            HTTPException:
+                - 400: If the payload is empty, has duplicate IDs, or references rows outside the workout.
+                - 403: If the user doesn't own the workout.
+                - 404: If the workout does not exist.
+                - 500: For database or internal errors.
+
+        Logging:
+            - Debug: Before applying the new ordering.
+            - Info: After a successful reorder.
+            - Error: On SQL or unexpected issues.
+        """
+        try:
+            if not data.workout_exercises and not data.sets:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No fields provided to update",
+                )
+
+            for items in (data.workout_exercises, data.sets):
+                if len({item.id for item in items}) != len(items):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Duplicate IDs in reorder payload",
+                    )
+
+            owner = db.query(Workout.user_id).filter(Workout.id == workout_id).first()
+            if not owner:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Workout with id {workout_id} not found",
+                )
+            if owner.user_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Only workout creator can update it",
+                )
+
+            logger.debug(
+                f"Reordering workout {workout_id}: {len(data.workout_exercises)} "
+                f"exercises, {len(data.sets)} sets"
+            )
+
+            if data.workout_exercises:
+                new_order = WorkoutService._order_values(data.workout_exercises, db)
+                result = db.execute(
+                    update(WorkoutExercise.__table__)
+                    .where(
+                        WorkoutExercise.id == new_order.c.id,
+                        WorkoutExercise.workout_id == workout_id,
+                    )
+                    .values(order_index=new_order.c.order_index)
+                )
+                if result.rowcount != len(data.workout_exercises):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Some workout exercises do not belong to this workout",
+                    )
+
+            if data.sets:
+                new_order = WorkoutService._order_values(data.sets, db)
+                result = db.execute(
+                    update(WorkoutSet.__table__)
+                    .where(
+                        WorkoutSet.id == new_order.c.id,
+                        WorkoutSet.workout_exercise_id.in_(
+                            select(WorkoutExercise.id).where(
+                                WorkoutExercise.workout_id == workout_id
+                            )
+                        ),
+                    )
+                    .values(order_index=new_order.c.order_index)
+                )
+                if result.rowcount != len(data.sets):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Some workout sets do not belong to this workout",
+                    )
+
+            WorkoutService.bump_version(workout_id, db)
+            db.commit()
+            logger.info(f"Successfully reordered workout ID: {workout_id}")
+            return WorkoutService.get_workout_by_id(workout_id, db)
+
+        except HTTPException:
+            db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error reordering workout {workout_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while reordering workout",
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Unexpected error reordering workout {workout_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error",
+            )
+
+    @staticmethod
+    def _order_values(items: list[OrderIndexItem], db: Session):
+        """
+        Build the ``(id, order_index)`` rows joined by the reorder UPDATE.
+
+        PostgreSQL gets a ``(VALUES ...) AS new_order (id, order_index)`` clause.
+        SQLite cannot name the columns of a VALUES list, and pysqlite neither
+        reports row counts nor opens a transaction for statements that start
+        with a CTE, so it gets an equivalent ``UNION ALL`` derived table.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            return values(
+                column("id", Integer),
+                column("order_index", Integer),
+                name="new_order",
+            ).data([(item.id, item.order_index) for item in items])
+
+        rows = [
+            select(
+                literal(item.id, Integer).label("id"),
+                literal(item.order_index, Integer).label("order_index"),
+            )
+            for item in items
+        ]
+        return union_all(*rows).subquery("new_order")
+
     @staticmethod
     def delete_workout(workout_id: int, current_user: User, db: Session):
         """
@@ -325,3 +904,183 @@ class WorkoutService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error",
             )
+
+    @staticmethod
+    def clone_workout(
+        workout_id: int, data: CloneWorkoutPayload, current_user: User, db: Session
+    ):
+        """
+        Clone a workout template together with all its exercises and sets.
+
+        The exercises are copied with one batched ``INSERT ... RETURNING``, which
+        maps each source exercise to its copy, and the sets with one set-based
+        ``INSERT ... SELECT`` using that mapping. Cloning issues the same number
+        of statements no matter how large the template is, and everything
+        happens in a single transaction.
+
+        Args:
+            workout_id (int): The ID of the workout to clone.
+            data (CloneWorkoutPayload): Optional name override and target user.
+            current_user (User): The user requesting the clone.
+            db (Session): The active SQLAlchemy session.
+
+        Returns:
+            Workout: The newly created workout with exercises and sets loaded.
+
+        Raises:
+            HTTPException:
+                - 400: If the provided workout ID is invalid.
+                - 403: If the user may not clone the workout or assign it to the target user.
+                - 404: If the workout or target user does not exist.
+                - 500: For database or internal errors.
+
+        Logging:
+            - Debug: Before copying the workout tree.
+            - Info: After a successful clone.
+            - Error: On integrity, SQL, or unexpected issues.
+        """
+        try:
+            if workout_id <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid workout ID",
+                )
+
+            source = db.query(Workout).filter(Workout.id == workout_id).first()
+            if not source:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Workout with id {workout_id} not found",
+                )
+
+            is_coach = current_user.role in (UserRole.COACH, UserRole.ADMIN)
+            if source.user_id != current_user.id and not is_coach:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Only workout creator or a coach can clone it",
+                )
+
+            target_user_id = data.user_id or current_user.id
+            if target_user_id != current_user.id:
+                if not is_coach:
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail="Only coaches can clone workouts for other users",
+                    )
+                target_exists = (
+                    db.query(User.id).filter(User.id == target_user_id).first()
+                )
+                if not target_exists:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"User with id {target_user_id} not found",
+                    )
+
+            logger.debug(
+                f"Cloning workout {workout_id} for user {target_user_id} "
+                f"(requested by {current_user.id})"
+            )
+
+            new_workout = Workout(
+                name=data.name or source.name,
+                notes=source.notes,
+                user_id=target_user_id,
+            )
+            db.add(new_workout)
+            db.flush()
+
+            source_exercises = db.execute(
+                select(
+                    WorkoutExercise.id,
+                    WorkoutExercise.exercise_id,
+                    WorkoutExercise.order_index,
+                    WorkoutExercise.notes,
+                )
+                .where(WorkoutExercise.workout_id == workout_id)
+                .order_by(WorkoutExercise.id)
+            ).all()
+
+            if source_exercises:
+                # RETURNING in parameter order pairs each copy with its source
+                # exercise, whatever ids the database hands out
+                cloned_ids = (
+                    db.execute(
+                        insert(WorkoutExercise.__table__).returning(
+                            WorkoutExercise.__table__.c.id,
+                            sort_by_parameter_order=True,
+                        ),
+                        [
+                            {
+                                "exercise_id": row.exercise_id,
+                                "order_index": row.order_index,
+                                "notes": row.notes,
+                                "workout_id": new_workout.id,
+                            }
+                            for row in source_exercises
+                        ],
+                    )
+                    .scalars()
+                    .all()
+                )
+                clone_of = {
+                    row.id: cloned_id
+                    for row, cloned_id in zip(source_exercises, cloned_ids)
+                }
+                db.execute(
+                    insert(WorkoutSet.__table__).from_select(
+                        [
+                            "reps",
+                            "weight",
+                            "set_type",
+                            "order_index",
+                            "notes",
+                            "workout_exercise_id",
+                        ],
+                        select(
+                            WorkoutSet.reps,
+                            WorkoutSet.weight,
+                            WorkoutSet.set_type,
+                            WorkoutSet.order_index,
+                            WorkoutSet.notes,
+                            case(clone_of, value=WorkoutSet.workout_exercise_id),
+                        )
+                        .where(WorkoutSet.workout_exercise_id.in_(clone_of))
+                        .order_by(WorkoutSet.id),
+                    )
+                )
+
+            ExerciseUsageService.record_usage(
+                target_user_id, [row.exercise_id for row in source_exercises], db
+            )
+
+            db.commit()
+
+            logger.info(
+                f"Successfully cloned workout {workout_id} into workout ID: {new_workout.id}"
+            )
+            return WorkoutService.get_workout_by_id(new_workout.id, db)
+
+        except HTTPException:
+            db.rollback()
+            raise
+        except IntegrityError as e:
+            db.rollback()
+            logger.error(f"Integrity error cloning workout {workout_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid data for workout clone",
+            )
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error cloning workout {workout_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while cloning workout",
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Unexpected error cloning workout {workout_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error",
+            )
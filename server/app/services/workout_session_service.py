@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from app.models import User
@@ -10,13 +12,19 @@ from app.models.session_set import SessionSet, SessionSetStatus
 from app.schemas.workout_session import (
     CreateWorkoutSessionPayload,
     CompleteSessionSetPayload,
+    SessionSetSchema,
+    WorkoutSessionSchema,
 )
+from app.utils.async_service import run_service
 from app.utils.logger import logger
+from app.utils.tracing import traced_service
 from app.services.workout_service import WorkoutService
 from app.models.workout_exercise import WorkoutExercise
+from app.services.exercise_usage_service import ExerciseUsageService
 from app.services.personal_record_service import PersonalRecordService
 
 
+@traced_service
 class WorkoutSessionService:
     @staticmethod
     def start_session(
@@ -24,14 +32,17 @@ class WorkoutSessionService:
     ):
         """
         Start a new workout session based on a workout template.
-        Creates session records with planned values from the template.
+        Creates session records with planned values from the template's
+        compiled snapshot, using bulk inserts.
         """
         try:
-            # Verify workout exists and get it with all exercises and sets
-            workout = WorkoutService.get_workout_by_id(data.workout_id, db)
+            # Read the compiled template snapshot instead of the full ORM tree
+            owner_id, snapshot = WorkoutService.get_workout_snapshot(
+                data.workout_id, db
+            )
 
             # Verify user owns the workout or it's a shared template
-            if workout.user_id != current_user.id:
+            if owner_id != current_user.id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Cannot start session for workout you don't own",
@@ -47,32 +58,44 @@ class WorkoutSessionService:
                 user_id=current_user.id,
                 status=SessionStatus.IN_PROGRESS,
                 notes=data.notes or "",
+                total_volume=0,
             )
             db.add(new_session)
             db.flush()  # Get the session ID
 
-            # Copy workout exercises to session exercises
-            for workout_exercise in workout.workout_exercises:
-                session_exercise = SessionExercise(
-                    session_id=new_session.id,
-                    workout_exercise_id=workout_exercise.id,
-                    order_index=workout_exercise.order_index,
-                    notes=workout_exercise.notes,
-                )
-                db.add(session_exercise)
-                db.flush()
-
-                # Copy sets from workout template
-                for workout_set in workout_exercise.sets:
-                    session_set = SessionSet(
-                        session_exercise_id=session_exercise.id,
-                        workout_set_id=workout_set.id,
-                        planned_reps=workout_set.reps,
-                        planned_weight=workout_set.weight,
-                        order_index=workout_set.order_index,
-                        status=SessionSetStatus.PENDING,
+            # Bulk-copy the snapshot's exercises, then their planned sets
+            if snapshot:
+                session_exercise_ids = db.scalars(
+                    insert(SessionExercise).returning(
+                        SessionExercise.id, sort_by_parameter_order=True
+                    ),
+                    [
+                        {
+                            "session_id": new_session.id,
+                            "workout_exercise_id": exercise["workout_exercise_id"],
+                            "order_index": exercise["order_index"],
+                            "notes": exercise["notes"],
+                        }
+                        for exercise in snapshot
+                    ],
+                ).all()
+
+                session_sets = [
+                    {
+                        "session_exercise_id": session_exercise_id,
+                        "workout_set_id": planned_set["workout_set_id"],
+                        "planned_reps": planned_set["reps"],
+                        "planned_weight": planned_set["weight"],
+                        "order_index": planned_set["order_index"],
+                        "status": SessionSetStatus.PENDING,
+                    }
+                    for exercise, session_exercise_id in zip(
+                        snapshot, session_exercise_ids
                     )
-                    db.add(session_set)
+                    for planned_set in exercise["sets"]
+                ]
+                if session_sets:
+                    db.execute(insert(SessionSet), session_sets)
 
             db.commit()
             db.refresh(new_session)
@@ -282,9 +305,11 @@ class WorkoutSessionService:
 
             # Calculate duration
             if session.started_at:
-                duration = (
-                    session.completed_at - session.started_at
-                ).total_seconds() / 60
+                started_at = session.started_at
+                if started_at.tzinfo is None:
+                    # SQLite returns timestamps without their timezone
+                    started_at = started_at.replace(tzinfo=timezone.utc)
+                duration = (session.completed_at - started_at).total_seconds() / 60
                 session.duration_minutes = int(duration)
 
             total_volume = 0
@@ -297,6 +322,20 @@ class WorkoutSessionService:
             session.total_volume = total_volume
             logger.info(f"Session total volume: {total_volume}")
 
+            ExerciseUsageService.record_usage(
+                session.user_id,
+                db.scalars(
+                    select(WorkoutExercise.exercise_id)
+                    .join(
+                        SessionExercise,
+                        SessionExercise.workout_exercise_id == WorkoutExercise.id,
+                    )
+                    .where(SessionExercise.session_id == session.id)
+                ).all(),
+                db,
+                used_at=session.completed_at,
+            )
+
             db.commit()
             db.refresh(session)
 
@@ -365,3 +404,83 @@ class WorkoutSessionService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error",
             )
+
+    # Async variants for the event loop; see `run_service`
+
+    @staticmethod
+    async def start_session_async(
+        data: CreateWorkoutSessionPayload, current_user: User, db: AsyncSession
+    ) -> WorkoutSessionSchema:
+        return await run_service(
+            db,
+            WorkoutSessionSchema,
+            WorkoutSessionService.start_session,
+            data,
+            current_user,
+        )
+
+    @staticmethod
+    async def get_session_by_id_async(
+        session_id: int, current_user: User, db: AsyncSession
+    ) -> WorkoutSessionSchema:
+        return await run_service(
+            db,
+            WorkoutSessionSchema,
+            WorkoutSessionService.get_session_by_id,
+            session_id,
+            current_user,
+        )
+
+    @staticmethod
+    async def get_user_sessions_async(
+        current_user: User, db: AsyncSession, status: SessionStatus = None
+    ) -> list[WorkoutSessionSchema]:
+        return await run_service(
+            db,
+            list[WorkoutSessionSchema],
+            WorkoutSessionService.get_user_sessions,
+            current_user,
+            status=status,
+        )
+
+    @staticmethod
+    async def complete_set_async(
+        session_id: int,
+        set_id: int,
+        data: CompleteSessionSetPayload,
+        current_user: User,
+        db: AsyncSession,
+    ) -> SessionSetSchema:
+        return await run_service(
+            db,
+            SessionSetSchema,
+            WorkoutSessionService.complete_set,
+            session_id,
+            set_id,
+            data,
+            current_user,
+        )
+
+    @staticmethod
+    async def complete_session_async(
+        session_id: int, current_user: User, db: AsyncSession
+    ) -> WorkoutSessionSchema:
+        return await run_service(
+            db,
+            WorkoutSessionSchema,
+            WorkoutSessionService.complete_session,
+            session_id,
+            current_user,
+        )
+
+    @staticmethod
+    async def cancel_session_async(
+        session_id: int, current_user: User, db: AsyncSession
+    ) -> WorkoutSessionSchema:
+        return await run_service(
+            db,
+            WorkoutSessionSchema,
+            WorkoutSessionService.cancel_session,
+            session_id,
+            current_user,
+        )
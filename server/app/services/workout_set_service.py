@@ -5,9 +5,12 @@ from sqlalchemy.orm import Session
 from app.schemas.workout_set import CreateWorkoutSetPayload, UpdateWorkoutSetPayload
 from app.models.workout_set import WorkoutSet
 from app.utils.logger import logger
+from app.utils.tracing import traced_service
 from app.services.workout_exercise_service import WorkoutExerciseService
+from app.services.workout_service import WorkoutService
 
 
+@traced_service
 class WorkoutSetService:
     @staticmethod
     def create_workout_set(
@@ -41,6 +44,7 @@ class WorkoutSetService:
             data_dict["workout_exercise_id"] = exercise_id
             new_set = WorkoutSet(**data_dict)
             db.add(new_set)
+            WorkoutService.bump_version_for_exercise(exercise_id, db)
             db.commit()
             db.refresh(new_set)
 
@@ -186,6 +190,7 @@ class WorkoutSetService:
         try:
             set = WorkoutSetService.get_workout_set_by_id(set_id, db)
             db.delete(set)
+            WorkoutService.bump_version_for_exercise(set.workout_exercise_id, db)
             db.commit()
             logger.info(f"Deleted workout set ID: {set_id}")
             return set
@@ -249,6 +254,7 @@ class WorkoutSetService:
 
             for field, value in update_dict.items():
                 setattr(set, field, value)
+            WorkoutService.bump_version_for_exercise(set.workout_exercise_id, db)
 
             db.commit()
             db.refresh(set)
@@ -0,0 +1,41 @@
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.formatter import type_adapter
+
+
+async def run_service(
+    db: AsyncSession,
+    response_type,
+    method: Callable[..., Any],
+    *args,
+    **kwargs,
+):
+    """
+    Run a synchronous service method on an `AsyncSession` without a thread.
+
+    The method runs inside SQLAlchemy's greenlet bridge, so every query it
+    issues, including lazy loads, awaits the asyncio driver and yields the
+    event loop instead of blocking a threadpool worker. The result is
+    converted to `response_type` before leaving the bridge, because ORM
+    attributes cannot be loaded once back on the event loop.
+
+    Args:
+        db (AsyncSession): The request's async session.
+        response_type: The schema type to validate the result into,
+            e.g. `WorkoutSessionSchema` or `list[WorkoutSessionSchema]`.
+        method (Callable): A service method taking its session as `db`.
+        *args: Positional arguments for `method`.
+        **kwargs: Keyword arguments for `method`.
+
+    Returns:
+        The method's result validated as `response_type`.
+    """
+
+    def call(session):
+        result = method(*args, db=session, **kwargs)
+        return type_adapter(response_type).validate_python(result, from_attributes=True)
+
+    return await db.run_sync(call)
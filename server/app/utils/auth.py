@@ -1,54 +1,191 @@
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import User
+from app.models.user import UserRole
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.config import get_settings
+from app.utils.cache import LRUCache
+from app.utils.query_stats import timed
+from app.utils.revocation import RevocationList
+from app.utils.tracing import annotate
 
 settings = get_settings()
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_DAYS = 3
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
+# Snapshots of authenticated users keyed by id. A change to a user drops its
+# entry in the worker that made it; other workers refetch once the TTL lapses.
+user_cache = LRUCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl_seconds,
+    name="users",
+)
+
+# Verified token payloads keyed by the token's SHA-256 digest, kept until `exp`
+token_cache = LRUCache(maxsize=settings.token_cache_size, name="tokens")
+
+# Revoked token ids (jti claims), synced from the revoked_token table
+revocations = RevocationList(
+    "revoked-tokens", sync_interval=settings.revocation_sync_seconds
+)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Immutable snapshot of the user behind a request's access token."""
+
+    id: int
+    role: UserRole
+    email: str
+    name: str
+
+
+def invalidate_user(user_id: int):
+    """
+    Drop this worker's snapshot of a user after it changes. Other workers
+    keep theirs for at most `user_cache_ttl_seconds`.
+    """
+    user_cache.pop(user_id)
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
 
     expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": "access"})
 
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+def create_refresh_token(user_id: int, expires_delta: timedelta | None = None):
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    to_encode = {
+        "sub": str(user_id),
+        "exp": expire,
+        "jti": uuid.uuid4().hex,
+        "type": "refresh",
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a token and return its payload, reusing earlier verifications.
+
+    Raises:
+        JWTError: If the token is malformed, has a bad signature or has expired.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    # Tokens without an expiry are verified every time rather than cached forever
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(digest, payload, ttl=exp - time.time())
+    return payload
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate token",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _access_token_claims(token: str) -> tuple[int, str | None]:
+    """Return the user id and jti of a valid access token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_data = payload.get("user")
         if not user_data or "id" not in user_data:
-            raise credentials_exception
-        user_id = user_data["id"]
-    except JWTError:
-        raise credentials_exception
+            raise _credentials_exception()
+        if payload.get("type", "access") != "access":
+            raise _credentials_exception()
+        return int(user_data["id"]), payload.get("jti")
+    except (JWTError, TypeError, ValueError):
+        raise _credentials_exception()
+
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+def _user_query(user_id: int):
+    return select(User.id, User.role, User.email, User.name).where(
+        User.id == user_id, User.deleted_at.is_(None)
+    )
 
-    if user is None:
-        raise credentials_exception
 
+def _remember_user(user_id: int, row) -> AuthenticatedUser:
+    if row is None:
+        raise _credentials_exception()
+    user = AuthenticatedUser(id=row.id, role=row.role, email=row.email, name=row.name)
+    user_cache.set(user_id, user)
     return user
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> AuthenticatedUser:
+    """
+    Resolve the user behind a bearer token.
+
+    Only the user id and jti are taken from the verified token; revoked
+    tokens are rejected from the in-memory `revocations` list. The email
+    and role claims are not trusted: they are fixed at login, so a
+    demotion or deletion would only apply once the token expired, and the
+    token carries no name. The role and profile are instead read from the
+    users table and served from `user_cache`, so the table is only queried
+    on a cache miss, after the TTL lapses, or after this worker changed
+    the user (see `invalidate_user`). A deleted user is rejected the same
+    way.
+    """
+    with timed("auth"):
+        user_id, jti = _access_token_claims(token)
+        annotate(user_id=user_id)
+        if jti and revocations.is_revoked(jti, db):
+            raise _credentials_exception()
+
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        row = db.execute(_user_query(user_id)).first()
+        return _remember_user(user_id, row)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
+    """Event loop variant of `get_current_user` for `async def` endpoints."""
+    with timed("auth"):
+        user_id, jti = _access_token_claims(token)
+        annotate(user_id=user_id)
+        if jti and await revocations.is_revoked_async(jti, db):
+            raise _credentials_exception()
+
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        row = (await db.execute(_user_query(user_id))).first()
+        return _remember_user(user_id, row)
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import deque
+
+from fastapi import Depends, HTTPException, status
+
+from app.config import get_settings
+from app.utils.metrics import (
+    BULKHEAD_ACTIVE,
+    BULKHEAD_QUEUED,
+    BULKHEAD_REJECTED,
+    BULKHEAD_WAIT_SECONDS,
+)
+
+settings = get_settings()
+
+
+class Bulkhead:
+    """
+    Concurrency limit shared by a group of endpoints.
+
+    At most `limit` requests run at once. Further requests wait in FIFO order,
+    up to `max_queue` of them for at most `queue_timeout` seconds each; the
+    rest are shed immediately with 503 and a Retry-After header. Giving each
+    router its own bulkhead means a burst on one group of endpoints can only
+    exhaust its own share of threads and database connections.
+
+    All bookkeeping happens on the event loop, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def __call__(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self):
+        if self._active < self.limit and not self._waiters:
+            self._admit()
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._shed()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        BULKHEAD_QUEUED.labels(self.name).inc()
+        started = time.perf_counter()
+        try:
+            # Shielded so a timeout cannot race with a slot being handed over
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        finally:
+            BULKHEAD_QUEUED.labels(self.name).dec()
+            BULKHEAD_WAIT_SECONDS.labels(self.name).observe(
+                time.perf_counter() - started
+            )
+        if not waiter.done():
+            self._abandon(waiter)
+            self._shed()
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter so it cannot be overtaken
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+        BULKHEAD_ACTIVE.labels(self.name).set(self._active)
+
+    def _admit(self):
+        self._active += 1
+        BULKHEAD_ACTIVE.labels(self.name).set(self._active)
+
+    def _abandon(self, waiter: asyncio.Future):
+        if waiter.done() and not waiter.cancelled():
+            # The slot arrived just as the wait ended; pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _shed(self):
+        BULKHEAD_REJECTED.labels(self.name).inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+
+
+def bulkhead(name: str):
+    """
+    Dependency limiting concurrency with the bulkhead called `name`.
+
+    Limits come from `settings.bulkheads[name]` as `(limit, max_queue)`. The
+    slot is released as soon as the endpoint returns, before the response is
+    sent.
+    """
+    if name not in _bulkheads:
+        limit, max_queue = settings.bulkheads[name]
+        _bulkheads[name] = Bulkhead(
+            name,
+            limit,
+            max_queue,
+            settings.bulkhead_queue_timeout_seconds,
+            settings.bulkhead_retry_after_seconds,
+        )
+    return Depends(_bulkheads[name], scope="function")
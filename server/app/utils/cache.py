@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from app.utils.metrics import CACHE_REQUESTS
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process LRU cache.
+
+    Each worker process holds its own instance, so cached values must either
+    be cheap to recompute or carry a version that callers check before use.
+    With a `ttl`, entries also expire that many seconds after being set; `set`
+    can override it per entry. Named caches export their hits and misses as
+    `reptrack_cache_requests_total`.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float | None = None, name: str | None = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = CACHE_REQUESTS.labels(name, "hit") if name else None
+        self._miss_counter = CACHE_REQUESTS.labels(name, "miss") if name else None
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                if self._miss_counter:
+                    self._miss_counter.inc()
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            if self._hit_counter:
+                self._hit_counter.inc()
+            return entry[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,171 @@
+import time
+from threading import Lock
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+)
+
+
+class _PoolOccupancy:
+    """Occupancy gauges of the pools with one label, kept from pool events."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.size = 0
+        self._open = 0
+        self._lock = Lock()
+        self.listeners = {
+            "connect": self._opened,
+            "close": self._closed,
+            "detach": self._closed,
+            "checkout": self._checked_out,
+            "checkin": self._checked_in,
+        }
+
+    def set_size(self, size: int):
+        with self._lock:
+            self.size = size
+            self._report()
+
+    def _opened(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._open += 1
+            self._report()
+
+    def _closed(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._open -= 1
+            self._report()
+
+    def _checked_out(self, dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.labels(self.label).inc()
+
+    def _checked_in(self, dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(self.label).dec()
+
+    def _report(self):
+        DB_POOL_SIZE.labels(self.label).set(self.size)
+        DB_POOL_OVERFLOW.labels(self.label).set(self._open - self.size)
+
+
+_occupancy: dict[str, _PoolOccupancy] = {}
+
+
+class _InstrumentedPool:
+    """
+    Mixin exporting a queue pool's checkout waits, timeouts and occupancy.
+
+    Waits are timed around `connect`; occupancy follows the pool's connect,
+    close, detach, checkout and checkin events. Metrics are labelled with
+    the engine's `pool_logging_name`, so the sync and asyncio engines of
+    one worker can be told apart.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        label = self.logging_name or "default"
+        occupancy = _occupancy.setdefault(label, _PoolOccupancy(label))
+        occupancy.set_size(self.size())
+        # A pool recreated by `dispose` already carries its predecessor's listeners
+        for identifier, listener in occupancy.listeners.items():
+            if listener not in getattr(self.dispatch, identifier):
+                event.listen(self, identifier, listener)
+
+    def connect(self):
+        label = self.logging_name or "default"
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(label).observe(
+                time.perf_counter() - started
+            )
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncPool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+# Routers served from the threadpool; together their bulkheads admit no more
+# requests, each holding one sync session, than the sync pool has connections
+SYNC_BULKHEADS = ("users", "exercises", "workouts")
+# Routers served from the event loop; their bulkheads bound how many requests,
+# each holding one async session, can use the async pool at once
+ASYNC_BULKHEADS = ("sessions", "reports")
+
+
+def sync_pool_options(settings) -> dict:
+    """
+    Engine keyword arguments for the sync engine's pool.
+
+    Each request thread holds at most one connection, so unless configured
+    the pool holds one per thread of the threadpool, and overflows by
+    whatever a smaller configured size leaves short of it.
+    """
+    size = settings.db_pool_size
+    if size is None:
+        size = settings.threadpool_size
+    overflow = settings.db_max_overflow
+    if overflow is None:
+        overflow = max(0, settings.threadpool_size - size)
+    return _pool_options(settings, InstrumentedQueuePool, size, overflow)
+
+
+def async_pool_options(settings) -> dict:
+    """
+    Engine keyword arguments for the asyncio engine's pool.
+
+    Unless configured, the pool holds one connection per request the async
+    routers' bulkheads admit, and overflows by one per password hashing
+    worker for logins, which are served from the event loop too.
+    """
+    size = settings.async_db_pool_size
+    if size is None:
+        size = sum(settings.bulkheads[name][0] for name in ASYNC_BULKHEADS)
+    overflow = settings.async_db_max_overflow
+    if overflow is None:
+        overflow = settings.password_hash_workers
+    return _pool_options(settings, InstrumentedAsyncPool, size, overflow)
+
+
+def sync_request_capacity(settings) -> int:
+    """
+    How many threadpool requests a worker can serve without one waiting on
+    another's thread or connection: the smaller of the threadpool and the
+    sync pool. The sync routers' bulkheads should admit no more than this.
+    """
+    options = sync_pool_options(settings)
+    return min(settings.threadpool_size, options["pool_size"] + options["max_overflow"])
+
+
+def max_connections(settings) -> int:
+    """The most database connections one worker can open across both engines."""
+    return sum(
+        options["pool_size"] + options["max_overflow"]
+        for options in (sync_pool_options(settings), async_pool_options(settings))
+    )
+
+
+def _pool_options(settings, poolclass, pool_size: int, max_overflow: int) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
@@ -1,5 +1,58 @@
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.utils.negotiation import (
+    MSGPACK_MEDIA_TYPE,
+    encode_msgpack,
+    response_media_type,
+)
+from app.utils.query_stats import timed
+
+
 def format_response(data, message: str | None = None):
     if message:
         return {"success": True, "message": message, "data": data}
     else:
         return {"success": True, "data": data}
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type) -> TypeAdapter:
+    """Build each schema's validator and serializer once per process."""
+    return TypeAdapter(response_type)
+
+
+def model_response(
+    response_model,
+    content,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Encode `content` as `response_model` in a single pass.
+
+    ORM objects are read once through `from_attributes` and the resulting
+    model is written straight to JSON bytes by pydantic-core. Returning a
+    `Response` makes FastAPI skip its own validation and encoding of the
+    endpoint's `response_model`, which is still declared for the OpenAPI schema.
+
+    On routes negotiated as MessagePack (see `NegotiatedRoute`) the same model
+    is packed as MessagePack instead.
+    """
+    adapter = type_adapter(response_model)
+    with timed("serialize"):
+        model = adapter.validate_python(content, from_attributes=True)
+        if response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            # JSON-compatible values keep both encodings of a schema identical
+            body = encode_msgpack(adapter.dump_python(model, mode="json"))
+            media_type = MSGPACK_MEDIA_TYPE
+        else:
+            body, media_type = adapter.dump_json(model), "application/json"
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
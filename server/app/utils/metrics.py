@@ -0,0 +1,139 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set before startup, every uvicorn worker writes
+# its samples to mmap-backed files in that directory and /metrics aggregates
+# them. Gauges say how: "livesum" adds up the values of the workers still alive.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+HTTP_REQUESTS = Counter(
+    "reptrack_http_requests_total",
+    "HTTP requests served, by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "reptrack_http_request_seconds",
+    "Time to serve an HTTP request, by route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "reptrack_http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+
+CACHE_REQUESTS = Counter(
+    "reptrack_cache_requests_total",
+    "In-process cache lookups, by cache and whether they hit",
+    ["cache", "result"],
+)
+
+PR_DETECTION_SECONDS = Histogram(
+    "reptrack_pr_detection_seconds",
+    "Time spent checking a completed session for personal records",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "reptrack_password_hash_seconds",
+    "Time spent hashing or verifying a password, excluding queueing",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+PASSWORD_HASH_QUEUE_SECONDS = Histogram(
+    "reptrack_password_hash_queue_seconds",
+    "Time a password operation waited for a free hashing worker",
+    ["operation"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "reptrack_password_hash_pending",
+    "Password operations running or queued on the hashing pool",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "reptrack_password_hash_rejected_total",
+    "Password operations refused because the hashing pool was saturated",
+    ["operation"],
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "reptrack_db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the database pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "reptrack_db_pool_timeouts_total",
+    "Connection checkouts that gave up after the pool timeout",
+    ["pool"],
+)
+DB_POOL_SIZE = Gauge(
+    "reptrack_db_pool_size",
+    "Connections the database pool keeps open",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "reptrack_db_pool_checked_out",
+    "Database connections currently in use",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "reptrack_db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool fills)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+BULKHEAD_ACTIVE = Gauge(
+    "reptrack_bulkhead_active",
+    "Requests currently running inside a bulkhead",
+    ["bulkhead"],
+    multiprocess_mode="livesum",
+)
+BULKHEAD_QUEUED = Gauge(
+    "reptrack_bulkhead_queued",
+    "Requests waiting for a bulkhead slot",
+    ["bulkhead"],
+    multiprocess_mode="livesum",
+)
+BULKHEAD_WAIT_SECONDS = Histogram(
+    "reptrack_bulkhead_wait_seconds",
+    "Time queued requests waited for a bulkhead slot",
+    ["bulkhead"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BULKHEAD_REJECTED = Counter(
+    "reptrack_bulkhead_rejected_total",
+    "Requests shed with 503 because a bulkhead and its queue were full",
+    ["bulkhead"],
+)
+
+
+def render_metrics() -> bytes:
+    """Render every metric in the Prometheus text format, across all workers."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_stopped():
+    """Drop this worker's live gauges from the aggregate once it shuts down."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,98 @@
+from collections.abc import Callable
+from contextvars import ContextVar
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Media type the current request's response should be encoded as
+response_media_type: ContextVar[str] = ContextVar(
+    "response_media_type", default=JSON_MEDIA_TYPE
+)
+
+
+def negotiate_media_type(accept: str) -> str:
+    """Choose MessagePack when the client weighs it at least as high as JSON."""
+    msgpack_quality = json_quality = wildcard_quality = 0.0
+    for item in accept.lower().split(","):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.strip()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_quality = max(json_quality, quality)
+        elif media_type in ("*/*", "application/*"):
+            wildcard_quality = max(wildcard_quality, quality)
+
+    json_quality = json_quality or wildcard_quality
+    if msgpack_quality > 0 and msgpack_quality >= json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode_msgpack(data) -> bytes:
+    return msgpack.packb(data)
+
+
+class MsgPackRequest(Request):
+    """
+    Request whose MessagePack body is presented to FastAPI as decoded JSON.
+
+    FastAPI only parses bodies it recognises as JSON, so the content type is
+    reported as JSON and `json()` unpacks the MessagePack payload instead.
+    The endpoint's pydantic payload schema then validates it as usual.
+    """
+
+    def __init__(self, scope, receive):
+        headers = MutableHeaders(scope=dict(scope, headers=list(scope["headers"])))
+        headers["content-type"] = JSON_MEDIA_TYPE
+        super().__init__(dict(scope, headers=headers.raw), receive)
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route that speaks MessagePack as well as JSON.
+
+    Request bodies sent as ``application/msgpack`` are accepted wherever JSON
+    is. Responses built with `model_response` are encoded as MessagePack when
+    the ``Accept`` header prefers it; other responses, including errors, stay
+    JSON.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "")
+            if content_type.split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES:
+                request = MsgPackRequest(request.scope, request.receive)
+
+            token = response_media_type.set(
+                negotiate_media_type(request.headers.get("accept", ""))
+            )
+            try:
+                response = await handler(request)
+            finally:
+                response_media_type.reset(token)
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_handler
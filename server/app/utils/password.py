@@ -1,14 +1,116 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+
 import bcrypt
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+from app.utils.metrics import (
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_QUEUE_SECONDS,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_SECONDS,
+)
+
+settings = get_settings()
+
+# bcrypt is deliberately slow, so it runs on a small dedicated pool. At most
+# `password_hash_workers + password_hash_max_queue` request threads can wait on
+# it; further logins and signups are refused with 503 instead of tying up the
+# request threadpool that every other endpoint shares.
+_slots = BoundedSemaphore(
+    settings.password_hash_workers + settings.password_hash_max_queue
+)
+_executor: Executor | None = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if settings.password_hash_executor == "process":
+                _executor = ProcessPoolExecutor(settings.password_hash_workers)
+            else:
+                _executor = ThreadPoolExecutor(
+                    settings.password_hash_workers, thread_name_prefix="bcrypt"
+                )
+        return _executor
+
+
+def _hash(password_bytes: bytes, rounds: int) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds))
+    return hashed, time.perf_counter() - started
+
+
+def _check(password_bytes: bytes, hashed_bytes: bytes) -> tuple[bool, float]:
+    started = time.perf_counter()
+    matches = bcrypt.checkpw(password_bytes, hashed_bytes)
+    return matches, time.perf_counter() - started
+
+
+def _acquire_slot(operation: str):
+    if not _slots.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.labels(operation).inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        )
+    PASSWORD_HASH_PENDING.inc()
+
+
+def _release_slot():
+    PASSWORD_HASH_PENDING.dec()
+    _slots.release()
+
+
+def _observe(operation: str, started: float, elapsed: float):
+    PASSWORD_HASH_SECONDS.labels(operation).observe(elapsed)
+    PASSWORD_HASH_QUEUE_SECONDS.labels(operation).observe(
+        max(0.0, time.perf_counter() - started - elapsed)
+    )
+
+
+def _run(operation: str, fn, *args):
+    _acquire_slot(operation)
+    started = time.perf_counter()
+    try:
+        result, elapsed = _get_executor().submit(fn, *args).result()
+    finally:
+        _release_slot()
+    _observe(operation, started, elapsed)
+    return result
+
+
+async def _run_async(operation: str, fn, *args):
+    # Same pool and limits as `_run`, awaited so the event loop keeps serving
+    _acquire_slot(operation)
+    started = time.perf_counter()
+    try:
+        result, elapsed = await asyncio.wrap_future(_get_executor().submit(fn, *args))
+    finally:
+        _release_slot()
+    _observe(operation, started, elapsed)
+    return result
 
 
 def hash_password(password: str) -> str:
     password_bytes = password.encode("utf-8")[:72]
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    hashed = _run("hash", _hash, password_bytes, settings.bcrypt_rounds)
     return hashed.decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode("utf-8")[:72]
     hashed_bytes = hashed_password.encode("utf-8")
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return _run("verify", _check, password_bytes, hashed_bytes)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    password_bytes = plain_password.encode("utf-8")[:72]
+    hashed_bytes = hashed_password.encode("utf-8")
+    return await _run_async("verify", _check, password_bytes, hashed_bytes)
@@ -0,0 +1,180 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.logger import logger
+
+settings = get_settings()
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|\$\d+|(?<!:):\w+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str, max_length: int = 500) -> str:
+    """Collapse a statement into its shape: placeholders, literals and lists become ?."""
+    shape = _LITERAL.sub("?", statement)
+    shape = _VALUE_LIST.sub("(...)", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return shape if len(shape) <= max_length else shape[:max_length] + "..."
+
+
+def route_label(scope: Scope) -> str:
+    """The request's method and route template, or its raw path before routing."""
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', scope.get('path', ''))}"
+
+
+class RequestStats:
+    """
+    Where one request spent its time: SQL statements issued and time spent
+    running them, plus named phases such as "auth" timed with `timed`.
+    """
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.phases: dict[str, float] = {}
+        # Database time already accounted for inside a phase
+        self.phase_db_seconds = 0.0
+
+    def record(self, elapsed: float):
+        self.statements += 1
+        self.db_seconds += elapsed
+
+    def server_timing(self, elapsed: float) -> str:
+        """
+        Format a Server-Timing header for a request that took `elapsed` seconds.
+
+        Phases include the statements run inside them, so "db" covers the
+        rest and "handler" whatever time is left over.
+        """
+        db = self.db_seconds - self.phase_db_seconds
+        handler = max(0.0, elapsed - sum(self.phases.values()) - db)
+        entries = [*self.phases.items(), ("db", db), ("handler", handler)]
+        entries.append(("total", elapsed))
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in entries
+        )
+
+
+# Threadpool and greenlet hops copy the context, so every statement run for a
+# request, sync or async, lands on that request's stats
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the enclosed block's wall time to `phase` of the current request."""
+    stats = request_stats.get()
+    if stats is None:
+        yield
+        return
+    started, db_started = time.perf_counter(), stats.db_seconds
+    try:
+        yield
+    finally:
+        stats.phases[phase] = (
+            stats.phases.get(phase, 0.0) + time.perf_counter() - started
+        )
+        stats.phase_db_seconds += stats.db_seconds - db_started
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+
+    if elapsed * 1000 >= settings.slow_query_ms:
+        route = route_label(stats.scope) if stats is not None else "-"
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f}ms) on {route}: {normalize_sql(statement)}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Account for the SQL each request issues and flag the expensive ones.
+
+    The statement count and database time are collected by the cursor
+    event hooks above. A request slower than `slow_request_ms`, or issuing
+    more than `slow_request_statements` statements (the usual sign of an
+    N+1), is logged with its route. With `expose_headers` the counts are
+    also returned as ``X-DB-Statements`` and ``X-DB-Time`` (milliseconds).
+
+    With `server_timing`, every response gets a ``Server-Timing`` header
+    splitting the time to its first byte into the timed phases, database
+    and handler time. Cross-origin pages can read it from the origins in
+    `timing_allow_origins`. Streamed responses report what had run when
+    their headers were sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_ms: float = 1000,
+        slow_request_statements: int = 50,
+        expose_headers: bool = False,
+        server_timing: bool = True,
+        timing_allow_origins: list[str] | None = None,
+    ):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.slow_request_statements = slow_request_statements
+        self.expose_headers = expose_headers
+        self.server_timing = server_timing
+        self.timing_allow_origin = ", ".join(timing_allow_origins or [])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_stats(message: Message):
+            if message["type"] == "http.response.start":
+                self._add_headers(message, stats, time.perf_counter() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            request_stats.reset(token)
+            self._report(stats, time.perf_counter() - started)
+
+    def _add_headers(self, message: Message, stats: RequestStats, elapsed: float):
+        headers = MutableHeaders(scope=message)
+        if self.server_timing:
+            headers.append("Server-Timing", stats.server_timing(elapsed))
+            if self.timing_allow_origin:
+                headers["Timing-Allow-Origin"] = self.timing_allow_origin
+        if self.expose_headers:
+            headers["X-DB-Statements"] = str(stats.statements)
+            headers["X-DB-Time"] = f"{stats.db_seconds * 1000:.1f}"
+
+    def _report(self, stats: RequestStats, elapsed: float):
+        if (
+            elapsed * 1000 < self.slow_request_ms
+            and stats.statements <= self.slow_request_statements
+        ):
+            return
+        logger.warning(
+            f"Slow request {route_label(stats.scope)}: {elapsed * 1000:.1f}ms, "
+            f"{stats.statements} statements, {stats.db_seconds * 1000:.1f}ms in the database"
+        )
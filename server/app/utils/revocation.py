@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.revoked_token import RevokedToken
+from app.utils.logger import logger
+from app.utils.shared_counter import SharedCounter
+
+# Revocations are re-read this far back on each sync, so rows from transactions
+# that committed out of order with their revoked_at timestamps are not missed.
+SYNC_OVERLAP = timedelta(seconds=30)
+# Full reloads drop expired revocations from memory and resize the filter.
+REBUILD_INTERVAL_SECONDS = 3600
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests never give false negatives; false positives occur at
+    roughly `error_rate` once `capacity` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    In-memory view of revoked token ids, kept in sync across worker processes.
+
+    Lookups go through a Bloom filter, which rules out almost every token that
+    was never revoked, and then an exact set that settles the rare positive.
+    Revoking a token bumps a counter shared by every worker on the host; a
+    worker only reads the revoked_token table when that counter moved since
+    its last sync, at least every `sync_interval` seconds, or when its
+    periodic rebuild is due, and then only the new rows.
+
+    The counter is a host-local file, so it only reaches the workers of one
+    host at once. Workers on other hosts see a revocation on their next
+    interval sync; keep `sync_interval` well under the access token lifetime.
+    """
+
+    def __init__(self, name: str, sync_interval: float, capacity: int = 100_000):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self._generation = SharedCounter(name)
+        self._lock = Lock()
+        self._synced_generation = None
+        self._synced_at = None
+        self._poll_at = 0.0
+        self._rebuild_at = 0.0
+        self._filter = BloomFilter(capacity)
+        self._revoked: dict[str, datetime] = {}
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        generation = self._generation.value()
+        if self._is_stale(generation):
+            with self._lock:
+                self._sync(generation, db)
+        return jti in self._filter and jti in self._revoked
+
+    async def is_revoked_async(self, jti: str, db: AsyncSession) -> bool:
+        generation = self._generation.value()
+        if self._is_stale(generation):
+            # Never block the event loop on the lock: its holder may be another
+            # coroutine on this loop, suspended in the middle of its query
+            while not self._lock.acquire(blocking=False):
+                await asyncio.sleep(0.001)
+            try:
+                await db.run_sync(lambda session: self._sync(generation, session))
+            finally:
+                self._lock.release()
+        return jti in self._filter and jti in self._revoked
+
+    def add(self, jti: str, expires_at: datetime, db: Session):
+        """Stage a revocation in the caller's transaction; `publish` after commit."""
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+
+    def publish(self):
+        """
+        Tell every worker that new revocations were committed.
+
+        Only needed for tokens that authenticate requests; each publish makes
+        every worker query the table on its next lookup.
+        """
+        self._generation.increment()
+
+    def _is_stale(self, generation: int) -> bool:
+        due = min(self._poll_at, self._rebuild_at)
+        return generation != self._synced_generation or time.monotonic() >= due
+
+    def _sync(self, generation: int, db: Session):
+        # Callers hold `_lock`; whoever waited on it may find the work done
+        if not self._is_stale(generation):
+            return
+
+        now = datetime.now(timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.expires_at)
+        rebuild = time.monotonic() >= self._rebuild_at
+        if rebuild:
+            query = query.where(RevokedToken.expires_at > now)
+        else:
+            query = query.where(
+                RevokedToken.revoked_at >= self._synced_at - SYNC_OVERLAP
+            )
+        rows = db.execute(query).all()
+
+        if rebuild:
+            # Build replacements aside so concurrent lookups never see them half full
+            revoked = {}
+            bloom = BloomFilter(max(self.capacity, 2 * len(rows)))
+        else:
+            revoked, bloom = self._revoked, self._filter
+        for jti, expires_at in rows:
+            if jti not in revoked:
+                bloom.add(jti)
+                revoked[jti] = expires_at
+        if rebuild:
+            self._filter, self._revoked = bloom, revoked
+            self._rebuild_at = time.monotonic() + REBUILD_INTERVAL_SECONDS
+
+        self._synced_generation = generation
+        self._synced_at = now
+        self._poll_at = time.monotonic() + self.sync_interval
+        logger.debug(
+            f"Synced {len(rows)} token revocations "
+            f"({'full' if rebuild else 'delta'}), {len(self._revoked)} held"
+        )
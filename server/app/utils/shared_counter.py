@@ -0,0 +1,67 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from threading import Lock
+
+from app.config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None
+
+_COUNTER = struct.Struct("<Q")
+
+
+def shared_state_dir() -> str:
+    """
+    Directory holding state shared by the worker processes of one deployment.
+
+    Defaults to a temp directory derived from the database URL, so that
+    separate deployments on one host do not invalidate each other's caches.
+    """
+    settings = get_settings()
+    if settings.shared_state_dir:
+        return settings.shared_state_dir
+    digest = hashlib.blake2b(
+        settings.database_url.encode("utf-8"), digest_size=6
+    ).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"reptrack-{digest}")
+
+
+class SharedCounter:
+    """
+    Monotonic counter shared by all worker processes on a host.
+
+    The value lives in a small memory-mapped file, so reading it is a memory
+    access rather than a syscall or a database query. Increments are
+    serialized with an advisory file lock.
+    """
+
+    def __init__(self, name: str, directory: str | None = None):
+        directory = directory or shared_state_dir()
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.counter")
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < _COUNTER.size:
+            os.ftruncate(self._fd, _COUNTER.size)
+        self._map = mmap.mmap(self._fd, _COUNTER.size)
+        self._lock = Lock()
+
+    def value(self) -> int:
+        return _COUNTER.unpack_from(self._map, 0)[0]
+
+    def increment(self) -> int:
+        with self._lock:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = self.value() + 1
+                _COUNTER.pack_into(self._map, 0, value)
+                return value
+            finally:
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,480 @@
+import inspect
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from functools import wraps
+
+import orjson
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.logger import logger
+from app.utils.query_stats import normalize_sql, route_label
+
+settings = get_settings()
+
+# OTLP enum values
+SPAN_KIND_INTERNAL, SPAN_KIND_SERVER, SPAN_KIND_CLIENT = 1, 2, 3
+STATUS_ERROR = 2
+
+# Service arguments recorded on their span, and the attribute each becomes.
+# Objects are recorded by their `id`.
+TRACED_ARGUMENTS = {
+    "user_id": "user_id",
+    "current_user": "user_id",
+    "session_id": "session_id",
+    "session": "session_id",
+    "workout_id": "workout_id",
+    "workout_exercise_id": "workout_exercise_id",
+    "exercise_id": "exercise_id",
+    "set_id": "set_id",
+    "pr_id": "pr_id",
+}
+
+
+class Span:
+    """One timed operation of a trace, in the shape of an OpenTelemetry span."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(
+        self, trace, name: str, kind: int, parent_id: str | None, attributes: dict
+    ):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        # Client errors are expected outcomes, not faults of the operation
+        if isinstance(error, HTTPException) and error.status_code < 500:
+            self.set_attribute("http.response.status_code", error.status_code)
+            return
+        self.error = f"{type(error).__name__}: {error}"
+
+    def child(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes) -> "Span":
+        return Span(self.trace, name, kind, self.span_id, attributes)
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+
+
+# The innermost open span of the current request; None when not sampled
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def annotate(**attributes):
+    """Set attributes on the current span, if the request is being traced."""
+    span = current_span.get()
+    if span is not None:
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Split a W3C ``traceparent`` header into trace id, parent id and sampled flag."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans: list[Span], service_name: str) -> dict:
+    """Encode finished spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span.attributes.items()
+            ],
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        if span.error:
+            item["status"] = {"code": STATUS_ERROR, "message": span.error}
+        encoded.append(item)
+
+    resource = {"key": "service.name", "value": {"stringValue": service_name}}
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [resource]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": encoded}],
+            }
+        ]
+    }
+
+
+class FileExporter:
+    """Append each trace as one OTLP/JSON line, like the collector's file exporter."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: list[Span]):
+        with open(self.path, "ab") as stream:
+            stream.write(orjson.dumps(otlp_payload(spans, self.service_name)) + b"\n")
+
+
+class OTLPHttpExporter:
+    """POST each trace to an OTLP/HTTP endpoint such as host:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: list[Span]):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=orjson.dumps(otlp_payload(spans, self.service_name)),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class BackgroundExporter:
+    """
+    Export finished traces from a daemon thread so requests never wait on I/O.
+
+    At most `max_queue` traces wait for export; beyond that new traces are
+    dropped and counted in `dropped` rather than slowing the service down.
+    """
+
+    def __init__(self, exporters: list, max_queue: int = 1024):
+        self.exporters = exporters
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]):
+        if not self.exporters:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout: float = 5):
+        """Flush queued traces and stop the export thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _run(self):
+        while (spans := self._queue.get()) is not None:
+            for exporter in self.exporters:
+                try:
+                    exporter.export(spans)
+                except Exception as e:
+                    logger.warning(f"Failed to export trace: {str(e)}")
+
+
+class Tracer:
+    """
+    Head-sampled request tracing.
+
+    A request continues the trace of an incoming ``traceparent`` header, and
+    otherwise starts a new one. Either way it is sampled with probability
+    `sample_ratio`: clients can choose the trace a request joins but not
+    force it to be recorded. Only with `trust_parent_sampling`, for callers
+    behind a trusted proxy or mesh, does the header's sampled flag decide
+    instead. Spans of unsampled requests are never created. A sampled trace
+    is handed to `exporter` once its root ends.
+    """
+
+    def __init__(
+        self, sample_ratio: float, exporter, trust_parent_sampling: bool = False
+    ):
+        self.sample_ratio = sample_ratio
+        self.exporter = exporter
+        self.trust_parent_sampling = trust_parent_sampling
+
+    def start_trace(self, name: str, traceparent: str | None = None, **attributes):
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, parent_sampled = parent
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        if parent is not None and self.trust_parent_sampling:
+            sampled = parent_sampled
+        else:
+            sampled = random.random() < self.sample_ratio
+        if not sampled:
+            return None
+        return Span(_Trace(trace_id), name, SPAN_KIND_SERVER, parent_id, attributes)
+
+    def finish_trace(self, root: Span):
+        root.end()
+        self.exporter.export(root.trace.spans)
+
+    def shutdown(self):
+        if hasattr(self.exporter, "shutdown"):
+            self.exporter.shutdown()
+
+
+def _build_exporter() -> BackgroundExporter:
+    exporters = []
+    if settings.tracing_file:
+        exporters.append(FileExporter(settings.tracing_file, settings.app_name))
+    if settings.tracing_otlp_endpoint:
+        exporters.append(
+            OTLPHttpExporter(settings.tracing_otlp_endpoint, settings.app_name)
+        )
+    return BackgroundExporter(exporters)
+
+
+tracer = Tracer(
+    settings.tracing_sample_ratio,
+    _build_exporter(),
+    trust_parent_sampling=settings.tracing_trust_parent_sampling,
+)
+
+
+class TracingMiddleware:
+    """
+    Open a root span for each sampled HTTP request.
+
+    The span is named after the route template once routing has run, and
+    records the method, path, route and response status. Service calls and
+    SQL statements made while handling the request become its children.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = self.tracer.start_trace(
+            scope["path"],
+            Headers(scope=scope).get("traceparent"),
+            **{"http.request.method": scope["method"], "url.path": scope["path"]},
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            root.record_error(e)
+            raise
+        finally:
+            current_span.reset(token)
+            root.name = route_label(scope)
+            root.set_attribute("http.route", getattr(scope.get("route"), "path", None))
+            root.set_attribute("http.response.status_code", status_code)
+            if status_code >= 500 and root.error is None:
+                root.error = f"HTTP {status_code}"
+            self.tracer.finish_trace(root)
+
+
+def _traced_arguments(fn) -> list[tuple[str, int, str]]:
+    parameters = list(inspect.signature(fn).parameters)
+    return [
+        (name, index, TRACED_ARGUMENTS[name])
+        for index, name in enumerate(parameters)
+        if name in TRACED_ARGUMENTS
+    ]
+
+
+def _start_service_span(name: str, arguments, args, kwargs) -> Span | None:
+    parent = current_span.get()
+    if parent is None:
+        return None
+    span = parent.child(name)
+    for argument, index, key in arguments:
+        value = kwargs.get(argument, args[index] if index < len(args) else None)
+        if value is not None and not isinstance(value, int):
+            value = getattr(value, "id", None)
+        span.set_attribute(key, value)
+    return span
+
+
+def _end_service_span(span: Span, result):
+    if isinstance(result, (list, tuple)):
+        span.set_attribute("result.count", len(result))
+    span.end()
+
+
+def _trace_function(name: str, fn):
+    arguments = _traced_arguments(fn)
+
+    if inspect.iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def traced_async(*args, **kwargs):
+            span = _start_service_span(name, arguments, args, kwargs)
+            if span is None:
+                return await fn(*args, **kwargs)
+            token = current_span.set(span)
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                span.record_error(e)
+                span.end()
+                raise
+            finally:
+                current_span.reset(token)
+            _end_service_span(span, result)
+            return result
+
+        return traced_async
+
+    @wraps(fn)
+    def traced(*args, **kwargs):
+        span = _start_service_span(name, arguments, args, kwargs)
+        if span is None:
+            return fn(*args, **kwargs)
+        token = current_span.set(span)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            span.record_error(e)
+            span.end()
+            raise
+        finally:
+            current_span.reset(token)
+        _end_service_span(span, result)
+        return result
+
+    return traced
+
+
+def traced_service(cls):
+    """
+    Class decorator giving every static method of a service its own span.
+
+    Spans are named ``Service.method`` and record the ids among the call's
+    arguments (see `TRACED_ARGUMENTS`) and the length of list results. With
+    tracing disabled the class is returned untouched, so it costs nothing;
+    generator methods are left alone as their work happens after they return.
+    """
+    if not settings.tracing_enabled:
+        return cls
+    for name, member in list(vars(cls).items()):
+        if isinstance(member, staticmethod) and not inspect.isgeneratorfunction(
+            member.__func__
+        ):
+            traced = _trace_function(f"{cls.__name__}.{name}", member.__func__)
+            setattr(cls, name, staticmethod(traced))
+    return cls
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is None:
+        return
+    span = parent.child(
+        statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL",
+        SPAN_KIND_CLIENT,
+        **{
+            "db.system": conn.dialect.name,
+            "db.statement": normalize_sql(statement),
+        },
+    )
+    if executemany:
+        span.set_attribute("db.executemany", True)
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if not spans:
+        return
+    span = spans.pop()
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        span.set_attribute("db.rows", cursor.rowcount)
+    span.end()
+
+
+def handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if not spans:
+        return
+    span = spans.pop()
+    span.record_error(exception_context.original_exception)
+    span.end()
@@ -0,0 +1,59 @@
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str | None) -> set[str]:
+    """Split text into pg_trgm style trigrams: lowercase words padded with blanks."""
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    In-memory trigram inverted index for typo-tolerant, ranked text search.
+
+    Documents are indexed by one or more weighted text fields. A document's
+    score for a query is the best weighted fraction of the query's trigrams
+    found in any of its fields, which approximates PostgreSQL's
+    ``word_similarity``. Equal scores keep the order documents were added in.
+    """
+
+    def __init__(self, fields: dict[str, float]):
+        self.fields = fields
+        self.documents: dict = {}
+        self._position: dict = {}
+        self._postings = {field: defaultdict(set) for field in fields}
+
+    def add(self, key, document, **texts: str | None):
+        self.documents[key] = document
+        self._position.setdefault(key, len(self._position))
+        for field in self.fields:
+            for gram in trigrams(texts.get(field)):
+                self._postings[field][gram].add(key)
+
+    def search(self, query: str, min_score: float = 0.4) -> list[tuple[float, object]]:
+        """Return ``(score, key)`` pairs scoring at least `min_score`, best first."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        scores: dict = {}
+        for field, weight in self.fields.items():
+            postings = self._postings[field]
+            matches = Counter(
+                chain.from_iterable(postings.get(gram, ()) for gram in query_grams)
+            )
+            for key, count in matches.items():
+                score = weight * count / len(query_grams)
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+
+        ranked = [(score, key) for key, score in scores.items() if score >= min_score]
+        ranked.sort(key=lambda item: (-item[0], self._position[item[1]]))
+        return ranked
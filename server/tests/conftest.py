@@ -1,10 +1,26 @@
+import os
+
+# Cheap bcrypt cost for tests; must be set before the app reads its settings
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("DB_STATS_HEADERS", "1")
+os.environ.setdefault("METRICS_PATH", "/metrics")
+# Traced code paths run everywhere, but no request is sampled unless a test
+# trusts its traceparent header
+os.environ.setdefault("TRACING_ENABLED", "1")
+os.environ.setdefault("TRACING_SAMPLE_RATIO", "0")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, async_database_url, get_async_db, get_db
+from app.services.exercise_service import catalog_cache, search_index_cache
+from app.services.workout_service import workout_snapshot_cache
+from app.utils.auth import user_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -13,6 +29,14 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# TestClient runs each request on a fresh event loop, so connections are not pooled
+async_engine = create_async_engine(
+    async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def override_get_db():
     db = TestingSessionLocal()
@@ -22,10 +46,20 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="function")
 def client():
+    catalog_cache.clear()
+    search_index_cache.clear()
+    workout_snapshot_cache.clear()
+    user_cache.clear()
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield TestClient(app)
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.bulkhead import Bulkhead
+
+
+def test_bulkhead_queues_then_sheds():
+    """Test requests beyond the limit queue in order and overflow gets 503"""
+
+    async def scenario():
+        bulkhead = Bulkhead(
+            "test", limit=1, max_queue=1, queue_timeout=1, retry_after=3
+        )
+        await bulkhead.acquire()
+
+        queued = asyncio.create_task(bulkhead.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as shed:
+            await bulkhead.acquire()
+        assert shed.value.status_code == 503
+        assert shed.value.headers["Retry-After"] == "3"
+
+        bulkhead.release()
+        await asyncio.wait_for(queued, 1)
+        bulkhead.release()
+        assert bulkhead._active == 0
+
+    asyncio.run(scenario())
+
+
+def test_bulkhead_sheds_after_queue_timeout():
+    async def scenario():
+        bulkhead = Bulkhead(
+            "test", limit=1, max_queue=4, queue_timeout=0.01, retry_after=1
+        )
+        await bulkhead.acquire()
+        with pytest.raises(HTTPException):
+            await bulkhead.acquire()
+        assert not bulkhead._waiters
+
+        bulkhead.release()
+        await bulkhead.acquire()
+        bulkhead.release()
+        assert bulkhead._active == 0
+
+    asyncio.run(scenario())
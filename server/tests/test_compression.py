@@ -0,0 +1,93 @@
+import pytest
+
+from app.utils import compression
+from app.utils.compression import ENCODERS, negotiate_encoding
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, identity") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("") is None
+    # With equal weights the server's preferred available coding wins
+    assert negotiate_encoding("*") == next(iter(ENCODERS))
+    if "br" in ENCODERS:
+        assert negotiate_encoding("gzip, br;q=0.9") == "gzip"
+        assert negotiate_encoding("gzip;q=0.5, br") == "br"
+
+
+def _create_exercises(authenticated_client):
+    for i in range(30):
+        authenticated_client(
+            "POST",
+            "/exercises",
+            json={
+                "name": f"Exercise {i}",
+                "description": "A fairly repetitive catalog description",
+                "muscle_group": "back",
+                "equipment": "cable_machine",
+            },
+        )
+
+
+def test_large_json_responses_are_gzipped(authenticated_client):
+    """Test large payloads are compressed and small ones are left alone"""
+    _create_exercises(authenticated_client)
+
+    resp = authenticated_client(
+        "GET", "/exercises/search?limit=30", headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(resp.content) / 3
+    assert len(resp.json()["data"]) == 30
+
+    resp = authenticated_client(
+        "GET", "/exercises/1", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in resp.headers
+
+    # Streamed exports are compressed chunk by chunk
+    resp = authenticated_client(
+        "GET", "/users/export", headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.text.count("\n") == 1
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br"])
+def test_zstd_and_brotli_responses(authenticated_client, encoding):
+    """Test both optional codings round-trip, buffered and streamed"""
+    assert encoding in ENCODERS
+    _create_exercises(authenticated_client)
+    plain = authenticated_client("GET", "/exercises/search?limit=30")
+
+    resp = authenticated_client(
+        "GET", "/exercises/search?limit=30", headers={"Accept-Encoding": encoding}
+    )
+    assert resp.headers["content-encoding"] == encoding
+    assert int(resp.headers["content-length"]) < len(plain.content) / 3
+    assert resp.json() == plain.json()
+
+    resp = authenticated_client(
+        "GET", "/users/export", headers={"Accept-Encoding": encoding}
+    )
+    assert resp.headers["content-encoding"] == encoding
+    assert resp.text.count("\n") == 1
+
+
+def test_unavailable_codings_fall_back_to_gzip(authenticated_client, monkeypatch):
+    """Test a deployment without zstandard and brotli still compresses"""
+    monkeypatch.setattr(compression, "ENCODERS", {"gzip": compression._GzipEncoder})
+    assert negotiate_encoding("zstd, br, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("zstd, br") is None
+
+    _create_exercises(authenticated_client)
+    resp = authenticated_client(
+        "GET",
+        "/exercises/search?limit=30",
+        headers={"Accept-Encoding": "zstd, br, gzip;q=0.5"},
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()["data"]) == 30
@@ -0,0 +1,168 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils import query_stats
+from app.config import Settings
+from app.utils.db_pool import (
+    ASYNC_BULKHEADS,
+    SYNC_BULKHEADS,
+    InstrumentedQueuePool,
+    async_pool_options,
+    max_connections,
+    sync_pool_options,
+    sync_request_capacity,
+)
+from app.utils.logger import logger
+
+
+def _sample(name, pool):
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0
+
+
+def test_pool_exports_occupancy_and_timeouts(tmp_path):
+    """Test the instrumented pool reports checkouts and counts timeouts"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_logging_name="test",
+    )
+    checkouts = _sample("reptrack_db_pool_checkout_seconds_count", "test")
+    timeouts = _sample("reptrack_db_pool_timeouts_total", "test")
+
+    with engine.connect():
+        assert _sample("reptrack_db_pool_checked_out", "test") == 1
+        assert _sample("reptrack_db_pool_overflow", "test") == 0
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    assert _sample("reptrack_db_pool_checked_out", "test") == 0
+
+    assert _sample("reptrack_db_pool_checkout_seconds_count", "test") == checkouts + 2
+    assert _sample("reptrack_db_pool_timeouts_total", "test") == timeouts + 1
+
+    # The pool that replaces a disposed one reports through the same listeners once
+    engine.dispose()
+    assert _sample("reptrack_db_pool_overflow", "test") == -1
+    with engine.connect():
+        assert _sample("reptrack_db_pool_checked_out", "test") == 1
+    engine.dispose()
+
+
+def test_pool_sizes_fit_postgres_defaults():
+    """Test each engine is sized on its own and a worker stays well under 100"""
+    settings = Settings(database_url="sqlite://", secret_key="k")
+    # The async pool follows the bulkheads of the event loop routers
+    sessions, reports = settings.bulkheads["sessions"], settings.bulkheads["reports"]
+    assert async_pool_options(settings)["pool_size"] == sessions[0] + reports[0]
+    assert max_connections(settings) * 3 < 100
+
+    settings = Settings(
+        database_url="sqlite://",
+        secret_key="k",
+        async_db_pool_size=5,
+        async_db_max_overflow=0,
+    )
+    assert async_pool_options(settings)["pool_size"] == 5
+    assert max_connections(settings) == settings.threadpool_size + 5
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{}, {"threadpool_size": 30}, {"db_pool_size": 4}, {"db_pool_size": 50}],
+)
+def test_sync_pool_has_a_connection_per_thread(overrides):
+    """Test no request thread has to wait for a sync connection unless configured"""
+    settings = Settings(database_url="sqlite://", secret_key="k", **overrides)
+    options = sync_pool_options(settings)
+    assert options["pool_size"] + options["max_overflow"] >= settings.threadpool_size
+    assert options["pool_size"] == overrides.get(
+        "db_pool_size", settings.threadpool_size
+    )
+
+
+def test_sync_bulkheads_fit_the_sync_pool():
+    """Test the threadpool routers together cannot admit more than can run"""
+    settings = Settings(database_url="sqlite://", secret_key="k")
+    assert set(settings.bulkheads) == {*SYNC_BULKHEADS, *ASYNC_BULKHEADS}
+    admitted = sum(settings.bulkheads[name][0] for name in SYNC_BULKHEADS)
+    assert admitted <= sync_request_capacity(settings)
+
+    settings = Settings(
+        database_url="sqlite://", secret_key="k", threadpool_size=40, db_pool_size=4
+    )
+    assert sync_request_capacity(settings) == 40
+    settings = Settings(
+        database_url="sqlite://", secret_key="k", db_pool_size=4, db_max_overflow=2
+    )
+    assert sync_request_capacity(settings) == 6
+
+
+def test_requests_report_statement_counts(created_exercise, monkeypatch):
+    """Test statements are counted per request on sync and async routes"""
+    authenticated_client, exercise_id = created_exercise
+
+    resp = authenticated_client("GET", f"/exercises/{exercise_id}")
+    assert int(resp.headers["x-db-statements"]) >= 1
+    assert float(resp.headers["x-db-time"]) >= 0
+
+    resp = authenticated_client("GET", "/sessions")
+    assert resp.status_code == 200
+    assert int(resp.headers["x-db-statements"]) >= 1
+
+    resp = authenticated_client("GET", "/openapi.json")
+    assert resp.headers["x-db-statements"] == "0"
+
+    # Every statement is over a zero threshold and logged with its route
+    warnings = []
+    monkeypatch.setattr(query_stats.settings, "slow_query_ms", 0)
+    monkeypatch.setattr(logger, "warning", warnings.append)
+    authenticated_client("GET", f"/exercises/{exercise_id}")
+    assert any(
+        message.startswith("Slow query") and "GET /exercises/{exercise_id}" in message
+        for message in warnings
+    )
+    assert not any(
+        str(exercise_id) in message.split(": ", 1)[1] for message in warnings
+    )
+
+
+def test_normalize_sql():
+    assert (
+        query_stats.normalize_sql(
+            "SELECT *\n  FROM users WHERE id IN (?, ?, ?) AND name = 'x' LIMIT 10"
+        )
+        == "SELECT * FROM users WHERE id IN (...) AND name = ? LIMIT ?"
+    )
+    assert (
+        query_stats.normalize_sql("SELECT %(p)s::musclegroup WHERE a = $1")
+        == "SELECT ?::musclegroup WHERE a = ?"
+    )
+
+
+def _server_timing(resp):
+    return {
+        name: float(duration.removeprefix("dur="))
+        for name, duration in (
+            entry.strip().split(";")
+            for entry in resp.headers["server-timing"].split(",")
+        )
+    }
+
+
+def test_server_timing_breakdown(created_exercise):
+    """Test responses split their time into auth, db, serialization and handler"""
+    authenticated_client, exercise_id = created_exercise
+
+    for path in (f"/exercises/{exercise_id}", "/sessions"):
+        timing = _server_timing(authenticated_client("GET", path))
+        assert set(timing) == {"auth", "serialize", "db", "handler", "total"}
+        parts = timing["auth"] + timing["serialize"] + timing["db"] + timing["handler"]
+        # Each part is rounded to 0.1ms on its own
+        assert parts == pytest.approx(timing["total"], abs=0.3)
+
+    timing = _server_timing(authenticated_client("GET", "/openapi.json"))
+    assert set(timing) == {"db", "handler", "total"}
@@ -1,3 +1,13 @@
+import time
+
+from sqlalchemy import update
+
+from app.models.exercise import Exercise
+from app.services.exercise_service import settings
+from app.utils import cache
+from tests.conftest import TestingSessionLocal
+
+
 def test_create_exercise(authenticated_client):
     """Test to check if creating a exercise works"""
     create_response = authenticated_client(
@@ -120,3 +130,160 @@ def test_delete_exercise(created_exercise):
 
     check_response = authenticated_client("GET", f"/exercises/{exercise_id}")
     assert check_response.status_code == 404
+
+
+def test_get_all_exercises_cached(created_exercise):
+    """Test catalog ETag handling and invalidation on catalog writes"""
+    authenticated_client, exercise_id = created_exercise
+    first = authenticated_client("GET", "/exercises")
+    etag = first.headers["etag"]
+
+    cached = authenticated_client("GET", "/exercises", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    authenticated_client(
+        "PUT", f"/exercises/{exercise_id}", json={"name": "Wide Grip Pulldown"}
+    )
+    updated = authenticated_client("GET", "/exercises", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != etag
+    assert updated.json()["data"][0]["name"] == "Wide Grip Pulldown"
+
+
+def test_catalog_cache_expires(created_exercise, monkeypatch):
+    """Test catalog writes that did not bump this host's counter show up"""
+    authenticated_client, exercise_id = created_exercise
+    etag = authenticated_client("GET", "/exercises").headers["etag"]
+
+    # As if written by another host or the import CLI elsewhere
+    with TestingSessionLocal() as db:
+        db.execute(
+            update(Exercise).where(Exercise.id == exercise_id).values(name="Renamed")
+        )
+        db.commit()
+    cached = authenticated_client("GET", "/exercises", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    later = time.monotonic() + settings.catalog_cache_ttl_seconds
+    monkeypatch.setattr(cache.time, "monotonic", lambda: later)
+    resp = authenticated_client("GET", "/exercises", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["data"][0]["name"] == "Renamed"
+
+
+def _create_catalog(authenticated_client):
+    for name, description, muscle_group, equipment in [
+        ("Bench Press", "Flat barbell press", "chest", "barbell"),
+        ("Incline Dumbbell Press", "Upper chest press", "chest", "dumbbells"),
+        ("Lat Pulldown", "Lat pulldown cable", "back", "cable_machine"),
+        ("Barbell Row", "Bent over row", "back", "barbell"),
+    ]:
+        authenticated_client(
+            "POST",
+            "/exercises",
+            json={
+                "name": name,
+                "description": description,
+                "muscle_group": muscle_group,
+                "equipment": equipment,
+            },
+        )
+
+
+def test_search_exercises(authenticated_client):
+    """Test typo-tolerant ranking, filters and pagination"""
+    _create_catalog(authenticated_client)
+
+    response = authenticated_client("GET", "/exercises/search?q=bench pres")
+    assert response.status_code == 200
+    assert response.json()["data"][0]["name"] == "Bench Press"
+
+    response = authenticated_client("GET", "/exercises/search?q=pulldwn")
+    assert [e["name"] for e in response.json()["data"]] == ["Lat Pulldown"]
+
+    response = authenticated_client(
+        "GET", "/exercises/search?q=press&muscle_group=chest&limit=1&offset=1"
+    )
+    body = response.json()
+    assert body["total"] == 2
+    assert [e["name"] for e in body["data"]] == ["Incline Dumbbell Press"]
+
+    response = authenticated_client("GET", "/exercises/search?equipment=barbell")
+    assert [e["name"] for e in response.json()["data"]] == [
+        "Barbell Row",
+        "Bench Press",
+    ]
+
+
+def test_search_exercises_sees_catalog_changes(authenticated_client):
+    _create_catalog(authenticated_client)
+    assert authenticated_client("GET", "/exercises/search?q=curl").json()["total"] == 0
+
+    authenticated_client(
+        "POST",
+        "/exercises",
+        json={"name": "Hammer Curl", "muscle_group": "arms", "equipment": "dumbbells"},
+    )
+    response = authenticated_client("GET", "/exercises/search?q=curl")
+    assert [e["name"] for e in response.json()["data"]] == ["Hammer Curl"]
+
+
+def test_import_exercises_csv(created_exercise):
+    """Test CSV import upserts on name and reports rejected rows"""
+    authenticated_client, exercise_id = created_exercise
+    resp = authenticated_client("POST", "/workout", json={"name": "Pull"})
+    workout = resp.json()["data"]
+    authenticated_client(
+        "POST",
+        f"/workout/{workout['id']}/exercise",
+        json={
+            "exercise_id": exercise_id,
+            "order_index": 0,
+            "notes": "",
+            "workout_id": workout["id"],
+        },
+    )
+    resp = authenticated_client("GET", f"/workout/{workout['id']}")
+    version = resp.json()["data"]["version"]
+    csv_body = (
+        "name,description,muscle_group,equipment\n"
+        "Lat Pulldown,Updated description,back,cable_machine\n"
+        "Goblet Squat,,legs,kettlebell\n"
+        "Broken Row,,not_a_group,barbell\n"
+        "Goblet Squat,Again,legs,kettlebell\n"
+    )
+    response = authenticated_client(
+        "POST",
+        "/exercises/import",
+        files={"file": ("catalog.csv", csv_body, "text/csv")},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 1, 2)
+    assert [error["line"] for error in data["errors"]] == [4, 5]
+
+    updated = authenticated_client("GET", f"/exercises/{exercise_id}").json()["data"]
+    assert updated["description"] == "Updated description"
+    names = [
+        e["name"] for e in authenticated_client("GET", "/exercises").json()["data"]
+    ]
+    assert "Goblet Squat" in names
+    # The workout embeds the updated exercise, so its version moved on
+    resp = authenticated_client("GET", f"/workout/{workout['id']}")
+    assert resp.json()["data"]["version"] == version + 1
+
+
+def test_import_exercises_ndjson(authenticated_client):
+    ndjson_body = (
+        '{"name": "Plank", "muscle_group": "core", "equipment": "bodyweight"}\n'
+        "not json\n"
+        '{"name": "Farmer Carry", "muscle_group": "full_body", "equipment": "dumbbells"}\n'
+    )
+    response = authenticated_client(
+        "POST",
+        "/exercises/import?format=ndjson",
+        files={"file": ("catalog.txt", ndjson_body)},
+    )
+    data = response.json()["data"]
+    assert (data["inserted"], data["updated"], data["rejected"]) == (2, 0, 1)
+    assert data["errors"][0]["line"] == 2
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+from typing import ClassVar
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, model_validator
+
+from app.schemas.workout import WorkoutResponse
+from app.services.workout_service import WorkoutService
+from app.utils.formatter import format_response, model_response, type_adapter
+from app.utils.query_stats import RequestStats, request_stats
+from tests.conftest import TestingSessionLocal
+
+
+class CountedSchema(BaseModel):
+    id: int
+    name: str
+
+    validations: ClassVar[int] = 0
+
+    @model_validator(mode="after")
+    def count(self):
+        CountedSchema.validations += 1
+        return self
+
+
+class CountedResponse(BaseModel):
+    success: bool
+    data: CountedSchema
+
+
+def test_model_response_validates_once():
+    """Test the payload is validated once, through one adapter per schema"""
+    assert type_adapter(CountedResponse) is type_adapter(CountedResponse)
+    hits = type_adapter.cache_info().hits
+    CountedSchema.validations = 0
+
+    # ORM objects are read through their attributes
+    row = SimpleNamespace(id=1, name="Squat")
+    resp = model_response(CountedResponse, format_response(row))
+    assert json.loads(resp.body) == {"success": True, "data": row.__dict__}
+    assert CountedSchema.validations == 1
+    assert type_adapter.cache_info().hits == hits + 1
+
+
+def test_model_response_matches_jsonable_encoder(created_exercise):
+    """Test the bytes decode to what FastAPI's own encoding produced"""
+    authenticated_client, exercise_id = created_exercise
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Encoded",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": 0,
+                    "notes": "",
+                    "sets": [
+                        {
+                            "reps": 5,
+                            "weight": 100,
+                            "set_type": "warmup",
+                            "order_index": 0,
+                            "notes": "",
+                        }
+                    ],
+                }
+            ],
+        },
+    )
+    workout_id = resp.json()["data"]["id"]
+
+    with TestingSessionLocal() as db:
+        content = format_response(WorkoutService.get_workout_by_id(workout_id, db))
+        body = model_response(WorkoutResponse, content).body
+        expected = jsonable_encoder(
+            WorkoutResponse.model_validate(content, from_attributes=True)
+        )
+
+    # Datetimes, enums and the nested exercise and sets all encode the same
+    assert json.loads(body) == expected
+    workout_exercise = expected["data"]["workout_exercises"][0]
+    assert workout_exercise["exercise"]["muscle_group"] == "back"
+    assert workout_exercise["sets"][0]["set_type"] == "warmup"
+
+
+def test_model_response_times_serialization():
+    """Test encoding is recorded as the request's "serialize" phase"""
+    stats = RequestStats({})
+    token = request_stats.set(stats)
+    try:
+        model_response(
+            CountedResponse, format_response(SimpleNamespace(id=1, name="Squat"))
+        )
+    finally:
+        request_stats.reset(token)
+    assert stats.phases["serialize"] > 0
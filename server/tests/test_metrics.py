@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client.parser import text_string_to_metric_families
+
+
+def _samples(client):
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(resp.text)
+        for sample in family.samples
+    }
+
+
+def test_metrics_endpoint(created_exercise, client):
+    """Test requests, caches and PR detection show up on /metrics"""
+    authenticated_client, exercise_id = created_exercise
+    key = (
+        "reptrack_http_requests_total",
+        (("method", "GET"), ("route", "/exercises/{exercise_id}"), ("status", "200")),
+    )
+    missing = (
+        "reptrack_http_requests_total",
+        (("method", "GET"), ("route", "unmatched"), ("status", "404")),
+    )
+    detections = ("reptrack_pr_detection_seconds_count", ())
+    before = _samples(client)
+
+    for _ in range(3):
+        authenticated_client("GET", f"/exercises/{exercise_id}")
+    client.get("/no/such/route")
+    workout = authenticated_client(
+        "POST",
+        "/workout",
+        json={"name": "Metrics"},
+    ).json()["data"]
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    ).json()["data"]
+    authenticated_client("POST", f"/sessions/{session['id']}/complete")
+
+    after = _samples(client)
+    assert after[key] == before.get(key, 0) + 3
+    assert after[missing] == before.get(missing, 0) + 1
+    assert after[detections] == before.get(detections, 0) + 1
+    assert after[("reptrack_http_requests_in_flight", ())] == 1
+    assert after[
+        ("reptrack_cache_requests_total", (("cache", "users"), ("result", "hit")))
+    ] > before.get(
+        ("reptrack_cache_requests_total", (("cache", "users"), ("result", "hit"))), 0
+    )
+
+
+def test_metrics_not_served_by_default():
+    """Test /metrics only exists once METRICS_PATH enables it"""
+    env = {k: v for k, v in os.environ.items() if k != "METRICS_PATH"}
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app.main import app;"
+            "print(sorted(route.path for route in app.routes))",
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert "'/metrics'" not in output
+    assert "'/exercises'" in output
+
+
+def test_metrics_aggregate_across_workers(tmp_path):
+    """Test samples written by separate worker processes are summed"""
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PATH": ""}
+    worker = (
+        "from app.utils.metrics import HTTP_REQUESTS;"
+        "HTTP_REQUESTS.labels('GET', '/exercises', '200').inc()"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from app.utils.metrics import render_metrics;"
+            "sys.stdout.write(render_metrics().decode())",
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert (
+        'reptrack_http_requests_total{method="GET",route="/exercises",status="200"} 2.0'
+        in output
+    )
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from app.utils import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SAMPLED = {"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+
+
+class _Collector:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+@pytest.mark.skipif(
+    not tracing.settings.tracing_enabled, reason="services are only traced if enabled"
+)
+def test_complete_session_is_traced(created_exercise, monkeypatch):
+    """Test a sampled request records service and SQL spans under its root"""
+    authenticated_client, exercise_id = created_exercise
+    collector = _Collector()
+    monkeypatch.setattr(tracing.tracer, "exporter", collector)
+    monkeypatch.setattr(tracing.tracer, "trust_parent_sampling", True)
+
+    workout = authenticated_client("POST", "/workout", json={"name": "Traced"})
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout.json()["data"]["id"]}
+    ).json()["data"]
+    assert collector.traces == []
+
+    resp = authenticated_client(
+        "POST", f"/sessions/{session['id']}/complete", headers=SAMPLED
+    )
+    assert resp.status_code == 200
+
+    (spans,) = collector.traces
+    by_id = {span.span_id: span for span in spans}
+    root = next(span for span in spans if span.parent_id not in by_id)
+    assert root.trace.trace_id == TRACE_ID
+    assert root.parent_id == "00f067aa0ba902b7"
+    assert root.name == "POST /sessions/{session_id}/complete"
+    assert root.attributes["http.response.status_code"] == 200
+    assert root.attributes["user_id"] == session["user_id"]
+
+    service = next(
+        span for span in spans if span.name == "WorkoutSessionService.complete_session"
+    )
+    assert service.attributes["session_id"] == session["id"]
+    assert service.attributes["user_id"] == session["user_id"]
+    detection = next(
+        span
+        for span in spans
+        if span.name == "PersonalRecordService.check_and_update_prs_for_session"
+    )
+    assert detection.attributes["result.count"] == 0
+
+    # Every span descends from the root, and service spans parent their SQL
+    for span in spans:
+        ancestor = span
+        while ancestor.parent_id in by_id:
+            ancestor = by_id[ancestor.parent_id]
+        assert ancestor is root
+    updates = [span for span in spans if span.name == "UPDATE"]
+    assert updates and all(by_id[span.parent_id].kind == 1 for span in updates)
+    assert all(span.attributes["db.rows"] == 1 for span in updates)
+    assert all("?" in span.attributes["db.statement"] for span in updates)
+
+
+def test_file_exporter_writes_otlp_json(tmp_path):
+    """Test traces are appended as OTLP/JSON lines"""
+    tracer = tracing.Tracer(
+        1.0, tracing.FileExporter(str(tmp_path / "t.jsonl"), "test")
+    )
+    root = tracer.start_trace("GET /x", SAMPLED["traceparent"], **{"a": 1})
+    child = root.child("Service.method", user_id=7)
+    child.record_error(ValueError("boom"))
+    child.end()
+    tracer.finish_trace(root)
+
+    assert tracing.parse_traceparent("00-00-00-01") is None
+    # A client's sampled flag is only followed when the tracer trusts it
+    unsampled = tracing.Tracer(0.0, None)
+    assert unsampled.start_trace("GET /x") is None
+    assert unsampled.start_trace("GET /x", SAMPLED["traceparent"]) is None
+    trusting = tracing.Tracer(0.0, None, trust_parent_sampling=True)
+    assert trusting.start_trace("GET /x", SAMPLED["traceparent"]) is not None
+    unsampled_parent = SAMPLED["traceparent"][:-2] + "00"
+    assert (
+        tracing.Tracer(1.0, None, trust_parent_sampling=True).start_trace(
+            "GET /x", unsampled_parent
+        )
+        is None
+    )
+
+    (line,) = (tmp_path / "t.jsonl").read_text().splitlines()
+    (resource,) = json.loads(line)["resourceSpans"]
+    assert resource["resource"]["attributes"][0]["value"]["stringValue"] == "test"
+    spans = resource["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["Service.method", "GET /x"]
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    assert spans[1]["parentSpanId"] == "00f067aa0ba902b7"
+    assert {span["traceId"] for span in spans} == {TRACE_ID}
+    assert spans[0]["attributes"] == [{"key": "user_id", "value": {"intValue": "7"}}]
+    assert spans[0]["status"] == {"code": 2, "message": "ValueError: boom"}
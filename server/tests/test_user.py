@@ -1,5 +1,31 @@
 # TODO: Invalid email
 # TODO: Empty fields
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from threading import BoundedSemaphore
+
+from app.models import (
+    ExerciseUsage,
+    PersonalRecord,
+    SessionExercise,
+    SessionSet,
+    User,
+    Workout,
+    WorkoutExercise,
+    WorkoutSession,
+    WorkoutSet,
+)
+from app.models.revoked_token import RevokedToken
+from app.utils import password, revocation
+from app.utils.auth import (
+    create_access_token,
+    decode_token,
+    revocations,
+    token_cache,
+    user_cache,
+)
+from tests.conftest import TestingSessionLocal
 
 
 def test_create_user(client):
@@ -30,6 +56,63 @@ def test_get_all_users(authenticated_client):
     assert len(data) >= 1
 
 
+def _create_users(authenticated_client, count):
+    for i in range(count):
+        response = authenticated_client(
+            "POST",
+            "/users",
+            json={
+                "name": f"Member {i}",
+                "email": f"Member{i}@example.com",
+                "password": "password123",
+                "role": "coach" if i % 2 else "user",
+            },
+        )
+        assert response.status_code == 201
+
+
+def test_get_all_users_paginated(authenticated_client):
+    """Test users are listed in keyset pages and can be filtered"""
+    _create_users(authenticated_client, 5)
+
+    ids, after = [], None
+    while True:
+        url = "/users?limit=2" + (f"&after={after}" if after else "")
+        body = authenticated_client("GET", url).json()
+        assert len(body["data"]) <= 2
+        ids += [user["id"] for user in body["data"]]
+        after = body["next_cursor"]
+        if after is None:
+            break
+    assert ids == [1, 2, 3, 4, 5, 6]
+
+    response = authenticated_client("GET", "/users?role=coach&email_prefix=MEMBER")
+    emails = [user["email"] for user in response.json()["data"]]
+    assert emails == ["member1@example.com", "member3@example.com"]
+
+    response = authenticated_client("GET", "/users?email_prefix=member_")
+    assert response.json()["data"] == []
+
+
+def test_export_users(authenticated_client, client):
+    """Test admins can stream all users as NDJSON and others cannot"""
+    _create_users(authenticated_client, 3)
+    with TestingSessionLocal() as db:
+        db.get(User, 2).deleted_at = datetime.now(timezone.utc)
+        db.commit()
+
+    response = authenticated_client("GET", "/users/export?role=user")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [user["email"] for user in lines] == ["member2@example.com"]
+
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/users/export", headers=headers).status_code == 403
+    assert client.get("/users", headers=headers).status_code == 403
+
+
 def test_get_user_by_id(authenticated_client):
     """Test to check if fetching a user works"""
     create_response = authenticated_client(
@@ -172,3 +255,210 @@ def test_login_nonexistent_user(client):
     assert response.status_code == 401
     data = response.json()
     assert data["detail"] == "Invalid credentials"
+
+
+def test_deleted_user_token_rejected(authenticated_client):
+    """Test cached identities are invalidated when a user is deleted"""
+    assert authenticated_client("GET", "/users/1").status_code == 200
+    assert authenticated_client("DELETE", "/users/1").status_code == 200
+
+    response = authenticated_client("GET", "/exercises")
+    assert response.status_code == 401
+
+
+def test_role_change_applies_to_existing_token(authenticated_client):
+    """Test a role change takes effect without waiting for the cache TTL"""
+    response = authenticated_client("PUT", "/users/1", json={"role": "user"})
+    assert response.status_code == 200
+
+    response = authenticated_client(
+        "POST",
+        "/exercises",
+        json={"name": "Squat", "muscle_group": "legs", "equipment": "barbell"},
+    )
+    assert response.status_code == 403
+
+
+def test_user_change_keeps_other_cached_users(authenticated_client, client):
+    """Test updating one user only drops that user's cached identity"""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/users/2", headers=headers).status_code == 200
+    assert authenticated_client("GET", "/users/1").status_code == 200
+
+    response = authenticated_client("PUT", "/users/1", json={"name": "Jane Doe"})
+    assert response.status_code == 200
+    assert user_cache.get(1) is None
+    assert user_cache.get(2) is not None
+
+
+def test_token_verification_cached(authenticated_client):
+    """Test repeated requests with one token reuse its verified payload"""
+    authenticated_client("GET", "/users/1")
+    hits = token_cache.hits
+    authenticated_client("GET", "/users/1")
+    assert token_cache.hits == hits + 1
+
+
+def test_cached_token_expires(authenticated_client, client):
+    """Test a cached token stops working once its exp passes"""
+    token = create_access_token(
+        {"user": {"id": 1, "role": "admin"}}, expires_delta=timedelta(seconds=1)
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    # exp has one-second resolution, so wait until it is strictly in the past
+    time.sleep(2.1)
+    assert client.get("/users/1", headers=headers).status_code == 401
+
+
+def _login(client):
+    client.post(
+        "/users",
+        json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "password": "password123",
+            "role": "user",
+        },
+    )
+    response = client.post(
+        "/users/login",
+        data={"username": "john@example.com", "password": "password123"},
+    )
+    return response.json()
+
+
+def test_refresh_rotates_tokens(client):
+    """Test refresh tokens are single use and issue a working access token"""
+    tokens = _login(client)
+    assert tokens["refresh_token"]
+    generation = revocations._generation.value()
+
+    response = client.post(
+        "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    headers = {"Authorization": f"Bearer {refreshed['access_token']}"}
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    reused = client.post(
+        "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert reused.status_code == 401
+    # Rotation leaves the other workers' revocation lists alone
+    assert revocations._generation.value() == generation
+
+    # Logging out with the rotated refresh token still revokes the access token
+    response = client.post(
+        "/users/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert client.get("/users/1", headers=headers).status_code == 401
+    assert revocations._generation.value() == generation + 1
+
+    # An access token is not accepted as a refresh token
+    response = client.post(
+        "/users/refresh", json={"refresh_token": refreshed["access_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_logout_revokes_tokens(client):
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    response = client.post(
+        "/users/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+
+    assert client.get("/users/1", headers=headers).status_code == 401
+    response = client.post(
+        "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_revocations_from_other_hosts_apply_within_sync_interval(client, monkeypatch):
+    """Test a revocation this host was not told about is picked up by polling"""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    # Another host's logout commits the row but cannot bump this host's counter
+    payload = decode_token(tokens["access_token"])
+    with TestingSessionLocal() as db:
+        db.add(
+            RevokedToken(
+                jti=payload["jti"],
+                expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+            )
+        )
+        db.commit()
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    later = time.monotonic() + revocations.sync_interval
+    monkeypatch.setattr(revocation.time, "monotonic", lambda: later)
+    assert client.get("/users/1", headers=headers).status_code == 401
+
+
+def test_login_rejected_when_hashing_saturated(client, monkeypatch):
+    """Test logins are shed with 503 once the hashing pool queue is full"""
+    _login(client)
+    monkeypatch.setattr(password, "_slots", BoundedSemaphore(1))
+    password._slots.acquire()
+
+    response = client.post(
+        "/users/login",
+        data={"username": "john@example.com", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
+
+
+def test_delete_user_purges_owned_data(created_exercise):
+    """Test deleting a user removes their workouts, sessions and records"""
+    authenticated_client, exercise_id = created_exercise
+    workout = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Push",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": 0,
+                    "sets": [
+                        {
+                            "reps": 5,
+                            "weight": 100,
+                            "set_type": "normal",
+                            "order_index": 0,
+                            "notes": "",
+                        }
+                    ],
+                }
+            ],
+        },
+    ).json()["data"]
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    ).json()["data"]
+    authenticated_client("POST", f"/sessions/{session['id']}/complete")
+
+    response = authenticated_client("DELETE", "/users/1")
+    assert response.status_code == 200
+
+    with TestingSessionLocal() as db:
+        for model in (User, Workout, WorkoutExercise, WorkoutSet, WorkoutSession):
+            assert db.query(model).count() == 0
+        for model in (SessionExercise, SessionSet, ExerciseUsage, PersonalRecord):
+            assert db.query(model).count() == 0
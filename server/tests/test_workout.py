@@ -1,5 +1,8 @@
 from fastapi import status
 
+from app.models import Workout
+from tests.conftest import TestingSessionLocal
+
 
 def test_create_workout(authenticated_client):
     """Test creating a workout"""
@@ -310,3 +313,325 @@ def test_delete_workout_wrong_owner(authenticated_client, client):
     )
     assert delete_resp.status_code == status.HTTP_403_FORBIDDEN
     assert "creator" in delete_resp.json()["detail"].lower()
+
+
+def test_clone_workout(created_exercise):
+    """Test cloning a workout copies its exercises and sets"""
+    authenticated_client, exercise_id = created_exercise
+    create_resp = authenticated_client(
+        "POST",
+        "/workout",
+        json={"name": "Pull Day", "notes": "Template"},
+    )
+    workout_id = create_resp.json()["data"]["id"]
+
+    for order_index in (1, 2):
+        we_resp = authenticated_client(
+            "POST",
+            f"/workout/{workout_id}/exercise",
+            json={
+                "exercise_id": exercise_id,
+                "order_index": order_index,
+                "notes": f"Exercise {order_index}",
+                "workout_id": workout_id,
+            },
+        )
+        workout_exercise_id = we_resp.json()["data"]["id"]
+        for set_index in range(order_index):
+            authenticated_client(
+                "POST",
+                f"/workout/{workout_id}/exercise/{workout_exercise_id}/set",
+                json={
+                    "reps": 8 + set_index,
+                    "weight": 50,
+                    "set_type": "normal",
+                    "order_index": set_index,
+                    "notes": "",
+                },
+            )
+
+    clone_resp = authenticated_client(
+        "POST", f"/workout/{workout_id}/clone", json={"name": "Pull Day Copy"}
+    )
+    assert clone_resp.status_code == 201
+    data = clone_resp.json()["data"]
+    assert data["id"] != workout_id
+    assert data["name"] == "Pull Day Copy"
+    assert data["notes"] == "Template"
+
+    exercises = sorted(data["workout_exercises"], key=lambda e: e["order_index"])
+    assert [e["notes"] for e in exercises] == ["Exercise 1", "Exercise 2"]
+    assert all(e["workout_id"] == data["id"] for e in exercises)
+    assert [len(e["sets"]) for e in exercises] == [1, 2]
+    assert [s["reps"] for s in exercises[1]["sets"]] == [8, 9]
+
+    source = authenticated_client("GET", f"/workout/{workout_id}").json()["data"]
+    source_set_ids = {s["id"] for e in source["workout_exercises"] for s in e["sets"]}
+    assert not source_set_ids & {s["id"] for e in exercises for s in e["sets"]}
+
+
+def test_clone_workout_not_found(authenticated_client):
+    """Test 404 when cloning a non-existent workout"""
+    resp = authenticated_client("POST", "/workout/999999/clone")
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_create_workout_template(created_exercise):
+    """Test creating a workout with nested exercises and sets in one request"""
+    authenticated_client, exercise_id = created_exercise
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Back Template",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": 0,
+                    "notes": "Heavy",
+                    "sets": [
+                        {
+                            "reps": 5,
+                            "weight": 80,
+                            "set_type": "normal",
+                            "order_index": i,
+                            "notes": "",
+                        }
+                        for i in range(3)
+                    ],
+                },
+                {"exercise_id": exercise_id, "order_index": 1, "sets": []},
+            ],
+        },
+    )
+    assert resp.status_code == 201
+    data = resp.json()["data"]
+    assert data["name"] == "Back Template"
+    exercises = sorted(data["workout_exercises"], key=lambda e: e["order_index"])
+    assert len(exercises) == 2
+    assert [s["order_index"] for s in exercises[0]["sets"]] == [0, 1, 2]
+    assert exercises[1]["sets"] == []
+
+
+def test_create_workout_template_unknown_exercise(authenticated_client):
+    """Test nested creation fails atomically for unknown catalog exercises"""
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Broken Template",
+            "workout_exercises": [{"exercise_id": 999, "order_index": 0}],
+        },
+    )
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    workouts = authenticated_client("GET", "/workout").json()["data"]
+    assert workouts == []
+
+
+def _create_template(authenticated_client, exercise_id):
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Reorder Template",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": i,
+                    "sets": [
+                        {
+                            "reps": 10,
+                            "weight": 20,
+                            "set_type": "normal",
+                            "order_index": j,
+                            "notes": "",
+                        }
+                        for j in range(2)
+                    ],
+                }
+                for i in range(2)
+            ],
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["data"]
+
+
+def test_reorder_workout(created_exercise):
+    """Test reordering exercises and sets in a single request"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id)
+    first, second = sorted(workout["workout_exercises"], key=lambda e: e["order_index"])
+    set_a, set_b = first["sets"]
+
+    resp = authenticated_client(
+        "PUT",
+        f"/workout/{workout['id']}/order",
+        json={
+            "workout_exercises": [
+                {"id": first["id"], "order_index": 1},
+                {"id": second["id"], "order_index": 0},
+            ],
+            "sets": [
+                {"id": set_a["id"], "order_index": 1},
+                {"id": set_b["id"], "order_index": 0},
+            ],
+        },
+    )
+    assert resp.status_code == 200
+    exercises = {e["id"]: e for e in resp.json()["data"]["workout_exercises"]}
+    assert exercises[first["id"]]["order_index"] == 1
+    assert exercises[second["id"]]["order_index"] == 0
+    assert [s["id"] for s in exercises[first["id"]]["sets"]] == [
+        set_b["id"],
+        set_a["id"],
+    ]
+
+
+def test_reorder_workout_foreign_ids(created_exercise):
+    """Test reorder rejects IDs that belong to another workout"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id)
+    other = _create_template(authenticated_client, exercise_id)
+    foreign_set = other["workout_exercises"][0]["sets"][0]
+
+    resp = authenticated_client(
+        "PUT",
+        f"/workout/{workout['id']}/order",
+        json={
+            "workout_exercises": [
+                {"id": workout["workout_exercises"][0]["id"], "order_index": 5}
+            ],
+            "sets": [{"id": foreign_set["id"], "order_index": 3}],
+        },
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    unchanged = authenticated_client("GET", f"/workout/{workout['id']}").json()
+    assert sorted(e["order_index"] for e in unchanged["data"]["workout_exercises"]) == [
+        0,
+        1,
+    ]
+
+
+def test_get_workout_conditional(created_exercise):
+    """Test ETag/If-None-Match handling and version bumps on child edits"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id)
+    workout_id = workout["id"]
+    assert workout["version"] == 1
+
+    resp = authenticated_client("GET", f"/workout/{workout_id}")
+    etag = resp.headers["etag"]
+
+    not_modified = authenticated_client(
+        "GET", f"/workout/{workout_id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.headers["etag"] == etag
+
+    # Each encoding of the same version has its own ETag
+    packed = authenticated_client(
+        "GET",
+        f"/workout/{workout_id}",
+        headers={"If-None-Match": etag, "Accept": "application/msgpack"},
+    )
+    assert packed.status_code == 200
+    assert packed.headers["etag"] != etag
+    assert "Accept" in packed.headers["vary"]
+
+    set_id = workout["workout_exercises"][0]["sets"][0]["id"]
+    we_id = workout["workout_exercises"][0]["id"]
+    update_resp = authenticated_client(
+        "PUT",
+        f"/workout/{workout_id}/exercise/{we_id}/set/{set_id}",
+        json={"reps": 12},
+    )
+    assert update_resp.status_code == 200
+
+    modified = authenticated_client(
+        "GET", f"/workout/{workout_id}", headers={"If-None-Match": etag}
+    )
+    assert modified.status_code == 200
+    assert modified.headers["etag"] != etag
+    assert modified.json()["data"]["version"] == 2
+
+
+def test_catalog_edits_change_workout_etags(created_exercise):
+    """Test renaming a catalog exercise invalidates the workouts showing it"""
+    authenticated_client, exercise_id = created_exercise
+    workout_id = _create_template(authenticated_client, exercise_id)["id"]
+    etag = authenticated_client("GET", f"/workout/{workout_id}").headers["etag"]
+    list_etag = authenticated_client("GET", "/workout").headers["etag"]
+
+    resp = authenticated_client(
+        "PUT", f"/exercises/{exercise_id}", json={"name": "Wide Grip Pulldown"}
+    )
+    assert resp.status_code == 200
+
+    resp = authenticated_client(
+        "GET", f"/workout/{workout_id}", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    exercise = resp.json()["data"]["workout_exercises"][0]["exercise"]
+    assert exercise["name"] == "Wide Grip Pulldown"
+    resp = authenticated_client("GET", "/workout", headers={"If-None-Match": list_etag})
+    assert resp.status_code == 200
+
+
+def test_get_all_workouts_conditional(authenticated_client):
+    """Test the workout list ETag changes when a workout is added"""
+    authenticated_client("POST", "/workout", json={"name": "A"})
+    etag = authenticated_client("GET", "/workout").headers["etag"]
+
+    resp = authenticated_client("GET", "/workout", headers={"If-None-Match": etag})
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+    authenticated_client("POST", "/workout", json={"name": "B"})
+    resp = authenticated_client("GET", "/workout", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert len(resp.json()["data"]) == 2
+
+
+def test_edits_stamp_snapshot_with_their_version(created_exercise):
+    """Test each edit stores a snapshot of its changes under the version it bumped"""
+    authenticated_client, exercise_id = created_exercise
+    workout = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Versioned",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": 0,
+                    "sets": [
+                        {
+                            "reps": 5,
+                            "weight": 80,
+                            "set_type": "normal",
+                            "order_index": 0,
+                            "notes": "",
+                        }
+                    ],
+                }
+            ],
+        },
+    ).json()["data"]
+    (workout_exercise,) = workout["workout_exercises"]
+    (workout_set,) = workout_exercise["sets"]
+
+    for reps in (6, 7):
+        resp = authenticated_client(
+            "PUT",
+            f"/workout/{workout['id']}/exercise/{workout_exercise['id']}"
+            f"/set/{workout_set['id']}",
+            json={"reps": reps},
+        )
+        assert resp.status_code == 200
+
+    with TestingSessionLocal() as db:
+        stored = db.get(Workout, workout["id"])
+        assert stored.snapshot_version == stored.version
+        assert stored.snapshot[0]["sets"][0]["reps"] == 7
@@ -0,0 +1,244 @@
+import asyncio
+
+import httpx
+import msgpack
+from fastapi import status
+
+from app.main import app
+
+
+def _create_template(authenticated_client, exercise_id, set_count=2):
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        json={
+            "name": "Session Template",
+            "workout_exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "order_index": 0,
+                    "notes": "Main lift",
+                    "sets": [
+                        {
+                            "reps": 5,
+                            "weight": 100 + i * 10,
+                            "set_type": "normal",
+                            "order_index": i,
+                            "notes": "",
+                        }
+                        for i in range(set_count)
+                    ],
+                }
+            ],
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["data"]
+
+
+def test_start_session(created_exercise):
+    """Test starting a session copies the template's planned sets"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id)
+
+    resp = authenticated_client("POST", "/sessions", json={"workout_id": workout["id"]})
+    assert resp.status_code == 201
+    data = resp.json()["data"]
+    assert data["workout_id"] == workout["id"]
+    assert data["status"] == "in_progress"
+
+    (session_exercise,) = data["session_exercises"]
+    assert session_exercise["notes"] == "Main lift"
+    assert [s["planned_weight"] for s in session_exercise["session_sets"]] == [
+        100,
+        110,
+    ]
+    assert all(s["status"] == "pending" for s in session_exercise["session_sets"])
+
+
+def test_start_session_after_template_edit(created_exercise):
+    """Test sessions pick up template edits made after a previous session"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id, set_count=1)
+    workout_exercise_id = workout["workout_exercises"][0]["id"]
+
+    first = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    )
+    assert len(first.json()["data"]["session_exercises"][0]["session_sets"]) == 1
+
+    authenticated_client(
+        "POST",
+        f"/workout/{workout['id']}/exercise/{workout_exercise_id}/set",
+        json={
+            "reps": 3,
+            "weight": 140,
+            "set_type": "normal",
+            "order_index": 1,
+            "notes": "",
+        },
+    )
+
+    second = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    )
+    session_sets = second.json()["data"]["session_exercises"][0]["session_sets"]
+    assert [s["planned_weight"] for s in session_sets] == [100, 140]
+
+
+def test_start_session_workout_not_found(authenticated_client):
+    """Test 404 when starting a session for a missing workout"""
+    resp = authenticated_client("POST", "/sessions", json={"workout_id": 999})
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_complete_session_records_exercise_usage(created_exercise):
+    """Test template edits and completed sessions feed the top exercises list"""
+    authenticated_client, exercise_id = created_exercise
+    other = authenticated_client(
+        "POST",
+        "/exercises",
+        json={"name": "Squat", "muscle_group": "legs", "equipment": "barbell"},
+    ).json()["data"]
+
+    workout = _create_template(authenticated_client, exercise_id)
+    authenticated_client(
+        "POST",
+        f"/workout/{workout['id']}/exercise",
+        json={
+            "workout_id": workout["id"],
+            "exercise_id": other["id"],
+            "order_index": 1,
+            "notes": "",
+        },
+    )
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    ).json()["data"]
+    resp = authenticated_client("POST", f"/sessions/{session['id']}/complete")
+    assert resp.status_code == 200
+
+    frequent = authenticated_client("GET", "/exercises/top").json()["data"]
+    assert [(u["exercise"]["id"], u["use_count"]) for u in frequent] == [
+        (exercise_id, 2),
+        (other["id"], 2),
+    ]
+
+    authenticated_client(
+        "POST",
+        f"/workout/{workout['id']}/exercise",
+        json={
+            "workout_id": workout["id"],
+            "exercise_id": other["id"],
+            "order_index": 2,
+            "notes": "",
+        },
+    )
+    recent = authenticated_client("GET", "/exercises/top?order=recent&limit=1")
+    assert [u["exercise"]["id"] for u in recent.json()["data"]] == [other["id"]]
+
+
+def _login(client):
+    resp = client.post(
+        "/users/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_sessions_served_concurrently_on_event_loop(created_exercise, client):
+    """Test many session reads interleave on one event loop without threads"""
+    authenticated_client, exercise_id = created_exercise
+    workout = _create_template(authenticated_client, exercise_id)
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    ).json()["data"]
+    headers = {"Authorization": f"Bearer {_login(client)['access_token']}"}
+
+    async def read_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test", headers=headers
+        ) as http:
+            return await asyncio.gather(
+                *(http.get(f"/sessions/{session['id']}") for _ in range(25)),
+                http.get("/prs/summary"),
+            )
+
+    *reads, summary = asyncio.run(read_all())
+    assert all(resp.status_code == 200 for resp in reads)
+    assert {resp.json()["data"]["id"] for resp in reads} == {session["id"]}
+    assert summary.json()["data"]["total_prs"] == 0
+
+
+def test_async_endpoints_reject_revoked_tokens(created_exercise, client):
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/sessions", headers=headers).status_code == 200
+
+    resp = client.post("/users/logout", headers=headers)
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get("/sessions", headers=headers).status_code == 401
+    assert client.get("/prs", headers=headers).status_code == 401
+
+
+def test_msgpack_set_logging(created_exercise):
+    """Test MessagePack bodies are accepted and returned when preferred"""
+    authenticated_client, exercise_id = created_exercise
+    msgpack_headers = {
+        "Content-Type": "application/msgpack",
+        "Accept": "application/msgpack, application/json;q=0.9",
+    }
+    template = {
+        "name": "Packed Template",
+        "workout_exercises": [
+            {
+                "exercise_id": exercise_id,
+                "order_index": 0,
+                "notes": "",
+                "sets": [
+                    {
+                        "reps": 5,
+                        "weight": 100,
+                        "set_type": "normal",
+                        "order_index": 0,
+                        "notes": "",
+                    }
+                ],
+            }
+        ],
+    }
+    resp = authenticated_client(
+        "POST",
+        "/workout/template",
+        content=msgpack.packb(template),
+        headers=msgpack_headers,
+    )
+    assert resp.status_code == 201
+    assert resp.headers["content-type"] == "application/msgpack"
+    workout = msgpack.unpackb(resp.content)["data"]
+
+    session = authenticated_client(
+        "POST", "/sessions", json={"workout_id": workout["id"]}
+    ).json()["data"]
+    set_id = session["session_exercises"][0]["session_sets"][0]["id"]
+    resp = authenticated_client(
+        "PUT",
+        f"/sessions/{session['id']}/set/{set_id}",
+        content=msgpack.packb({"actual_reps": 6, "actual_weight": 105}),
+        headers=msgpack_headers,
+    )
+    assert resp.status_code == 200
+    assert "Accept" in resp.headers["vary"]
+    completed = msgpack.unpackb(resp.content)["data"]
+    assert (completed["actual_reps"], completed["status"]) == (6, "completed")
+
+    # JSON stays the default, and the payload is the same either way
+    detail = authenticated_client("GET", f"/sessions/{session['id']}")
+    assert detail.headers["content-type"] == "application/json"
+    packed = authenticated_client(
+        "GET",
+        f"/sessions/{session['id']}",
+        headers={"Accept": "application/msgpack"},
+    )
+    assert msgpack.unpackb(packed.content) == detail.json()